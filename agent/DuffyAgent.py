@@ -35,8 +35,7 @@ class DuffyAgent(StupidAgent):
     @staticmethod
     def define_u_and_storing_costs(u, storing_costs):
 
-        new_storing_costs = np.zeros(3)
-        new_storing_costs[:] = storing_costs[:] / u
+        new_storing_costs = np.asarray(storing_costs, dtype=float) / u
 
         new_u = 1
 
@@ -54,7 +53,7 @@ class DuffyAgent(StupidAgent):
 
             x = self.values[0] - self.values[1]
             p_refusing = np.exp(x) / (1 + np.exp(x))
-            accept = np.random.choice([0, 1], p=[p_refusing, 1 - p_refusing])
+            accept = int(self.sampler.bernoulli(1 - p_refusing))
 
         else:
             accept = 0
@@ -108,6 +107,100 @@ class DuffyAgent(StupidAgent):
 
         self.learn()
 
+    # ---------- CHECKPOINT ---------- #
+
+    def get_state(self):
+
+        state = super().get_state()
+        state["values"] = self.values.copy()
+        state["H_at_the_beginning_of_the_round"] = self.H_at_the_beginning_of_the_round
+        state["have_to_learn"] = int(self.have_to_learn)
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+        self.values[:] = state["values"]
+        self.H_at_the_beginning_of_the_round = int(state["H_at_the_beginning_of_the_round"])
+        self.have_to_learn = bool(state["have_to_learn"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        assert population["storing_costs"].shape[-1] == 3, "Duffy Agent can handle only 3 goods."
+
+        P, C = population["P"], population["C"]
+        n = len(P)
+
+        population["T"] = 3 - P - C
+
+        population["u"], population["storing_costs"] = \
+            cls.define_u_and_storing_costs(population["u"], population["storing_costs"])
+        u, beta = population["u"], population["beta"]
+
+        # Storing costs of every good for every agent
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, population["storing_costs"], slice(None)), (n, 3))
+        rows = np.arange(n)
+
+        # Let values[:, 0] be the v_{i+1} and values[:, 1] be v_{i+2}
+        population["values"] = np.zeros((n, 2))
+
+        # Let gamma[:, 0] be gamma_{i+1} and gamma[:, 1] be gamma_{i+2}
+        population["gamma"] = np.column_stack([
+            - storing_costs[rows, P] + beta * u,
+            - storing_costs[rows, population["T"]] + beta * u
+        ])
+
+        population["H_at_the_beginning_of_the_round"] = P.copy()
+        population["have_to_learn"] = np.zeros(n, dtype=bool)
+
+        return population
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        H = population["H"][agents]
+        P, C, T = population["P"][agents], population["C"][agents], population["T"][agents]
+
+        values = population["values"][agents]
+        x = values[:, 0] - values[:, 1]
+        p_refusing = 1 / (1 + np.exp(-x))
+
+        speculation = (H == P) & (partner_goods == T)
+
+        return np.where(partner_goods == C, 1., np.where(speculation, 1 - p_refusing, 0.))
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        population["H_at_the_beginning_of_the_round"][agents] = population["H"][agents]
+        population["have_to_learn"][agents] = partner_goods == population["C"][agents]
+
+        p_accept = cls.acceptance_probability_batch(
+            population, agents=agents, partner_goods=partner_goods, partner_types=partner_types,
+            proportions=proportions)
+
+        return population["sampler"].random(len(agents)) < p_accept
+
+    @classmethod
+    def learn_batch(cls, population):
+
+        consumption = population["consumption"]
+        values, gamma = population["values"], population["gamma"]
+
+        learning = population["have_to_learn"]
+        from_P = learning & (population["H_at_the_beginning_of_the_round"] == population["P"])
+        from_T = learning & ~from_P
+
+        values[from_P, 0] += np.where(consumption[from_P], gamma[from_P, 0], - gamma[from_P, 1])
+        values[from_T, 1] += np.where(consumption[from_T], gamma[from_T, 1], - gamma[from_T, 0])
+
 
 def main():
 
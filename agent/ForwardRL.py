@@ -123,7 +123,7 @@ class ForwardRLAgent(StupidAgent):
         # Obtain probability of using this or that strategy by a softmax,
         # and then select a strategy according to these probabilities
         p_values = softmax(relevant_strategies_values, self.temp)
-        self.followed_strategy = np.random.choice(np.arange(len(relevant_strategies_values)), p=p_values)
+        self.followed_strategy = self.sampler.categorical(p_values)
 
         # Memory for learning
         self.matching_triplet = self.H, partner_type, partner_good
@@ -153,6 +153,135 @@ class ForwardRLAgent(StupidAgent):
 
         self.consume()
 
+    # ---------- CHECKPOINT ---------- #
+
+    def get_state(self):
+
+        state = super().get_state()
+
+        # Q-values in the order of generation of the strategies (the one of the first round included)
+        state["strategies"] = np.array(list(self.strategies.values()))
+        state["matching_triplet"] = np.array(self.matching_triplet)
+        state["followed_strategy"] = -1 if self.followed_strategy is None else self.followed_strategy
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+
+        for values, saved_values in zip(self.strategies.values(), state["strategies"]):
+            values[:] = saved_values
+
+        self.matching_triplet = tuple(int(i) for i in state["matching_triplet"])
+        self.followed_strategy = None if state["followed_strategy"] == -1 else int(state["followed_strategy"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    # Index of the situation before the first encounter (the 12 others being in the order of 'generate_strategies')
+    first_situation = 12
+
+    @staticmethod
+    def get_situation(in_hand, P, partner_type, partner_good):
+
+        # Good in hand (production or third good), partner type, partner good (one of the two others)
+        return 6 * (in_hand != P) + 2 * partner_type + partner_good - (partner_good > partner_type)
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        storing_costs = population["storing_costs"]
+        assert storing_costs.shape[-1] == 3, "RLForward Agent can not handle only 3 goods."
+
+        n_agent = len(population["P"])
+        agent_parameters = population["agent_parameters"]
+
+        # As 'define_u_and_storing_costs' (for each economy if the population gathers several of them)
+        amplitude = population["u"] - storing_costs.min(axis=-1) + storing_costs.max(axis=-1)
+
+        # Q-values of the 12 situations, and of the one before the first encounter
+        q_values = np.zeros((n_agent, cls.first_situation + 1, 2))
+        q_values[:, :cls.first_situation] = agent_parameters["q_values"]
+
+        population.update({
+            "alpha": agent_parameters["alpha"],
+            "gamma": agent_parameters["gamma"],
+            "temp": agent_parameters["temp"],
+            "relative_u": np.asarray(population["u"] / amplitude),
+            "relative_storing_costs": storing_costs / np.asarray(amplitude)[..., None],
+            "q_values": q_values,
+            # Last situation and strategy followed, for learning at the next encounter
+            "situation": np.full(n_agent, cls.first_situation),
+            "followed_strategy": np.zeros(n_agent, dtype=int)
+        })
+
+        return population
+
+    @classmethod
+    def learn_from_encounters(cls, population, agents, situations):
+
+        """
+         'learn' for agents meeting a partner: value of the last strategy followed
+         is updated with the utility obtained and (if not consuming) the value of the new situation
+        :return: None
+        """
+
+        q_values = population["q_values"]
+        last_situations, strategies = population["situation"][agents], population["followed_strategy"][agents]
+
+        consumption = population["consumption"][agents]
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, population["relative_storing_costs"], agents), (len(agents), 3))
+        u = cls.select_economy(population, population["relative_u"], agents)
+
+        utility = storing_costs.max(axis=1) + u * consumption - \
+            storing_costs[np.arange(len(agents)), population["H"][agents]]
+
+        q = q_values[agents, last_situations, strategies]
+        q += population["alpha"] * (utility - q)
+        q_values[agents, last_situations, strategies] = q
+
+        # Value of the new situation is read after the update (both situations can be the same)
+        forward = ~consumption
+        q[forward] += population["gamma"] * (q_values[agents[forward], situations[forward]].max(axis=1) - q[forward])
+        q_values[agents, last_situations, strategies] = q
+
+    @classmethod
+    def get_p_values(cls, population, agents, situations):
+
+        # Softmax as in 'useful_functions' (temperature as a C float)
+        exp_q = np.exp(population["q_values"][agents, situations] / float(np.float32(population["temp"])))
+
+        return exp_q / exp_q.sum(axis=1)[:, None]
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        situations = cls.get_situation(
+            in_hand=population["H"][agents], P=population["P"][agents],
+            partner_type=partner_types, partner_good=partner_goods)
+
+        return cls.get_p_values(population, agents=agents, situations=situations)[:, 1]
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        situations = cls.get_situation(
+            in_hand=population["H"][agents], P=population["P"][agents],
+            partner_type=partner_types, partner_good=partner_goods)
+
+        cls.learn_from_encounters(population, agents=agents, situations=situations)
+
+        # 'select_strategy': strategy 0 (refusing) if the draw is below its probability (as 'Sampler.categorical')
+        p_values = cls.get_p_values(population, agents=agents, situations=situations)
+        strategies = population["sampler"].random(len(agents)) >= p_values[:, 0]
+
+        population["situation"][agents] = situations
+        population["followed_strategy"][agents] = strategies
+
+        return strategies
 
 def main():
 
@@ -11,6 +11,51 @@ DEBUG = 0
 IDX_FOR_DEBUG = 0
 
 
+class RingBuffer(object):
+
+    """
+    Last values of a series (at most 'span' values) with the number of occurrences of each value,
+    so that recording a value and reading a frequency do not depend on the span
+    """
+
+    def __init__(self, span, n_values):
+
+        self.span = int(span)
+        self.values = [0] * self.span
+        self.counts = [0] * n_values
+
+        # Next slot to write and number of values recorded (up to the span)
+        self.position = 0
+        self.length = 0
+
+    def append(self, value):
+
+        if self.length == self.span:
+            # The oldest value is forgotten
+            self.counts[self.values[self.position]] -= 1
+        else:
+            self.length += 1
+
+        self.values[self.position] = value
+        self.counts[value] += 1
+        self.position = (self.position + 1) % self.span
+
+    def frequency(self, value):
+
+        # Same as the mean of the indicator of the value over the memory
+        return self.counts[value] / self.length
+
+    def set_state(self, values, position, length):
+
+        self.values = [int(i) for i in values]
+        self.position = int(position)
+        self.length = int(length)
+
+        self.counts = [0] * len(self.counts)
+        for i in range(self.length):
+            self.counts[self.values[(self.position - 1 - i) % self.span]] += 1
+
+
 class FrequentistAgent(StupidAgent):
 
     name = "Frequentist Agent"
@@ -27,14 +72,16 @@ class FrequentistAgent(StupidAgent):
         }
         self.temp = self.agent_parameters["temp"]
 
+        # Probabilities used as long as nothing has been memorized
         self.probabilities = {
             "encounter": dict([(i, 1/self.n_goods) for i in range(self.n_goods)]),
             "acceptance": self.get_acceptance_dic(n_goods=self.n_goods)
         }
 
+        # Goods of the partners encountered, and successes of exchanges accepted for each pair (in hand, partner good)
         self.memory = {
-            "encounter": dict([(i, []) for i in range(self.n_goods)]),
-            "acceptance": self.get_memory_dic(n_goods=self.n_goods)
+            "encounter": RingBuffer(span=self.memory_span["encounter"], n_values=self.n_goods),
+            "acceptance": self.get_memory_dic(n_goods=self.n_goods, span=self.memory_span["acceptance"])
         }
 
         self.in_hand_partner_good_pair = None
@@ -60,14 +107,24 @@ class FrequentistAgent(StupidAgent):
         return to_return
 
     @staticmethod
-    def get_memory_dic(n_goods):
+    def get_memory_dic(n_goods, span):
 
         memory = dict()
         for i in it.permutations(range(n_goods), r=2):
-            memory[i] = []
+            memory[i] = RingBuffer(span=span, n_values=2)
 
         return memory
 
+    def get_encounter_probability(self, good):
+
+        memory = self.memory["encounter"]
+        return memory.frequency(good) if memory.length else self.probabilities["encounter"][good]
+
+    def get_acceptance_probability(self, pair):
+
+        memory = self.memory["acceptance"][pair]
+        return memory.frequency(1) if memory.length else self.probabilities["acceptance"][pair]
+
     def set_initial_probabilities(self, initial_encounter_probabilities, initial_acceptance_probabilities):
 
         for i, key in enumerate(sorted(self.probabilities["encounter"].keys())):
@@ -81,7 +138,7 @@ class FrequentistAgent(StupidAgent):
 
         p_values = self.get_p_values(partner_good)
 
-        self.accept = np.random.choice([0, 1], p=p_values) if p_values[1] not in [0, 1] else p_values[1]
+        self.accept = int(self.sampler.bernoulli(p_values[1]))
 
         self.learn_from_encounter()
 
@@ -113,7 +170,7 @@ class FrequentistAgent(StupidAgent):
 
         # If refuses
         probability_direct_exchange = \
-            self.probabilities["acceptance"][(self.P, self.C)] * self.probabilities["encounter"][self.C]
+            self.get_acceptance_probability((self.P, self.C)) * self.get_encounter_probability(self.C)
 
         # DEBUG ONLY
         if self.idx == IDX_FOR_DEBUG and DEBUG: print("p direct exchange", probability_direct_exchange)
@@ -129,7 +186,7 @@ class FrequentistAgent(StupidAgent):
 
         # If accepts
         probability_indirect_exchange = \
-            self.probabilities["acceptance"][(partner_good, self.C)] * self.probabilities["encounter"][self.C]
+            self.get_acceptance_probability((partner_good, self.C)) * self.get_encounter_probability(self.C)
 
         # DEBUG ONLY
         if self.idx == IDX_FOR_DEBUG and DEBUG: print("p indirect exchange", probability_indirect_exchange)
@@ -169,16 +226,11 @@ class FrequentistAgent(StupidAgent):
 
     def learn_from_encounter(self):
 
-        for k in self.probabilities["encounter"].keys():
-            cond = int(k == self.in_hand_partner_good_pair[1])
-            self.memory["encounter"][k].append(cond)
-            if len(self.memory["encounter"][k]) > self.memory_span["encounter"]:
-                self.memory["encounter"][k] = self.memory["encounter"][k][1:]
-            self.probabilities["encounter"][k] = np.mean(self.memory["encounter"][k])
+        self.memory["encounter"].append(self.in_hand_partner_good_pair[1])
 
         if self.idx == IDX_FOR_DEBUG and DEBUG:
-            print("encounter memory:", self.memory["encounter"])
-            print("encounter probabilities:", self.probabilities["encounter"])
+            print("encounter memory:", self.memory["encounter"].counts)
+            print("encounter probabilities:", [self.get_encounter_probability(i) for i in range(self.n_goods)])
 
     def learn_from_result(self):
 
@@ -190,16 +242,12 @@ class FrequentistAgent(StupidAgent):
             successful = int(self.H != self.in_hand_partner_good_pair[0])
             if self.idx == IDX_FOR_DEBUG and DEBUG: print("Success", successful)
             self.memory["acceptance"][self.in_hand_partner_good_pair].append(successful)
-            if len(self.memory["acceptance"][self.in_hand_partner_good_pair]) > self.memory_span["acceptance"]:
-                self.memory["acceptance"][self.in_hand_partner_good_pair] = \
-                    self.memory["acceptance"][self.in_hand_partner_good_pair][1:]
-            self.probabilities["acceptance"][self.in_hand_partner_good_pair] = \
-                np.mean(self.memory["acceptance"][self.in_hand_partner_good_pair])
 
             if self.idx == IDX_FOR_DEBUG and DEBUG:
 
-                print("acceptance memory: ", self.memory["acceptance"])
-                print("acceptance probabilities:", self.probabilities["acceptance"])
+                print("acceptance memory: ", dict([(k, m.counts) for k, m in self.memory["acceptance"].items()]))
+                print("acceptance probabilities:",
+                      dict([(k, self.get_acceptance_probability(k)) for k in self.memory["acceptance"].keys()]))
 
     # -------------- FITTING ------------------------- #
 
@@ -221,6 +269,230 @@ class FrequentistAgent(StupidAgent):
 
         super().do_the_encounter(subject_choice, partner_choice, partner_good, partner_type)
 
+    # -------------- CHECKPOINT ------------------------- #
+
+    def get_state(self):
+
+        state = super().get_state()
+
+        # Memories of the pairs are stacked in the order of the dictionary
+        for key, memories in [("encounter", [self.memory["encounter"]]),
+                              ("acceptance", list(self.memory["acceptance"].values()))]:
+
+            state["{}_memory".format(key)] = np.array([m.values for m in memories], dtype=np.int8)
+            state["{}_position".format(key)] = np.array([m.position for m in memories])
+            state["{}_length".format(key)] = np.array([m.length for m in memories])
+
+        state["in_hand_partner_good_pair"] = np.array(
+            self.in_hand_partner_good_pair if self.in_hand_partner_good_pair is not None else (-1, -1))
+        state["accept"] = -1 if self.accept is None else int(self.accept)
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+
+        for key, memories in [("encounter", [self.memory["encounter"]]),
+                              ("acceptance", list(self.memory["acceptance"].values()))]:
+
+            for m, values, position, length in zip(
+                    memories, state["{}_memory".format(key)], state["{}_position".format(key)],
+                    state["{}_length".format(key)]):
+                m.set_state(values=values, position=position, length=length)
+
+        pair = tuple(int(i) for i in state["in_hand_partner_good_pair"])
+        self.in_hand_partner_good_pair = pair if pair != (-1, -1) else None
+        self.accept = None if state["accept"] == -1 else int(state["accept"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        n_agent = len(population["P"])
+        n_goods = population["storing_costs"].shape[-1]
+        agent_parameters = population["agent_parameters"]
+
+        encounter_span = int(agent_parameters["encounter_memory_span"])
+        acceptance_span = int(agent_parameters["acceptance_memory_span"])
+
+        # Pairs (in hand, partner good) in the order of 'get_acceptance_dic', and index of each pair
+        pairs = list(it.permutations(range(n_goods), r=2))
+        pair_index = np.full((n_goods, n_goods), -1)
+        pair_index[tuple(np.array(pairs).T)] = np.arange(len(pairs))
+
+        # Probabilities used as long as nothing has been memorized (as for agents as objects,
+        # initial acceptance probabilities are given by good, thus do not apply to pairs)
+        encounter_probabilities = np.full(n_goods, 1 / n_goods)
+        if {"encounter_probabilities", "acceptance_probabilities"}.issubset(agent_parameters.keys()):
+            encounter_probabilities[:] = agent_parameters["encounter_probabilities"][:n_goods]
+
+        good_dtype = np.min_scalar_type(n_goods - 1)
+
+        population.update({
+            "temp": agent_parameters["temp"],
+            "pair_index": pair_index,
+            "initial_encounter_probabilities": encounter_probabilities,
+            "initial_acceptance_probabilities": np.ones(len(pairs)),
+
+            # Ring buffers (one by agent for encounters, one by agent and pair for acceptances):
+            # last values, number of occurrences of each value, next slot to write and number of values recorded
+            "encounter_memory": np.zeros((n_agent, encounter_span), dtype=good_dtype),
+            "encounter_counts": np.zeros((n_agent, n_goods), dtype=int),
+            "encounter_position": np.zeros(n_agent, dtype=int),
+            "encounter_length": np.zeros(n_agent, dtype=int),
+            "acceptance_memory": np.zeros((n_agent, len(pairs), acceptance_span), dtype=np.int8),
+            "acceptance_counts": np.zeros((n_agent, len(pairs), 2), dtype=int),
+            "acceptance_position": np.zeros((n_agent, len(pairs)), dtype=int),
+            "acceptance_length": np.zeros((n_agent, len(pairs)), dtype=int),
+
+            # Last encounter of each agent: good in hand, partner good and decision
+            "in_hand": population["P"].copy(),
+            "partner_good": np.zeros(n_agent, dtype=int),
+            "accept": np.zeros(n_agent, dtype=bool)
+        })
+
+        return population
+
+    @staticmethod
+    def memorize(population, key, index, values):
+
+        """
+         Record a value in ring buffers, each of them being given once at most
+        :param key: 'encounter' or 'acceptance'
+        :param index: tuple of arrays giving the buffers (agents, and pairs for acceptances)
+        :param values: value to record in each buffer
+        :return: None
+        """
+
+        memory, counts, position, length = [
+            population["{}_{}".format(key, k)] for k in ["memory", "counts", "position", "length"]]
+
+        span = memory.shape[-1]
+
+        slots = position[index]
+        full = length[index] == span
+
+        # The oldest value is forgotten by buffers already full
+        counts[index + (memory[index + (slots, )], )] -= full
+        length[index] += ~full
+
+        memory[index + (slots, )] = values
+        counts[index + (values, )] += 1
+        position[index] = (slots + 1) % span
+
+    @staticmethod
+    def get_frequencies(population, key, index, values):
+
+        # Frequency of each value in the ring buffers, initial probability for buffers still empty
+        counts = population["{}_counts".format(key)][index + (values, )]
+        length = population["{}_length".format(key)][index]
+
+        return np.where(
+            length > 0, counts / np.maximum(length, 1),
+            population["initial_{}_probabilities".format(key)][index[-1] if key == "acceptance" else values])
+
+    @staticmethod
+    def get_medium_p_values(storing_costs, P, medium, p_direct, p_indirect, temp):
+
+        """
+         'accept_a_medium' for arrays of situations
+        :param storing_costs: storing costs (relative to utility) in each situation (n, n_goods)
+        :param P: production good
+        :param medium: good offered as a medium of exchange
+        :param p_direct: probability of a direct exchange if the medium is refused
+        :param p_indirect: probability of an indirect exchange if the medium is accepted
+        :param temp: temperature of the softmax
+        :return: probabilities to refuse and to accept (2, n)
+        """
+
+        rows = np.arange(len(P))
+        v = np.zeros((2, len(P)))
+
+        for k, (good, probability) in enumerate([(P, p_direct), (medium, p_indirect)]):
+
+            positive = probability > 0
+            v[k, positive] = np.maximum(0, 1 - storing_costs[rows[positive], good[positive]] / probability[positive])
+
+        # Softmax as in 'useful_functions' (temperature as a C float)
+        exp_v = np.exp(v / float(np.float32(temp)))
+        p_values = exp_v / exp_v.sum(axis=0)
+
+        # Without any prospect of consumption, keep the least costly good
+        no_value = (v[0] == 0) & (v[1] == 0)
+        p_accept = storing_costs[rows[no_value], medium[no_value]] < storing_costs[rows[no_value], P[no_value]]
+        p_values[:, no_value] = 1 - p_accept, p_accept
+
+        return p_values
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        P, C, H = population["P"][agents], population["C"][agents], population["H"][agents]
+
+        # Accept his consumption good, refuse his production good and the good he has in hand
+        p_accept = (partner_goods == C).astype(float)
+        medium = (partner_goods != C) & (partner_goods != P) & (partner_goods != H)
+
+        # 'accept_a_medium' for every agent facing a medium of exchange
+        m, g, P, C = agents[medium], partner_goods[medium], P[medium], C[medium]
+
+        storing_costs = population["storing_costs"] / population["u"]
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, storing_costs, m), (len(m), storing_costs.shape[-1]))
+
+        p_encounter = cls.get_frequencies(population, "encounter", index=(m, ), values=C)
+
+        # If refuses (direct exchange), if accepts (indirect exchange)
+        p_direct, p_indirect = [
+            p_encounter * cls.get_frequencies(
+                population, "acceptance", index=(m, population["pair_index"][good, C]), values=1)
+            for good in [P, g]]
+
+        p_medium = cls.get_medium_p_values(
+            storing_costs=storing_costs, P=P, medium=g, p_direct=p_direct, p_indirect=p_indirect,
+            temp=population["temp"])[1]
+
+        p_accept[medium] = p_medium
+
+        return p_accept
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        p_accept = cls.acceptance_probability_batch(
+            population, agents=agents, partner_goods=partner_goods, partner_types=partner_types,
+            proportions=proportions)
+
+        accept = population["sampler"].random(len(agents)) < p_accept
+
+        population["in_hand"][agents] = population["H"][agents]
+        population["partner_good"][agents] = partner_goods
+        population["accept"][agents] = accept
+
+        # 'learn_from_encounter'
+        cls.memorize(population, "encounter", index=(agents, ), values=partner_goods)
+
+        return accept
+
+    @classmethod
+    def learn_batch(cls, population):
+
+        # 'learn_from_result': success of the last exchange accepted (if the goods differed),
+        # as for agents as objects an agent without partner this round learns again from his last encounter
+        in_hand, partner_good = population["in_hand"], population["partner_good"]
+
+        learning = np.flatnonzero(population["accept"] & (in_hand != partner_good))
+        successful = population["H"][learning] != in_hand[learning]
+
+        cls.memorize(
+            population, "acceptance",
+            index=(learning, population["pair_index"][in_hand[learning], partner_good[learning]]),
+            values=successful.astype(np.int8))
+
 
 def main():
 
@@ -8,6 +8,9 @@ from graph.graph import represent_results
 class KwAgent(StupidAgent):
     name = "Kw"
 
+    # Decisions only depend on the situation of the encounter (and on the proportions)
+    memoryless = True
+
     def __init__(self, **kwargs):
 
         super().__init__(**kwargs)
@@ -66,6 +69,49 @@ class KwAgent(StupidAgent):
                     (proportions[2] - (1-proportions[1])) / 3 * self.beta * self.u
                 return subject_response == int(cond)
 
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        storing_costs = population["storing_costs"]
+        assert storing_costs.shape[-1] == 3, "KW Agent can not handle only 3 goods."
+        assert np.all((0 < storing_costs[..., 0]) & (storing_costs[..., 0] < storing_costs[..., 1]) &
+                      (storing_costs[..., 1] < storing_costs[..., 2])), "Must be 'Economy A'."
+
+        population["T"] = 3 - population["P"] - population["C"]
+
+        return population
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        P, C, T = population["P"][agents], population["C"][agents], population["T"][agents]
+        storing_costs = population["storing_costs"]
+
+        accept = partner_goods == C
+        refuse = (partner_types == C) | (partner_goods == P)  # Type is defined by what an agent consumes
+
+        # P 300 of Duffy's Learning to Speculate (for each economy if the population gathers several of them)
+        cond = (storing_costs[..., 2] - storing_costs[..., 1]) < \
+            (proportions[..., 2, 0] - (1 - proportions[..., 1, 2])) / 3 * population["beta"] * population["u"]
+        cond = cls.select_economy(population, cond, agents)
+
+        third_good = ~accept & ~refuse & (partner_goods == T)
+        accept |= third_good & ((C == 1) | ((C == 0) & cond))
+
+        return accept.astype(float)
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        # Decisions are deterministic
+        return cls.acceptance_probability_batch(
+            population, agents=agents, partner_goods=partner_goods, partner_types=partner_types,
+            proportions=proportions) == 1
+
 
 def main():
 
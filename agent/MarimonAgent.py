@@ -2,7 +2,7 @@ from itertools import product
 
 import numpy as np
 
-from agent.stupid_agent import StupidAgent
+from agent.stupid_agent import StupidAgent, get_default_sampler
 from environment.Economy import launch
 from graph.graph import represent_results
 
@@ -18,16 +18,19 @@ class MarimonAgent(StupidAgent):
         self.exchange_classifier_system = ExchangeClassifierSystem(
             b11=self.agent_parameters["b11"],
             b12=self.agent_parameters["b12"],
-            initial_strength=self.agent_parameters["initial_strength"])
+            initial_strength=self.agent_parameters["initial_strength"],
+            sampler=self.sampler)
         self.consumption_classifier_system = ConsumptionClassifierSystem(
             b21=self.agent_parameters["b21"],
             b22=self.agent_parameters["b22"],
-            initial_strength=self.agent_parameters["initial_strength"])
+            initial_strength=self.agent_parameters["initial_strength"],
+            sampler=self.sampler)
 
         self.previous_object_in_hand = self.P
 
         self.utility_derived_from_consumption = self.agent_parameters["u"]
 
+        # Indexes of the winning classifiers
         self.best_exchange_classifier = None
         self.best_consumption_classifier = None
 
@@ -51,7 +54,7 @@ class MarimonAgent(StupidAgent):
         # Look at the decision
 
         # Equation 1
-        exchange_decision = bool(self.best_exchange_classifier.decision)
+        exchange_decision = bool(self.exchange_classifier_system.decisions[self.best_exchange_classifier])
 
         return exchange_decision
 
@@ -62,21 +65,22 @@ class MarimonAgent(StupidAgent):
         # Is there a winning exchange classifier?
         # is_winning_exchange_classifier = 1
         is_winning_exchange_classifier = \
-            self.best_exchange_classifier.decision == 0 \
+            self.exchange_classifier_system.decisions[self.best_exchange_classifier] == 0 \
             or self.exchange is True
 
         # Update strength of previous winning consumption classifier
-        if self.best_consumption_classifier:
+        if self.best_consumption_classifier is not None:
 
             if is_winning_exchange_classifier:
-                exchange_classifier_bid = self.best_exchange_classifier.get_bid()
+                exchange_classifier_bid = self.exchange_classifier_system.get_bid(self.best_exchange_classifier)
             else:
                 exchange_classifier_bid = 0
 
             utility = self.utility_derived_from_consumption*self.consumption \
                 - self.storing_costs[self.previous_object_in_hand]
 
-            self.best_consumption_classifier.update_strength(
+            self.consumption_classifier_system.update_strength(
+                self.best_consumption_classifier,
                 utility=utility,
                 exchange_classifier_bid=exchange_classifier_bid
             )
@@ -91,18 +95,19 @@ class MarimonAgent(StupidAgent):
 
         # Equation 8
         self.best_consumption_classifier = self.consumption_classifier_system.get_best_classifier(m_index)
-        self.best_consumption_classifier.update_theta_counter()
+        self.consumption_classifier_system.update_theta_counter(self.best_consumption_classifier)
 
         # Update
         if is_winning_exchange_classifier:
 
-            self.best_exchange_classifier.update_theta_counter()
-            self.best_exchange_classifier.update_strength(
-                consumption_classifier_bid=self.best_consumption_classifier.get_bid())
+            self.exchange_classifier_system.update_theta_counter(self.best_exchange_classifier)
+            self.exchange_classifier_system.update_strength(
+                self.best_exchange_classifier,
+                consumption_classifier_bid=self.consumption_classifier_system.get_bid(self.best_consumption_classifier))
 
         # If he decides to consume...
         # Equation 3 & 4
-        if self.best_consumption_classifier.decision == 1:
+        if self.consumption_classifier_system.decisions[self.best_consumption_classifier] == 1:
 
             # And the agent has his consumption good
             if self.H == self.C:
@@ -114,225 +119,367 @@ class MarimonAgent(StupidAgent):
         # Keep a trace of the previous object in hand
         self.previous_object_in_hand = self.H
 
-# --------------------------------------------------------------------------------------------------- #
-# -------------------------------- CLASSIFIER SYSTEM ------------------------------------------------ #
-# --------------------------------------------------------------------------------------------------- #
+    # ------------- CHECKPOINT ------------- #
 
+    def get_state(self):
 
-class ClassifierSystem(object):
+        state = super().get_state()
 
-    def __init__(self):
+        for name, system in [("exchange", self.exchange_classifier_system),
+                             ("consumption", self.consumption_classifier_system)]:
 
-        self.collection_of_classifiers = list()
+            state["{}_strengths".format(name)] = system.strengths.copy()
+            state["{}_theta_counters".format(name)] = system.theta_counters.copy()
 
-        # Encoding of goods
-        self.encoding_of_goods = np.array(
-            [
-                [1, 0, 0],  # Good 0
-                [0, 1, 0],  # Good 1
-                [0, 0, 1],  # Good 2
-                [0, -1, -1],  # Not good 0
-                [-1, 0, -1],  # Not good 1
-                [-1, -1, 0]   # Not good 2
-            ], dtype=int
-        )
+        state["best_exchange_classifier"] = \
+            -1 if self.best_exchange_classifier is None else int(self.best_exchange_classifier)
+        state["best_consumption_classifier"] = \
+            -1 if self.best_consumption_classifier is None else int(self.best_consumption_classifier)
+        state["previous_object_in_hand"] = self.previous_object_in_hand
 
-    def get_best_classifier(self, m_index):
+        return state
 
-        s = np.asarray([self.collection_of_classifiers[i].strength for i in m_index])
+    def set_state(self, state):
 
-        best_m_idx = np.random.choice(np.where(s == max(s))[0])
+        super().set_state(state)
 
-        best_classifier_idx = m_index[best_m_idx]
+        for name, system in [("exchange", self.exchange_classifier_system),
+                             ("consumption", self.consumption_classifier_system)]:
 
-        return self.collection_of_classifiers[best_classifier_idx]
+            system.strengths[:] = state["{}_strengths".format(name)]
+            system.theta_counters[:] = state["{}_theta_counters".format(name)]
 
+        idx = int(state["best_exchange_classifier"])
+        self.best_exchange_classifier = None if idx == -1 else idx
+        idx = int(state["best_consumption_classifier"])
+        self.best_consumption_classifier = None if idx == -1 else idx
+        self.previous_object_in_hand = int(state["previous_object_in_hand"])
 
-class ExchangeClassifierSystem(ClassifierSystem):
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
 
-    def __init__(self, b11, b12, initial_strength):
+    @classmethod
+    def create_population(cls, **kwargs):
 
-        super().__init__()
+        population = super().create_population(**kwargs)
 
-        self.b11 = b11
-        self.b12 = b12
-        self.initial_strength = initial_strength
+        n_agent = len(population["P"])
+        agent_parameters = population["agent_parameters"]
 
-    def prepare_classifiers(self):
+        # Classifiers are the same for every agent, only their strengths and theta counters are his own
+        exchange_classifier_system = ExchangeClassifierSystem(
+            b11=agent_parameters["b11"],
+            b12=agent_parameters["b12"],
+            initial_strength=agent_parameters["initial_strength"])
+        consumption_classifier_system = ConsumptionClassifierSystem(
+            b21=agent_parameters["b21"],
+            b22=agent_parameters["b22"],
+            initial_strength=agent_parameters["initial_strength"])
 
-        idx = 0
-        for i, j in product(self.encoding_of_goods, repeat=2):
-
-            for k in [0, 1]:
-
-                self.collection_of_classifiers.append(
-                    ExchangeClassifier(
-                        own_storage=i,
-                        partner_storage=j,
-                        decision=k,
-                        strength=self.initial_strength,
-                        b11=self.b11,
-                        b12=self.b12,
-                        idx=idx
-                    )
-                )
-                idx += 1
+        for name, system in [("exchange", exchange_classifier_system),
+                             ("consumption", consumption_classifier_system)]:
 
-    def get_potential_bidders(self, own_storage, partner_storage):
+            system.prepare_classifiers()
 
-        # List of indexes of classifiers that match the current situation
-        match_index = []
-        for i, c in enumerate(self.collection_of_classifiers):
+            population.update({
+                "{}_decisions".format(name): system.decisions,
+                "{}_bid_coefficients".format(name): system.bid_coefficients,
+                "{}_strengths".format(name): np.tile(system.strengths, (n_agent, 1)),
+                "{}_theta_counters".format(name): np.tile(system.theta_counters, (n_agent, 1)),
+                # Index of the winning classifier (-1 before the first one)
+                "best_{}_classifier".format(name): np.full(n_agent, -1)
+            })
 
-            if c.is_matching(own_storage, partner_storage):
-                match_index.append(i)
+        # Classifiers matching each situation: (good in hand, partner good) for exchange, good in hand for consumption
+        own_storage = exchange_classifier_system.own_storage.T != 0
+        partner_storage = exchange_classifier_system.partner_storage.T != 0
 
-        return match_index
+        population.update({
+            "utility_derived_from_consumption": agent_parameters["u"],
+            "exchange_matching": own_storage[:, None] & partner_storage[None, :],
+            "consumption_matching": consumption_classifier_system.own_storage.T != 0,
+            "exchange": np.zeros(n_agent, dtype=bool),
+            "previous_object_in_hand": population["P"].copy()
+        })
 
+        return population
 
-class ConsumptionClassifierSystem(ClassifierSystem):
+    @staticmethod
+    def get_best_classifiers(population, strengths, matching):
 
-    def __init__(self, b21, b22, initial_strength):
+        # 'get_best_classifier' for each row: strongest matching classifier, ties being broken at random
+        strengths = np.where(matching, strengths, -np.inf)
+        best = strengths == strengths.max(axis=1)[:, None]
 
-        super().__init__()
+        rank = (population["sampler"].random(len(strengths)) * best.sum(axis=1)).astype(int)
+        return np.argmax(np.cumsum(best, axis=1) > rank[:, None], axis=1)
 
-        self.b21 = b21
-        self.b22 = b22
-        self.initial_strength = initial_strength
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
 
-    def prepare_classifiers(self):
+        # Share of accepting classifiers among the strongest matching ones
+        strengths = np.where(population["exchange_matching"][population["H"][agents], partner_goods],
+                             population["exchange_strengths"][agents], -np.inf)
+        best = strengths == strengths.max(axis=1)[:, None]
 
-        idx = 0
+        return np.sum(best * population["exchange_decisions"], axis=1) / best.sum(axis=1)
 
-        for i in self.encoding_of_goods:
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
 
-            for j in [0, 1]:
+        # Equations 5 and 6
+        best = cls.get_best_classifiers(
+            population, strengths=population["exchange_strengths"][agents],
+            matching=population["exchange_matching"][population["H"][agents], partner_goods])
 
-                self.collection_of_classifiers.append(
-                    ConsumptionClassifier(
-                        own_storage=i,
-                        decision=j,
-                        b21=self.b21,
-                        b22=self.b22,
-                        strength=self.initial_strength,
-                        idx=idx
-                    )
-                )
-                idx += 1
+        population["best_exchange_classifier"][agents] = best
 
-    def get_potential_bidders(self, own_storage):
+        # Equation 1
+        return population["exchange_decisions"][best] == 1
+
+    @classmethod
+    def proceed_to_exchange_batch(cls, population, agents, exchanging):
 
-        match_index = []
-        for i, c in enumerate(self.collection_of_classifiers):
+        population["exchange"][agents] = exchanging
 
-            if c.is_matching(own_storage):
+    @classmethod
+    def consume_batch(cls, population):
 
-                match_index.append(i)
+        """
+         'consume' for every agent (as for agents as objects, an agent without partner this round
+         is paid again by his last exchange classifier): goods are moved by the economy
+        :return: agents getting their production good in hand, and these goods
+        """
+
+        P, C, H = population["P"], population["C"], population["H"]
+        agents = np.arange(len(P))
+
+        exchange_strengths, exchange_theta_counters = \
+            population["exchange_strengths"], population["exchange_theta_counters"]
+        consumption_strengths, consumption_theta_counters = \
+            population["consumption_strengths"], population["consumption_theta_counters"]
+
+        exchange_classifiers = population["best_exchange_classifier"]
+
+        # Is there a winning exchange classifier?
+        is_winning = (exchange_classifiers != -1) & \
+            ((population["exchange_decisions"][exchange_classifiers] == 0) | population["exchange"])
+
+        exchange_bids = np.where(
+            is_winning,
+            population["exchange_bid_coefficients"][exchange_classifiers]
+            * exchange_strengths[agents, exchange_classifiers],
+            0)
+
+        # Update strength of previous winning consumption classifier (equation 12)
+        previous = np.flatnonzero(population["best_consumption_classifier"] != -1)
+        c = population["best_consumption_classifier"][previous]
+
+        storing_costs = population["storing_costs"]
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, storing_costs, previous), (len(previous), storing_costs.shape[-1]))
+
+        utility = population["utility_derived_from_consumption"] * population["consumption"][previous] \
+            - storing_costs[np.arange(len(previous)), population["previous_object_in_hand"][previous]]
+
+        strengths = consumption_strengths[previous, c]
+        consumption_strengths[previous, c] = strengths - (1 / (consumption_theta_counters[previous, c] - 1)) * (
+            population["consumption_bid_coefficients"][c] * strengths + strengths
+            - exchange_bids[previous] - utility
+        )
 
-        return match_index
+        # Equations 7 and 8
+        consumption_classifiers = cls.get_best_classifiers(
+            population, strengths=consumption_strengths, matching=population["consumption_matching"][H])
+        consumption_theta_counters[agents, consumption_classifiers] += 1
 
+        population["best_consumption_classifier"][:] = consumption_classifiers
+
+        # Update of the winning exchange classifiers, paid by the bid of the consumption classifier
+        w = np.flatnonzero(is_winning)
+        e, c = exchange_classifiers[w], consumption_classifiers[w]
+
+        exchange_theta_counters[w, e] += 1
+
+        strengths = exchange_strengths[w, e]
+        exchange_strengths[w, e] = strengths - (1 / exchange_theta_counters[w, e]) * (
+            population["exchange_bid_coefficients"][e] * strengths + strengths
+            - population["consumption_bid_coefficients"][c] * consumption_strengths[w, c]
+        )
+
+        # If he decides to consume (equations 3 and 4), he consumes if he has his consumption good,
+        # and produces a new unit of his production good anyway
+        consuming = population["consumption_decisions"][consumption_classifiers] == 1
+
+        population["consumption"][:] = consuming & (H == C)
+        population["previous_object_in_hand"][:] = np.where(consuming, P, H)
+
+        consuming = np.flatnonzero(consuming)
+        return consuming, P[consuming]
 
 # --------------------------------------------------------------------------------------------------- #
-# -------------------------------- CLASSIFIER ------------------------------------------------------- #
+# -------------------------------- CLASSIFIER SYSTEM ------------------------------------------------ #
 # --------------------------------------------------------------------------------------------------- #
 
-class Classifier(object):
 
-    def __init__(self, strength, decision, idx):
+class ClassifierSystem(object):
+
+    """
+    Classifiers are rows of arrays (condition, decision, strength, bid coefficient, theta counter),
+    classifiers matching each situation being given by a table prepared once
+    """
+
+    def __init__(self, initial_strength, sampler=None):
 
-        self.strength = strength
-        self.decision = decision
+        self.initial_strength = initial_strength
+
+        # Source of random numbers for breaking ties (the one of the agent)
+        self.sampler = sampler if sampler is not None else get_default_sampler()
+
+        # Encoding of goods
+        self.encoding_of_goods = np.array(
+            [
+                [1, 0, 0],  # Good 0
+                [0, 1, 0],  # Good 1
+                [0, 0, 1],  # Good 2
+                [0, -1, -1],  # Not good 0
+                [-1, 0, -1],  # Not good 1
+                [-1, -1, 0]   # Not good 2
+            ], dtype=int
+        )
+
+        self.decisions = None
+        self.strengths = None
+        self.bid_coefficients = None
 
         # Equations 9 and 10
-        self.theta_counter = 1
+        self.theta_counters = None
+
+        # Indexes of the classifiers matching each situation
+        self.match_index = None
+
+    def create_classifiers(self, decisions, bid_coefficients):
+
+        self.decisions = np.asarray(decisions)
+        self.bid_coefficients = np.asarray(bid_coefficients, dtype=float)
+        self.strengths = np.full(len(self.decisions), self.initial_strength, dtype=float)
+        self.theta_counters = np.ones(len(self.decisions), dtype=int)
+
+    def get_best_classifier(self, m_index):
 
-        self.idx = idx
+        # Strongest matching classifier, ties being broken at random
+        s = self.strengths[m_index]
+        best = m_index[s == s.max()]
 
-    def update_theta_counter(self):
+        if len(best) == 1:
+            return best[0]
 
-        self.theta_counter += 1
+        return best[int(self.sampler.uniform() * len(best))]
 
+    def get_bid(self, idx):
 
-class ExchangeClassifier(Classifier):
+        # Def of a bid p 138
+        return self.bid_coefficients[idx] * self.strengths[idx]
+
+    def update_theta_counter(self, idx):
+
+        self.theta_counters[idx] += 1
 
-    def __init__(self, own_storage, partner_storage, decision, strength, b11, b12, idx):
 
-        super().__init__(strength=strength, decision=decision, idx=idx)
+class ExchangeClassifierSystem(ClassifierSystem):
 
-        self.own_storage = np.asarray(own_storage)
-        self.partner_storage = np.asarray(partner_storage)
+    def __init__(self, b11, b12, initial_strength, sampler=None):
 
-        self.sigma = 1 / (1 + sum(self.own_storage[:] == -1) + sum(self.partner_storage[:] == -1))
+        super().__init__(initial_strength=initial_strength, sampler=sampler)
+
+        self.b11 = b11
+        self.b12 = b12
+
+        self.own_storage = None
+        self.partner_storage = None
+
+    def prepare_classifiers(self):
+
+        conditions = [(i, j, k) for i, j in product(self.encoding_of_goods, repeat=2) for k in [0, 1]]
+
+        self.own_storage = np.array([i for i, j, k in conditions])
+        self.partner_storage = np.array([j for i, j, k in conditions])
+
+        sigma = 1 / (1 + np.sum(self.own_storage == -1, axis=1) + np.sum(self.partner_storage == -1, axis=1))
 
         # Equation 11a
-        self.b1 = b11 + b12 * self.sigma
+        self.create_classifiers(decisions=[k for i, j, k in conditions], bid_coefficients=self.b11 + self.b12 * sigma)
 
-    def get_bid(self):
+        # Args of the situation are integers (0, 1 or 2), conditions are arrays ([0, 0, 1] or [-1, -1, 0] and so on)
+        n_goods = self.own_storage.shape[1]
+        self.match_index = [
+            [np.flatnonzero((self.own_storage[:, i] != 0) & (self.partner_storage[:, j] != 0)) for j in range(n_goods)]
+            for i in range(n_goods)]
 
-        # Def of a bid p 138
-        return self.b1 * self.strength
+    def get_potential_bidders(self, own_storage, partner_storage):
 
-    def update_strength(self, consumption_classifier_bid):
+        # Indexes of classifiers that match the current situation
+        return self.match_index[own_storage][partner_storage]
 
-        self.strength -= (1 / self.theta_counter) * (
-            self.get_bid() + self.strength
+    def update_strength(self, idx, consumption_classifier_bid):
+
+        self.strengths[idx] -= (1 / self.theta_counters[idx]) * (
+            self.get_bid(idx) + self.strengths[idx]
             - consumption_classifier_bid
         )
 
-    def is_matching(self, own_storage, partner_storage):
-
-        # Args are integers (0, 1 or 2)
-        # self.own_storage is an array ([0, 0, 1] or [-1, -1, 0] and so on)
-        cond_own_storage = self.own_storage[own_storage] != 0
-        cond_partner_storage = self.partner_storage[partner_storage] != 0
-        return cond_own_storage and cond_partner_storage
-
-    def get_info(self):
+    def get_info(self, idx):
 
         print("[Exchange {}] own_storage: {}, partner_storage: {},\n"
               "decision: {}, strength: {}, bid: {}".format(
-                self.idx, self.own_storage, self.partner_storage,
-                self.decision, self.strength, self.get_bid()
+                idx, self.own_storage[idx], self.partner_storage[idx],
+                self.decisions[idx], self.strengths[idx], self.get_bid(idx)
                 )
               )
 
 
-class ConsumptionClassifier(Classifier):
+class ConsumptionClassifierSystem(ClassifierSystem):
+
+    def __init__(self, b21, b22, initial_strength, sampler=None):
 
-    def __init__(self, own_storage, strength, b21, b22, decision, idx):
+        super().__init__(initial_strength=initial_strength, sampler=sampler)
 
-        super().__init__(strength=strength, decision=decision, idx=idx)
+        self.b21 = b21
+        self.b22 = b22
 
         # Object in hand at the end of the turn
-        self.own_storage = np.asarray(own_storage)
+        self.own_storage = None
+
+    def prepare_classifiers(self):
 
-        sigma = 1 / (1 + sum(self.own_storage[:] == -1))
+        conditions = [(i, j) for i in self.encoding_of_goods for j in [0, 1]]
+
+        self.own_storage = np.array([i for i, j in conditions])
+
+        sigma = 1 / (1 + np.sum(self.own_storage == -1, axis=1))
 
         # Equation 11b
-        self.b2 = b21 + b22 * sigma
+        self.create_classifiers(decisions=[j for i, j in conditions], bid_coefficients=self.b21 + self.b22 * sigma)
+
+        self.match_index = [np.flatnonzero(self.own_storage[:, i] != 0) for i in range(self.own_storage.shape[1])]
 
-    def get_bid(self):
+    def get_potential_bidders(self, own_storage):
 
-        return self.b2 * self.strength
+        return self.match_index[own_storage]
 
-    def update_strength(self, exchange_classifier_bid, utility):
+    def update_strength(self, idx, exchange_classifier_bid, utility):
 
         # Equation 12
-        self.strength -= (1 / (self.theta_counter - 1)) * (
-            self.get_bid() + self.strength
+        self.strengths[idx] -= (1 / (self.theta_counters[idx] - 1)) * (
+            self.get_bid(idx) + self.strengths[idx]
             - exchange_classifier_bid - utility
         )
 
-    def is_matching(self, own_storage):
-
-        return self.own_storage[own_storage] != 0
-
-    def get_info(self):
+    def get_info(self, idx):
 
         print("[Consumption {}] own_storage: {},\n"
               "decision: {}, strength: {}, bid: {}".format(
-                self.idx, self.own_storage,
-                self.decision, self.strength, self.get_bid()
+                idx, self.own_storage[idx],
+                self.decisions[idx], self.strengths[idx], self.get_bid(idx)
               ))
 
 
@@ -340,9 +487,9 @@ def test_exchange_classifier_system():
 
     exh = ExchangeClassifierSystem(b11=0.35, b12=0.35, initial_strength=0)
     exh.prepare_classifiers()
-    for i in exh.collection_of_classifiers:
+    for i in range(len(exh.decisions)):
 
-        print(i.own_storage, i.partner_storage, i.decision, i.sigma)
+        print(exh.own_storage[i], exh.partner_storage[i], exh.decisions[i], exh.bid_coefficients[i])
 
 
 def test_agent():
@@ -365,7 +512,7 @@ def test_agent():
         print()
 
         exc_decision = a.are_you_satisfied(partner_good=0)
-        a.best_exchange_classifier.get_info()
+        a.exchange_classifier_system.get_info(a.best_exchange_classifier)
 
         if exc_decision:
             a.proceed_to_exchange(new_object=0)
@@ -375,24 +522,24 @@ def test_agent():
         a.consume()
 
         print()
-        a.best_consumption_classifier.get_info()
+        a.consumption_classifier_system.get_info(a.best_consumption_classifier)
 
         if previous_consumption_idx:
             print()
             print("AFTER UPDATE FOR PREVIOUS CONSUMPTION CLASSIFIER \n"
                   "(based on utility at t-1 and bid of winning exchange classifier [idx {}] a t)".format(
-                a.best_exchange_classifier.idx
+                a.best_exchange_classifier
             ))
-            a.consumption_classifier_system.collection_of_classifiers[previous_consumption_idx].get_info()
+            a.consumption_classifier_system.get_info(previous_consumption_idx)
 
         print()
         print("AFTER UPDATE FOR EXCHANGE CLASSIFIER \n"
               "(based on the bid of the winning consumption classifier [idx {}] a t)".format(
-            a.best_consumption_classifier.idx
+            a.best_consumption_classifier
         ))
-        a.best_exchange_classifier.get_info()
+        a.exchange_classifier_system.get_info(a.best_exchange_classifier)
 
-        previous_consumption_idx = a.best_consumption_classifier.idx
+        previous_consumption_idx = a.best_consumption_classifier
 
         print()
 
@@ -2,7 +2,7 @@ from itertools import product
 
 import numpy as np
 
-from agent.stupid_agent import StupidAgent
+from agent.stupid_agent import StupidAgent, get_default_sampler
 from environment.Economy import Economy
 from graph.graph import represent_results
 
@@ -17,9 +17,9 @@ class MarimonAgent(StupidAgent):
     name = "Marimon"
 
     def __init__(self, prod, cons, exchange_classifier_system,
-                 consumption_classifier_system, storing_costs, u, idx):
+                 consumption_classifier_system, storing_costs, u, idx, sampler=None):
         
-        super().__init__(prod=prod, cons=cons, storing_costs=storing_costs, u=u, idx=idx)
+        super().__init__(prod=prod, cons=cons, storing_costs=storing_costs, u=u, idx=idx, sampler=sampler)
 
         # Parameters for agent that could be different in nature depending on the agent model in use (Python dictionary)
         self.exchange_classifier_system = exchange_classifier_system
@@ -120,10 +120,13 @@ class MarimonAgent(StupidAgent):
 
 class ClassifierSystem(object):
 
-    def __init__(self):
+    def __init__(self, sampler=None):
 
         self.collection_of_classifiers = list()
 
+        # Source of random numbers for breaking ties (the one of the economy)
+        self.sampler = sampler if sampler is not None else get_default_sampler()
+
         # Encoding of goods
         self.encoding_of_goods = np.array(
             [
@@ -140,7 +143,8 @@ class ClassifierSystem(object):
 
         s = np.asarray([self.collection_of_classifiers[i].strength for i in m_index])
 
-        best_m_idx = np.random.choice(np.where(s == max(s))[0])
+        best = np.where(s == max(s))[0]
+        best_m_idx = best[int(self.sampler.uniform() * len(best))]
 
         best_classifier_idx = m_index[best_m_idx]
 
@@ -149,9 +153,9 @@ class ClassifierSystem(object):
 
 class ExchangeClassifierSystem(ClassifierSystem):
 
-    def __init__(self, b11, b12, initial_strength):
+    def __init__(self, b11, b12, initial_strength, sampler=None):
 
-        super().__init__()
+        super().__init__(sampler=sampler)
 
         self.b11 = b11
         self.b12 = b12
@@ -193,9 +197,9 @@ class ExchangeClassifierSystem(ClassifierSystem):
 
 class ConsumptionClassifierSystem(ClassifierSystem):
 
-    def __init__(self, b21, b22, initial_strength):
+    def __init__(self, b21, b22, initial_strength, sampler=None):
 
-        super().__init__()
+        super().__init__(sampler=sampler)
 
         self.b21 = b21
         self.b22 = b22
@@ -345,10 +349,10 @@ class ConsumptionClassifier(Classifier):
 class MarimonEconomy(Economy):
 
     def __init__(self, repartition_of_roles, t_max, storing_costs,
-                 b11, b12, b21, b22, initial_strength, u):
+                 b11, b12, b21, b22, initial_strength, u, seed=None):
         
         super().__init__(repartition_of_roles=repartition_of_roles, t_max=t_max, storing_costs=storing_costs,
-                         agent_model=MarimonAgent, u=u)
+                         agent_model=MarimonAgent, u=u, seed=seed)
 
         self.exchange_classifier_systems = []
         self.consumption_classifier_systems = []
@@ -358,13 +362,15 @@ class MarimonEconomy(Economy):
                 ExchangeClassifierSystem(
                     b11=b11,
                     b12=b12,
-                    initial_strength=initial_strength)
+                    initial_strength=initial_strength,
+                    sampler=self.sampler)
             )
             self.consumption_classifier_systems.append(
                 ConsumptionClassifierSystem(
                     b21=b21,
                     b22=b22,
-                    initial_strength=initial_strength)
+                    initial_strength=initial_strength,
+                    sampler=self.sampler)
             )
 
     def create_agents(self):
@@ -384,7 +390,8 @@ class MarimonEconomy(Economy):
                     idx=agent_idx,
                     exchange_classifier_system=self.exchange_classifier_systems[agent_type],
                     consumption_classifier_system=self.consumption_classifier_systems[agent_type],
-                    u=self.u
+                    u=self.u,
+                    sampler=self.sampler
                 )
 
                 agents.append(a)
@@ -131,7 +131,23 @@ class RL2Agent(StupidAgent):
         # Obtain probability of using this or that strategy by a softmax,
         # and then select a strategy according to these probabilities
         p_values = softmax(self.strategies_values, self.temp)
-        self.followed_strategy = np.random.choice(np.arange(len(self.strategies_values)), p=p_values)
+        self.followed_strategy = self.sampler.categorical(p_values)
+
+    # ------------------------ CHECKPOINT ------------------------------------------------------ #
+
+    def get_state(self):
+
+        state = super().get_state()
+        state["strategies_values"] = self.strategies_values.copy()
+        state["followed_strategy"] = -1 if self.followed_strategy is None else self.followed_strategy
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+        self.strategies_values[:] = state["strategies_values"]
+        self.followed_strategy = None if state["followed_strategy"] == -1 else int(state["followed_strategy"])
 
 
 def main():
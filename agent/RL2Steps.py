@@ -114,7 +114,7 @@ class RL2StepsAgent(StupidAgent):
         # Obtain probability of using this or that strategy by a softmax,
         # and then select a strategy according to these probabilities
         p_values = softmax(relevant_strategies_values, self.temp)
-        self.followed_strategy = np.random.choice(np.arange(len(relevant_strategies_values)), p=p_values)
+        self.followed_strategy = self.sampler.categorical(p_values)
 
     def consume(self):
 
@@ -148,6 +148,129 @@ class RL2StepsAgent(StupidAgent):
 
         self.learn()
 
+    # ---------- CHECKPOINT ---------- #
+
+    def get_state(self):
+
+        # Checkpoints are made between rounds: the pair and strategy of the round are then the previous ones
+        state = super().get_state()
+        state["strategies"] = np.array(list(self.strategies.values()))
+        state["previous_matching_pair"] = np.array(self.previous_matching_pair)
+        state["previous_followed_strategy"] = self.previous_followed_strategy
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+
+        for values, saved_values in zip(self.strategies.values(), state["strategies"]):
+            values[:] = saved_values
+
+        self.previous_matching_pair = self.matching_pair = tuple(int(i) for i in state["previous_matching_pair"])
+        self.previous_followed_strategy = self.followed_strategy = int(state["previous_followed_strategy"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    # Index of the situation before the first encounter (the 6 others being in the order of 'generate_strategies')
+    first_situation = 6
+
+    @staticmethod
+    def get_situation(in_hand, P, partner_good):
+
+        # Good in hand (production or third good), partner good
+        return 3 * (in_hand != P) + partner_good
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        storing_costs = population["storing_costs"]
+        assert storing_costs.shape[-1] == 3, "RL2Steps Agent can not handle only 3 goods."
+
+        n_agent = len(population["P"])
+        agent_parameters = population["agent_parameters"]
+
+        # As 'define_u_and_storing_costs' (for each economy if the population gathers several of them)
+        amplitude = population["u"] - storing_costs.min(axis=-1) + storing_costs.max(axis=-1)
+
+        # Q-values of the 6 situations, and of the one before the first encounter
+        q_values = np.zeros((n_agent, cls.first_situation + 1, 2))
+        q_values[:, :cls.first_situation] = agent_parameters["q_values"]
+
+        population.update({
+            "alpha": agent_parameters["alpha"],
+            "gamma": agent_parameters["gamma"],
+            "temp": agent_parameters["temp"],
+            "relative_u": np.asarray(population["u"] / amplitude),
+            "relative_storing_costs": storing_costs / np.asarray(amplitude)[..., None],
+            "q_values": q_values,
+            # Situations and strategies followed at the previous round and at this one
+            "previous_situation": np.full(n_agent, cls.first_situation),
+            "previous_followed_strategy": np.zeros(n_agent, dtype=int),
+            "situation": np.full(n_agent, cls.first_situation),
+            "followed_strategy": np.zeros(n_agent, dtype=int)
+        })
+
+        return population
+
+    @classmethod
+    def get_p_values(cls, population, agents, situations):
+
+        # Softmax as in 'useful_functions' (temperature as a C float)
+        exp_q = np.exp(population["q_values"][agents, situations] / float(np.float32(population["temp"])))
+
+        return exp_q / exp_q.sum(axis=1)[:, None]
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        situations = cls.get_situation(in_hand=population["H"][agents], P=population["P"][agents],
+                                       partner_good=partner_goods)
+
+        return cls.get_p_values(population, agents=agents, situations=situations)[:, 1]
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        situations = cls.get_situation(in_hand=population["H"][agents], P=population["P"][agents],
+                                       partner_good=partner_goods)
+
+        # 'select_strategy': strategy 0 (refusing) if the draw is below its probability (as 'Sampler.categorical')
+        p_values = cls.get_p_values(population, agents=agents, situations=situations)
+        strategies = population["sampler"].random(len(agents)) >= p_values[:, 0]
+
+        population["situation"][agents] = situations
+        population["followed_strategy"][agents] = strategies
+
+        return strategies
+
+    @classmethod
+    def learn_batch(cls, population):
+
+        # 'learn' after consumption, for every agent (as for agents as objects,
+        # an agent without partner this round learns again from his last encounter)
+        q_values = population["q_values"]
+        agents = np.arange(len(q_values))
+
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, population["relative_storing_costs"], agents), (len(agents), 3))
+        u = cls.select_economy(population, population["relative_u"], agents)
+
+        utility = storing_costs.max(axis=1) + u * population["consumption"] - storing_costs[agents, population["H"]]
+
+        # Previous situation, then this one (each update reads the values left by the previous one)
+        for learning_rate, key in [(population["alpha"], "previous_"), (population["gamma"], "")]:
+
+            situations, strategies = population[key + "situation"], population[key + "followed_strategy"]
+
+            q = q_values[agents, situations, strategies]
+            q_values[agents, situations, strategies] = q + learning_rate * (utility - q)
+
+        population["previous_situation"][:] = population["situation"]
+        population["previous_followed_strategy"][:] = population["followed_strategy"]
+
 
 def main():
 
@@ -16,43 +16,45 @@ class StrategicRLAgent(StupidAgent):
 
     name = "RL"
 
+    # ------- STRATEGIES ------- #
+
+    # Dimension 0: strategies,
+    # Dimension 1: object in hand with relative idx (0: production good, 1: consumption good, 2: third good),
+    # Dimension 2: proposed object with relative idx (0: production good, 1: consumption good, 2: third good),
+    # We suppose that :
+    # - An agent can never has his consumption good in hand
+    #                   -> he directly consumes it (that is why we have 'nan' for Not A Number)
+    # - An agent always accepts his consumption good
+    # - An agent always refuse the exchange if the proposed object is the same that the one he has in hand
+    # - Strategies therefore contrast by attitude of the agent towards the third good if he has his production
+    #    good in hand, and the production good if he has his third good in hand
+    strategies = np.array([
+        # Strategy '0'
+        [[0, 1, 0],
+         [np.nan, np.nan, np.nan],
+         [0, 1, 0]],
+        # Strategy '1'
+        [[0, 1, 1],
+         [np.nan, np.nan, np.nan],
+         [0, 1, 0]],
+        # Strategy '2'
+        [[0, 1, 0],
+         [np.nan, np.nan, np.nan],
+         [1, 1, 0]],
+        # Strategy '3'
+        [[0, 1, 1],
+         [np.nan, np.nan, np.nan],
+         [1, 1, 0]],
+    ])
+
+    # Action of each strategy for each situation (object in hand and proposed object with relative idx),
+    # the situation being 3 * relative idx of the object in hand + relative idx of the proposed object
+    actions = strategies.reshape(len(strategies), -1).T
+
     def __init__(self, **kwargs):
 
         super().__init__(**kwargs)
 
-        # ------- STRATEGIES ------- #
-
-        # Dimension 0: strategies,
-        # Dimension 1: object in hand with relative idx (0: production good, 1: consumption good, 2: third good),
-        # Dimension 2: proposed object with relative idx (0: production good, 1: consumption good, 2: third good),
-        # We suppose that :
-        # - An agent can never has his consumption good in hand
-        #                   -> he directly consumes it (that is why we have 'nan' for Not A Number)
-        # - An agent always accepts his consumption good
-        # - An agent always refuse the exchange if the proposed object is the same that the one he has in hand
-        # - Strategies therefore contrast by attitude of the agent towards the third good if he has his production
-        #    good in hand, and the production good if he has his third good in hand
-        self.strategies = np.array([
-            # Strategy '0'
-            [[0, 1, 0],
-             [np.nan, np.nan, np.nan],
-             [0, 1, 0]],
-            # Strategy '1'
-            [[0, 1, 1],
-             [np.nan, np.nan, np.nan],
-             [0, 1, 0]],
-            # Strategy '2'
-            [[0, 1, 0],
-             [np.nan, np.nan, np.nan],
-             [1, 1, 0]],
-            # Strategy '3'
-            [[0, 1, 1],
-             [np.nan, np.nan, np.nan],
-             [1, 1, 0]],
-        ])
-        
-        self.strategies_values = np.random.random(len(self.strategies))
-        
         # It will be an integer between 0 and 3
         self.followed_strategy = None
 
@@ -83,6 +85,10 @@ class StrategicRLAgent(StupidAgent):
 
         return to_return
 
+    def get_situation(self, partner_good):
+
+        return 3 * self.absolute_to_relative[self.H] + self.absolute_to_relative[partner_good]
+
     @staticmethod
     def define_u_and_storing_costs(u, storing_costs):
 
@@ -101,9 +107,7 @@ class StrategicRLAgent(StupidAgent):
     def are_you_satisfied(self, partner_good, partner_type, proportions=None):
 
         self.select_strategy()
-        agreeing = self.strategies[self.followed_strategy, 
-                                   self.absolute_to_relative[self.H], 
-                                   self.absolute_to_relative[partner_good]]
+        agreeing = self.actions[self.get_situation(partner_good), self.followed_strategy]
 
         return agreeing
 
@@ -138,18 +142,13 @@ class StrategicRLAgent(StupidAgent):
         # Obtain probability of using this or that strategy by a softmax,
         # and then select a strategy according to these probabilities
         p_values = softmax(self.strategies_values, self.temp)
-        self.followed_strategy = np.random.choice(np.arange(len(self.strategies_values)), p=p_values)
+        self.followed_strategy = self.sampler.categorical(p_values)
 
     # ---------- OPTIMIZATION PART ---------- #
 
     def probability_of_responding(self, subject_response, partner_good, partner_type, proportions):
 
-        compatible = \
-            self.strategies[
-                :,
-                self.absolute_to_relative[self.H],
-                self.absolute_to_relative[partner_good]
-            ] == subject_response
+        compatible = self.actions[self.get_situation(partner_good)] == subject_response
 
         p_values = softmax(self.strategies_values, self.temp)
         return sum(p_values[compatible])
@@ -163,6 +162,112 @@ class StrategicRLAgent(StupidAgent):
 
         self.consume()  # Include learning in this model
 
+    # ---------- CHECKPOINT ---------- #
+
+    def get_state(self):
+
+        state = super().get_state()
+        state["strategies_values"] = self.strategies_values.copy()
+        state["followed_strategy"] = -1 if self.followed_strategy is None else self.followed_strategy
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+        self.strategies_values[:] = state["strategies_values"]
+        self.followed_strategy = None if state["followed_strategy"] == -1 else int(state["followed_strategy"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    @staticmethod
+    def get_relative(goods, P, C):
+
+        # As 'absolute_to_relative' (0: production good, 1: consumption good, 2: third good)
+        return np.where(goods == P, 0, np.where(goods == C, 1, 2))
+
+    @classmethod
+    def create_population(cls, **kwargs):
+
+        population = super().create_population(**kwargs)
+
+        storing_costs = population["storing_costs"]
+        assert storing_costs.shape[-1] == 3, "Strategic RL Agent can not handle only 3 goods."
+
+        n_agent = len(population["P"])
+        agent_parameters = population["agent_parameters"]
+
+        # As 'define_u_and_storing_costs' (for each economy if the population gathers several of them)
+        amplitude = population["u"] - storing_costs.min(axis=-1) + storing_costs.max(axis=-1)
+
+        population.update({
+            "alpha": agent_parameters["alpha"],
+            "temp": agent_parameters["temp"],
+            "relative_u": np.asarray(population["u"] / amplitude),
+            "relative_storing_costs": storing_costs / np.asarray(amplitude)[..., None],
+            "strategies_values": np.tile(np.asarray(agent_parameters["strategy_values"], dtype=float), (n_agent, 1)),
+            "followed_strategy": np.zeros(n_agent, dtype=int)
+        })
+
+        return population
+
+    @classmethod
+    def get_p_values(cls, population, agents):
+
+        # Softmax by row (temperature as a C float, as in 'useful_functions'),
+        # values being shifted by their maximum so that a low temperature can not overflow
+        values = population["strategies_values"][agents]
+        exp_values = np.exp((values - values.max(axis=1)[:, None]) / float(np.float32(population["temp"])))
+
+        return exp_values / exp_values.sum(axis=1)[:, None]
+
+    @classmethod
+    def select_strategies(cls, population, agents):
+
+        # Inverse of the cumulative distribution, one uniform draw by agent (as 'Sampler.categorical')
+        cumulative = np.cumsum(cls.get_p_values(population, agents=agents), axis=1)
+        draws = population["sampler"].random(len(agents))
+
+        return (draws[:, None] >= cumulative[:, :-1]).sum(axis=1)
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        P, C = population["P"][agents], population["C"][agents]
+        situations = 3 * cls.get_relative(population["H"][agents], P=P, C=C) + \
+            cls.get_relative(partner_goods, P=P, C=C)
+
+        # Probability of following a strategy accepting in this situation
+        return np.sum(cls.get_p_values(population, agents=agents) * (cls.actions[situations] == 1), axis=1)
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        P, C = population["P"][agents], population["C"][agents]
+        situations = 3 * cls.get_relative(population["H"][agents], P=P, C=C) + \
+            cls.get_relative(partner_goods, P=P, C=C)
+
+        strategies = cls.select_strategies(population, agents=agents)
+        population["followed_strategy"][agents] = strategies
+
+        return cls.actions[situations, strategies] == 1
+
+    @classmethod
+    def learn_batch(cls, population):
+
+        # 'learn' after consumption, for every agent
+        values = population["strategies_values"]
+        agents = np.arange(len(values))
+        strategies = population["followed_strategy"]
+
+        storing_costs = np.broadcast_to(
+            cls.select_economy(population, population["relative_storing_costs"], agents), (len(agents), 3))
+        u = cls.select_economy(population, population["relative_u"], agents)
+
+        utility = storing_costs.max(axis=1) + population["consumption"] * u - storing_costs[agents, population["H"]]
+
+        values[agents, strategies] += population["alpha"] * (utility - values[agents, strategies])
+
 
 def run_single_agent():
 
@@ -1,8 +1,24 @@
 import numpy as np
 
+from cmodule.sampler import Sampler
 from environment.Economy import launch
 from graph.graph import represent_results
 
+# Source of random numbers for agents created outside of an economy (e.g. for fitting), created on first use
+_default_sampler = None
+
+
+def get_default_sampler():
+
+    # Numbers are drawn one at a time from the global numpy state (nothing is prefetched),
+    # so that seeding it with 'np.random.seed' at any time makes runs reproducible
+    global _default_sampler
+
+    if _default_sampler is None:
+        _default_sampler = Sampler(block_size=1)
+
+    return _default_sampler
+
 
 class StupidAgent(object):
 
@@ -11,8 +27,11 @@ class StupidAgent(object):
     """
     name = "Stupid agent"
 
+    # Decisions only depend on the situation of the encounter (and on the proportions)
+    memoryless = True
+
     def __init__(self, prod, cons, storing_costs, u=1,  beta=0.9,
-                 agent_parameters=None, idx=None):
+                 agent_parameters=None, idx=None, sampler=None):
 
         # Production object (integer in [0, 1, 2])
         self.P = prod
@@ -31,6 +50,9 @@ class StupidAgent(object):
         self.u = u
         self.beta = beta
 
+        # Source of random numbers (shared by all the agents of an economy)
+        self.sampler = sampler if sampler is not None else get_default_sampler()
+
         # Keep a trace for time t if the agent consumed or not.
         self.consumption = 0
 
@@ -45,7 +67,7 @@ class StupidAgent(object):
         if partner_good == self.C:
             return True
         else:
-            return np.random.choice([True, False])
+            return self.sampler.bernoulli(0.5)
 
     def consume(self):
 
@@ -86,6 +108,98 @@ class StupidAgent(object):
             if self.H == self.C:
                     self.H = self.P
 
+    # -------------- CHECKPOINT ------------------------- #
+
+    def get_state(self):
+
+        # What evolves over a run, as numbers or arrays of the same shape for every agent of a model
+        return {
+            "H": self.H,
+            "consumption": int(self.consumption),
+            "exchange": -1 if self.exchange is None else int(self.exchange)
+        }
+
+    def set_state(self, state):
+
+        self.H = int(state["H"])
+        self.consumption = int(state["consumption"])
+        self.exchange = None if state["exchange"] == -1 else bool(state["exchange"])
+
+    # -------------- BATCH (WHOLE POPULATION) ------------------------- #
+
+    @classmethod
+    def create_population(cls, P, C, H, consumption, storing_costs, u=1, beta=0.9, agent_parameters=None,
+                          sampler=None, economy=None):
+
+        # State of a whole population of agents: each agent is a row of the arrays.
+        # P, C, H and consumption are owned by the economy, that proceeds to exchanges and consumption.
+        # If the population gathers several economies, 'economy' gives the economy of each agent,
+        # and storing costs (as proportions) are given by economy.
+        population = {
+            "P": P,
+            "C": C,
+            "H": H,
+            "consumption": consumption,
+            "storing_costs": np.asarray(storing_costs),
+            "u": u,
+            "beta": beta,
+            "agent_parameters": agent_parameters,
+            "sampler": sampler if sampler is not None else get_default_sampler(),
+            "economy": economy
+        }
+
+        return population
+
+    @staticmethod
+    def select_economy(population, values, agents):
+
+        # For a population gathering several economies, values given by economy are given for each agent
+        if population["economy"] is None:
+            return values
+
+        return values[population["economy"][agents]]
+
+    @classmethod
+    def acceptance_probability_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        # Accept his consumption good, otherwise toss a coin
+        return np.where(partner_goods == population["C"][agents], 1., 0.5)
+
+    @classmethod
+    def decide_batch(cls, population, agents, partner_goods, partner_types, proportions=None):
+
+        p_accept = cls.acceptance_probability_batch(
+            population, agents=agents, partner_goods=partner_goods, partner_types=partner_types,
+            proportions=proportions)
+
+        return population["sampler"].random(len(agents)) < p_accept
+
+    @classmethod
+    def proceed_to_exchange_batch(cls, population, agents, exchanging):
+
+        # Goods in hand are exchanged by the economy, nothing to keep
+        pass
+
+    @classmethod
+    def consume_batch(cls, population):
+
+        """
+         'consume' for every agent: goods are moved by the economy
+        :return: agents getting a new good in hand, and these goods
+        """
+
+        # Agents having their consumption good in hand consume it and produce a new unit of their production good
+        population["consumption"][:] = population["H"] == population["C"]
+
+        consuming = np.flatnonzero(population["consumption"])
+        return consuming, population["P"][consuming]
+
+    @classmethod
+    def learn_batch(cls, population):
+
+        # Nothing to learn
+        pass
+
 
 def main():
 
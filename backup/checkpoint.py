@@ -0,0 +1,106 @@
+import json
+from importlib import import_module
+from os import path, replace
+
+import numpy as np
+
+'''
+Checkpoints of a run: a single (uncompressed) '.npz' file.
+The state to save is a nested dictionary: its arrays are written as such (keys being their path
+ in the dictionary), everything else goes in a JSON header. Nothing is pickled.
+'''
+
+HEADER_KEY = "__header__"
+
+
+def split_arrays(state, prefix, arrays):
+
+    """
+    Move the arrays of a nested dictionary in 'arrays' (keys being their path)
+    :return: the rest of the dictionary, arrays being replaced by their path
+    """
+
+    header = dict()
+
+    for key, value in state.items():
+
+        key_path = "{}/{}".format(prefix, key) if prefix else key
+
+        if isinstance(value, dict):
+            header[key] = split_arrays(value, prefix=key_path, arrays=arrays)
+
+        elif isinstance(value, np.ndarray):
+            arrays[key_path] = value
+            header[key] = {"__array__": key_path}
+
+        else:
+            header[key] = value
+
+    return header
+
+
+def merge_arrays(header, arrays):
+
+    state = dict()
+
+    for key, value in header.items():
+
+        if isinstance(value, dict) and "__array__" in value:
+            state[key] = arrays[value["__array__"]]
+
+        elif isinstance(value, dict):
+            state[key] = merge_arrays(value, arrays=arrays)
+
+        else:
+            state[key] = value
+
+    return state
+
+
+def to_json(value):
+
+    # Numpy scalars (e.g. storing costs or counters read from arrays)
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError("{} can not be written in a checkpoint.".format(type(value)))
+
+
+def save_checkpoint(file_name, state):
+
+    file_name = path.expanduser(file_name)
+
+    arrays = dict()
+    header = split_arrays(state, prefix="", arrays=arrays)
+    arrays[HEADER_KEY] = np.array(json.dumps(header, default=to_json))
+
+    # Written aside first, so that an interruption never leaves a corrupted checkpoint
+    tmp_file_name = file_name + ".tmp"
+
+    with open(tmp_file_name, "wb") as f:
+        np.savez(f, **arrays)
+
+    replace(tmp_file_name, file_name)
+
+
+def load_checkpoint(file_name):
+
+    with np.load(path.expanduser(file_name), allow_pickle=False) as data:
+        arrays = dict([(key, data[key]) for key in data.files])
+
+    header = json.loads(str(arrays.pop(HEADER_KEY)))
+
+    return merge_arrays(header, arrays=arrays)
+
+
+def get_object_path(obj):
+
+    # Classes (economy, agent model) are saved by their path
+    return "{}.{}".format(obj.__module__, obj.__qualname__)
+
+
+def import_object(object_path):
+
+    module_name, _, name = object_path.rpartition(".")
+
+    return getattr(import_module(module_name), name)
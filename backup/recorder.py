@@ -0,0 +1,275 @@
+import json
+from multiprocessing.shared_memory import SharedMemory
+from os import makedirs, path
+
+import numpy as np
+
+from environment.get_exchange_types import get_exchange_types
+
+
+class ExchangesView(object):
+
+    """
+    Read-only view over the recorded exchanges that behaves like the former list of dictionaries
+    (one dictionary by round, keys being the types of exchange)
+    """
+
+    def __init__(self, array, exchange_types):
+
+        self.array = array
+        self.exchange_types = exchange_types
+
+    def __len__(self):
+
+        return len(self.array)
+
+    def __getitem__(self, t):
+
+        if isinstance(t, slice):
+            return [self[i] for i in range(*t.indices(len(self)))]
+
+        return dict(zip(self.exchange_types, self.array[t].tolist()))
+
+    def __iter__(self):
+
+        for t in range(len(self)):
+            yield self[t]
+
+
+class BackUpRecorder(object):
+
+    """
+    Container for the statistics of every round, preallocated as arrays of size t_max
+    and filled in place (no copy nor list growing over time)
+    """
+
+    keys = ["exchanges", "n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]
+
+    def __init__(self, t_max, n_goods):
+
+        self.t_max = t_max
+        self.n_goods = n_goods
+
+        self.exchange_types = get_exchange_types(n_goods)
+
+        # Shape of what is recorded for a single round
+        self.shapes = self.get_shapes(n_goods)
+
+        self.columns = self.allocate(n_rows=t_max)
+
+        # Number of rounds recorded so far
+        self.t = 0
+
+    @staticmethod
+    def get_shapes(n_goods):
+
+        return {
+            "exchanges": (n_goods * (n_goods - 1) // 2, ),
+            "n_exchanges": (),
+            "consumption": (),
+            "good_accepted_as_medium": (n_goods, ),
+            "proportions": (n_goods, n_goods)
+        }
+
+    def allocate(self, n_rows):
+
+        return dict([(key, np.zeros((n_rows, ) + self.shapes[key])) for key in self.keys])
+
+    def record(self, **statistics):
+
+        for key in self.keys:
+            self.columns[key][self.t] = statistics[key]
+
+        self.t += 1
+
+    def get_state(self):
+
+        # Rounds recorded so far (for checkpoints)
+        return {"t": self.t, "columns": dict([(key, self.columns[key][:self.t]) for key in self.keys])}
+
+    def set_state(self, state):
+
+        self.t = state["t"]
+
+        for key in self.keys:
+            self.columns[key][:self.t] = state["columns"][key]
+
+    def get_back_up(self):
+
+        # Arrays are truncated to the rounds actually recorded (no copy)
+        return self.format_back_up(
+            columns=dict([(key, self.columns[key][:self.t]) for key in self.keys]),
+            exchange_types=self.exchange_types)
+
+    @staticmethod
+    def format_back_up(columns, exchange_types):
+
+        back_up = columns.copy()
+        back_up["exchanges"] = ExchangesView(columns["exchanges"], exchange_types)
+
+        return back_up
+
+
+class StreamingBackUpRecorder(BackUpRecorder):
+
+    """
+    Recorder for very long runs: statistics are kept in a buffer of 'buffer_size' rounds,
+    that is written by chunks in memory-mapped '.npy' files (one by statistic) in 'folder'.
+    """
+
+    meta_file_name = "meta.json"
+
+    def __init__(self, t_max, n_goods, folder, buffer_size=1000):
+
+        self.folder = path.expanduser(folder)
+        self.buffer_size = buffer_size
+
+        super().__init__(t_max=t_max, n_goods=n_goods)
+
+        makedirs(self.folder, exist_ok=True)
+
+        # Files are only created at the first writing (a resumed run goes on with the files already written)
+        self.files = None
+
+        # Number of rounds already written on disk
+        self.t_written = 0
+
+    @staticmethod
+    def get_file_name(folder, key):
+
+        return path.join(folder, "{}.npy".format(key))
+
+    def open_files(self, mode):
+
+        self.files = dict([
+            (key, np.lib.format.open_memmap(
+                self.get_file_name(self.folder, key), mode=mode, dtype=float, shape=(self.t_max, ) + self.shapes[key]))
+            for key in self.keys])
+
+    def allocate(self, n_rows):
+
+        # Only the buffer lives in memory
+        return super().allocate(n_rows=min(n_rows, self.buffer_size))
+
+    def record(self, **statistics):
+
+        for key in self.keys:
+            self.columns[key][self.t - self.t_written] = statistics[key]
+
+        self.t += 1
+
+        if self.t - self.t_written == self.buffer_size:
+            self.flush()
+
+    def flush(self):
+
+        n = self.t - self.t_written
+
+        if self.files is None:
+            self.open_files(mode="w+")
+
+        for key in self.keys:
+            self.files[key][self.t_written:self.t] = self.columns[key][:n]
+            self.files[key].flush()
+
+        self.t_written = self.t
+
+        with open(path.join(self.folder, self.meta_file_name), "w") as f:
+            json.dump({"t": self.t, "exchange_types": self.exchange_types}, f)
+
+    def get_state(self):
+
+        # Everything recorded is on disk once the buffer is flushed
+        self.flush()
+
+        return {"t": self.t}
+
+    def set_state(self, state):
+
+        self.t = self.t_written = state["t"]
+        self.open_files(mode="r+")
+
+    def get_back_up(self):
+
+        self.flush()
+
+        return load_back_up(self.folder)
+
+
+class SharedMemoryRecorder(BackUpRecorder):
+
+    """
+    Recorder for ensembles of runs: each statistic lives in a block of shared memory
+    holding one row by replicate, and the run of index 'replicate' writes directly in its own row
+    (nothing has to be sent back to the parent process).
+    """
+
+    def __init__(self, t_max, n_goods, block_names, replicate):
+
+        self.block_names = block_names
+        self.replicate = replicate
+
+        self.blocks = dict()
+
+        super().__init__(t_max=t_max, n_goods=n_goods)
+
+    @classmethod
+    def create_blocks(cls, t_max, n_goods, n_replicates):
+
+        shapes = cls.get_shapes(n_goods)
+
+        return dict([
+            (key, SharedMemory(create=True, size=n_replicates * t_max * int(np.prod(shapes[key])) * 8))
+            for key in cls.keys])
+
+    @classmethod
+    def get_replicates(cls, blocks, t_max, n_goods, n_replicates):
+
+        # Arrays (replicates x rounds x ...) over the blocks, for the parent process
+        shapes = cls.get_shapes(n_goods)
+
+        return dict([
+            (key, np.ndarray((n_replicates, t_max) + shapes[key], dtype=float, buffer=blocks[key].buf))
+            for key in cls.keys])
+
+    def allocate(self, n_rows):
+
+        columns = dict()
+
+        for key in self.keys:
+
+            self.blocks[key] = SharedMemory(name=self.block_names[key])
+
+            row_size = n_rows * int(np.prod(self.shapes[key])) * 8
+            columns[key] = np.ndarray((n_rows, ) + self.shapes[key], dtype=float,
+                                      buffer=self.blocks[key].buf, offset=self.replicate * row_size)
+
+        return columns
+
+    def close(self):
+
+        # Views have to be released before the blocks
+        self.columns = None
+
+        for block in self.blocks.values():
+            block.close()
+
+
+def load_back_up(folder):
+
+    """
+    Memory-map a backup written by a 'StreamingBackUpRecorder' (nothing is loaded until it is read)
+    """
+
+    folder = path.expanduser(folder)
+
+    with open(path.join(folder, StreamingBackUpRecorder.meta_file_name)) as f:
+        meta = json.load(f)
+
+    columns = dict([
+        (key, np.load(StreamingBackUpRecorder.get_file_name(folder, key), mmap_mode="r")[:meta["t"]])
+        for key in BackUpRecorder.keys])
+
+    exchange_types = [tuple(i) for i in meta["exchange_types"]]
+
+    return BackUpRecorder.format_back_up(columns=columns, exchange_types=exchange_types)
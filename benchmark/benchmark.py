@@ -0,0 +1,334 @@
+import json
+import platform
+import tracemalloc
+from os import path
+from time import perf_counter
+
+import numpy as np
+
+from agent.DuffyAgent import DuffyAgent
+from agent.ForwardRL import ForwardRLAgent
+from agent.FrequentistAgent import FrequentistAgent
+from agent.KwAgent import KwAgent
+from agent.MarimonAgent import MarimonAgent
+from agent.RL2Steps import RL2StepsAgent
+from agent.StrategicRL import StrategicRLAgent
+from agent.stupid_agent import StupidAgent
+from environment.Economy import Economy
+
+'''
+Benchmark of the economies for every agent model (agent-rounds by second, time by round and peak memory)
+ across population sizes and lengths of run, of the fitting path (one evaluation of the fit criterion
+ for a subject) and of the worker of the storing costs sweep.
+Results are written in a JSON file and compared with a baseline, saved beforehand with 'save_baseline'.
+'''
+
+# Parameters of the 'main' of each agent module
+MODELS = {
+    "Stupid": {
+        "agent_model": StupidAgent,
+        "storing_costs": [0.01, 0.04, 0.09]
+    },
+    "Kw": {
+        "agent_model": KwAgent,
+        "storing_costs": [0.01, 0.04, 0.09], "u": 1, "beta": 0.9
+    },
+    "Duffy": {
+        "agent_model": DuffyAgent,
+        "storing_costs": [0.01, 0.04, 0.09], "u": 1, "beta": 0.9
+    },
+    "Frequentist": {
+        "agent_model": FrequentistAgent,
+        "agent_parameters": {"acceptance_memory_span": 1000, "encounter_memory_span": 1000, "temp": 0.1},
+        "storing_costs": [0.01, 0.04, 0.09], "u": 1, "beta": 0.9
+    },
+    "StrategicRL": {
+        "agent_model": StrategicRLAgent,
+        "agent_parameters": {"alpha": 0.2, "temp": 0.01, "strategy_values": np.ones(4)},
+        "storing_costs": [0.10, 0.20, 0.24], "u": 1
+    },
+    "ForwardRL": {
+        "agent_model": ForwardRLAgent,
+        "agent_parameters": {"alpha": 0.2, "temp": 0.01, "gamma": 0.2, "q_values": np.ones((12, 2))},
+        "storing_costs": [0.1, 0.24, 0.32], "u": 1
+    },
+    "RL2Steps": {
+        "agent_model": RL2StepsAgent,
+        "agent_parameters": {"alpha": 0.1, "temp": 0.1, "gamma": 0.1, "q_values": np.ones((6, 2))},
+        "storing_costs": [0.10, 0.20, 0.24], "u": 1
+    },
+    "Marimon": {
+        "agent_model": MarimonAgent,
+        "agent_parameters": {"u": 500, "b11": 0.025, "b12": 0.025, "b21": 0.25, "b22": 0.25, "initial_strength": 0},
+        "storing_costs": [0.1, 1., 20.]
+    }
+}
+
+# Random parameters for the fitted models, and models without parameters
+FITTED_MODELS = {
+    "ForwardRL": lambda rng: np.concatenate(([0.2, 0.1, 0.2], rng.random(24))),
+    "RL2Steps": lambda rng: np.concatenate(([0.2, 0.1, 0.2], rng.random(12))),
+    "StrategicRL": lambda rng: np.concatenate(([0.2, 0.1], rng.random(4))),
+    "Frequentist": lambda rng: np.concatenate(([20, 20, 0.1], rng.random(12)))
+}
+NON_PARAMETRIZED_MODELS = ["KW", "Duffy", "StupidAgent", "TotalGogol"]
+
+POPULATION_SIZES = [150, 1500, 15000, 150000]
+RUN_LENGTHS = [50, 500]
+
+# Cases costing more agent-rounds than that are skipped (the slowest models would take hours)
+MAX_AGENT_ROUNDS = 10**7
+
+# Rounds of the (traced, thus slower) run measuring the peak of memory
+MEMORY_ROUNDS = 5
+
+# Runs by measure of time
+N_REPEATS = 3
+
+# Relative loss of speed (or increase of memory) beyond which a case is reported as a regression
+TOLERANCE = 0.2
+
+
+def measure_time(function, n_repeats=N_REPEATS):
+
+    # Best of several runs, the least disturbed by the rest of the machine
+    times = []
+
+    for _ in range(n_repeats):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+
+    return min(times)
+
+
+def measure_peak_memory(function):
+
+    tracemalloc.start()
+
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+
+def run_economy(model, n_agent, t_max, seed=0):
+
+    parameters = dict(MODELS[model])
+    parameters["storing_costs"] = np.asarray(parameters["storing_costs"])
+    parameters["repartition_of_roles"] = np.full(3, n_agent // 3)
+
+    e = Economy(t_max=t_max, seed=seed, **parameters)
+    e.run()
+
+
+def benchmark_economy(model, n_agent, t_max):
+
+    t = measure_time(lambda: run_economy(model=model, n_agent=n_agent, t_max=t_max))
+    peak_memory = measure_peak_memory(lambda: run_economy(model=model, n_agent=n_agent, t_max=MEMORY_ROUNDS))
+
+    return {
+        "time": t,
+        "time_per_round": t / t_max,
+        "agent_rounds_per_second": n_agent * t_max / t,
+        "peak_memory": peak_memory
+    }
+
+
+def create_subject(t_max=60, seed=0):
+
+    """
+     Synthetic data of a subject, in the format given by 'data_analysis.data_manager' (the experimental data
+     being not distributed with the code): the subject produces good 0 and consumes good 2.
+    :return: individual data
+    """
+
+    rng = np.random.default_rng(seed)
+
+    partner_type = rng.integers(3, size=t_max)
+    partner_good = (partner_type + rng.integers(1, 3, size=t_max)) % 3
+
+    subject_good = rng.integers(2, size=t_max)
+    subject_good[0] = 0
+
+    prop = rng.random((t_max, 3))
+
+    return {
+        "subject_good": subject_good.tolist(),
+        "partner_good": partner_good.tolist(),
+        "partner_type": partner_type.tolist(),
+        "subject_choice": rng.integers(2, size=t_max).tolist(),
+        "partner_choice": rng.integers(2, size=t_max).tolist(),
+        "prop": prop / prop.sum(axis=1)[:, None],
+        "u": 100,
+        "beta": 0.9,
+        "storing_costs": [1, 4, 9]
+    }
+
+
+def benchmark_fitting(model, n_evaluations=100, seed=0):
+
+    # Imported here, as fitting needs 'hyperopt' that the simulations do not need
+    from fit_optimization.data_optmization_hyperopt_least_squares import PerformanceComputer
+
+    rng = np.random.default_rng(seed)
+    subject = create_subject(seed=seed)
+
+    if model in FITTED_MODELS:
+        pc = PerformanceComputer(individual_data=subject, model=model)
+        args = [list(FITTED_MODELS[model](rng)) for _ in range(n_evaluations)]
+
+    else:
+        pc = PerformanceComputer(individual_data=subject, model="NonParametrized")
+        # As given by 'evaluate' for these models
+        args = [((model, ), )] * n_evaluations
+
+    def evaluate():
+        for a in args:
+            pc.run(a)
+
+    t = measure_time(evaluate)
+
+    return {
+        "time": t,
+        "time_per_evaluation": t / n_evaluations,
+        "trials_per_second": n_evaluations * len(subject["subject_good"]) / t
+    }
+
+
+def benchmark_sweep_worker(storing_costs=(0.1, 0.2, 0.24)):
+
+    from exp_parameters_optimization.exp_parameters_optimization_by_hand import Computer
+
+    t = measure_time(lambda: Computer.fun_3_goods(storing_costs), n_repeats=1)
+
+    return {"time": t}
+
+
+def run_benchmark(models=None, population_sizes=None, run_lengths=None, max_agent_rounds=MAX_AGENT_ROUNDS,
+                  fitting=True, sweep=True):
+
+    """
+     Run every case, the cheapest first
+    :return: dictionary with information on the machine and results by case
+    """
+
+    models = models if models is not None else list(MODELS.keys())
+    population_sizes = population_sizes if population_sizes is not None else POPULATION_SIZES
+    run_lengths = run_lengths if run_lengths is not None else RUN_LENGTHS
+
+    results = dict()
+
+    for n_agent in population_sizes:
+        for t_max in run_lengths:
+            for model in models:
+
+                if n_agent * t_max > max_agent_rounds:
+                    continue
+
+                case = "economy/{}/{}/{}".format(model, n_agent, t_max)
+                print("Benchmarking {}...".format(case))
+                results[case] = benchmark_economy(model=model, n_agent=n_agent, t_max=t_max)
+
+    if fitting:
+        for model in list(FITTED_MODELS.keys()) + NON_PARAMETRIZED_MODELS:
+
+            case = "fitting/{}".format(model)
+            print("Benchmarking {}...".format(case))
+            results[case] = benchmark_fitting(model=model)
+
+    if sweep:
+        print("Benchmarking sweep worker...")
+        results["sweep/Frequentist"] = benchmark_sweep_worker()
+
+    return {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "numpy": np.__version__
+        },
+        "results": results
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+
+    """
+     Compare the cases present in both results
+    :return: list of regressions (case, measure, baseline value, new value)
+    """
+
+    regressions = []
+
+    for case, measures in sorted(results["results"].items()):
+
+        if case not in baseline["results"]:
+            continue
+
+        for measure, value in sorted(measures.items()):
+
+            baseline_value = baseline["results"][case][measure]
+
+            # Speeds have to stay high, times and memory have to stay low
+            if measure.endswith("per_second"):
+                regression = value < baseline_value * (1 - tolerance)
+            else:
+                regression = value > baseline_value * (1 + tolerance)
+
+            print("{:<40} {:<25} {:>14.6g} {:>14.6g} {:>8.1%}{}".format(
+                case, measure, baseline_value, value, value / baseline_value - 1, "  <--" if regression else ""))
+
+            if regression:
+                regressions.append((case, measure, baseline_value, value))
+
+    if baseline["machine"] != results["machine"]:
+        print("Warning: baseline was obtained on another machine ({}).".format(baseline["machine"]))
+
+    return regressions
+
+
+def save(results, file_name):
+
+    with open(path.expanduser(file_name), "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(file_name):
+
+    with open(path.expanduser(file_name)) as f:
+        return json.load(f)
+
+
+def save_baseline(baseline_file="benchmark/baseline.json", **kwargs):
+
+    # A baseline is only created (or replaced) on purpose: its results are the reference of the next runs
+    results = run_benchmark(**kwargs)
+    save(results, baseline_file)
+
+    print("Baseline saved in '{}'.".format(baseline_file))
+
+
+def main(results_file="benchmark/results.json", baseline_file="benchmark/baseline.json", **kwargs):
+
+    results = run_benchmark(**kwargs)
+    save(results, results_file)
+
+    if not path.exists(baseline_file):
+        print("Warning: no baseline in '{}', results are not compared "
+              "(a baseline is created by 'save_baseline', see 'main_benchmark_baseline.py').".format(baseline_file))
+        return None
+
+    regressions = compare(results, load(baseline_file))
+
+    print()
+    print("{} regression(s).".format(len(regressions)))
+
+    return regressions
+
+
+if __name__ == "__main__":
+
+    main()
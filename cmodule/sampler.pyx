@@ -0,0 +1,75 @@
+import numpy as np
+cimport cython
+
+
+cdef class Sampler:
+
+    """
+    Uniform numbers are drawn by blocks from a random generator (a 'numpy.random.Generator',
+    or the global numpy random state by default) and consumed one by one by the agents,
+    so that a single draw costs no more than a function call.
+    """
+
+    cdef public object generator
+    cdef public Py_ssize_t block_size
+    cdef double[::1] block
+    cdef Py_ssize_t position
+
+    def __init__(self, generator=None, Py_ssize_t block_size=4096):
+
+        self.generator = generator if generator is not None else np.random
+        self.block_size = block_size
+        self.refill()
+
+    cdef void refill(self):
+
+        self.block = np.asarray(self.generator.random(self.block_size), dtype=np.float64)
+        self.position = 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef double uniform(self):
+
+        if self.position == self.block_size:
+            self.refill()
+
+        self.position += 1
+        return self.block[self.position - 1]
+
+    cpdef bint bernoulli(self, double p):
+
+        # True with probability p
+        return self.uniform() < p
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef Py_ssize_t categorical(self, double[::1] p):
+
+        # Index k with probability p[k] (inverse of the cumulative distribution)
+        cdef double u = self.uniform()
+        cdef double cumulative = 0
+        cdef Py_ssize_t k
+        cdef Py_ssize_t n = p.shape[0]
+
+        for k in range(n - 1):
+            cumulative += p[k]
+            if u < cumulative:
+                return k
+
+        return n - 1
+
+    def get_state(self):
+
+        # Block being consumed and position in it (a checkpoint has to keep draws not consumed yet)
+        return {"block": np.array(self.block), "position": self.position}
+
+    def set_state(self, state):
+
+        self.block = np.array(state["block"], dtype=np.float64)
+        self.block_size = self.block.shape[0]
+        self.position = state["position"]
+
+    def random(self, n):
+
+        # Large draws (a whole population at once) go directly to the generator
+        return self.generator.random(n)
@@ -0,0 +1,216 @@
+import numpy as np
+from tqdm import tqdm
+
+from agent.KwAgent import KwAgent
+from environment.Economy import Economy
+from graph.graph import represent_results
+
+'''
+Economy for memoryless agents ('StupidAgent', 'KwAgent'): agents of the same type having the same good in hand
+ are interchangeable, so the only state kept is the number of agents of each type having each good in hand.
+Matching and decisions are sampled exactly (hypergeometric and multinomial draws),
+ so the cost of a round does not depend on the number of agents.
+'''
+
+
+def is_memoryless(agent_model):
+
+    # As for the batch API, a model is not memoryless just because its parent is
+    return vars(agent_model).get("memoryless", False) and "acceptance_probability_batch" in vars(agent_model)
+
+
+class CountsEconomy(Economy):
+
+    """ Economy class with full backup, keeping only the counts of agents by (type, good in hand)"""
+
+    def __init__(self, seed=None, **parameters):
+
+        super().__init__(seed=seed, **parameters)
+
+        assert is_memoryless(self.agent_model), \
+            "Counts economy can not handle '{}' agents.".format(self.agent_model.name)
+
+        # Draws of counts (multivariate hypergeometric) need a Generator, even without seed
+        self.rng = np.random.default_rng(seed)
+
+        # Categories of agents: category k is made of agents of type k // n_goods
+        # having the good k % n_goods in hand
+        self.n_categories = self.n_goods ** 2
+        self.type_of_category = np.repeat(np.arange(self.n_goods), self.n_goods)
+        self.good_of_category = np.tile(np.arange(self.n_goods), self.n_goods)
+
+        # Type of agent is his consumption good
+        self.production_of_type = np.zeros(self.n_goods, dtype=int)
+        self.production_of_type[self.roles[:, 1]] = self.roles[:, 0]
+
+        # Representative agent of each category, for computing acceptance probabilities
+        self.representatives = None
+
+        self.n_consumption = 0
+
+    def create_population(self):
+
+        self.counts[:] = 0
+        self.counts[self.roles[:, 1], self.roles[:, 0]] = self.repartition_of_roles
+
+        P = self.production_of_type[self.type_of_category]
+
+        return self.agent_model.create_population(
+            P=P, C=self.type_of_category.copy(), H=self.good_of_category.copy(),
+            consumption=np.zeros(self.n_categories, dtype=bool),
+            storing_costs=self.storing_costs,
+            u=self.u,
+            beta=self.beta,
+            agent_parameters=self.agent_parameters,
+            sampler=self.sampler)
+
+    def run(self):
+
+        self.representatives = self.create_population()
+
+        for t in tqdm(range(self.t_max)):
+            self.time_step()
+            self.n_rounds = t + 1
+
+            if self.has_converged():
+                break
+
+        return self.back_up
+
+    def time_step(self):
+
+        """
+         Overrided method: encounters are sampled as counts of pairs of categories
+        :return: None
+        """
+
+        self.reinitialize_backup_containers()
+        self.compute_proportions()
+
+        pairs = self.draw_pairs()
+
+        # p_accept[a, b]: probability for an agent of category a to accept the good of an agent of category b
+        a, b = np.divmod(np.arange(self.n_categories ** 2), self.n_categories)
+        p_accept = self.agent_model.acceptance_probability_batch(
+            self.representatives, agents=a,
+            partner_goods=self.good_of_category[b], partner_types=self.type_of_category[b],
+            proportions=self.proportions).reshape(self.n_categories, self.n_categories)
+
+        # Outcomes of the encounters for each pair of categories: both agree, only a agrees, only b agrees, none
+        p_a, p_b = p_accept, p_accept.T
+        p_values = np.stack([p_a * p_b, p_a * (1 - p_b), (1 - p_a) * p_b, (1 - p_a) * (1 - p_b)], axis=-1)
+        outcomes = self.rng.multinomial(pairs, np.clip(p_values, 0, 1))
+
+        both_agreeing = outcomes[..., 0]
+        a_agreeing = outcomes[..., 0] + outcomes[..., 1]
+        b_agreeing = outcomes[..., 0] + outcomes[..., 2]
+
+        self.make_stats_about_pairs(pairs=pairs, a_agreeing=a_agreeing, b_agreeing=b_agreeing,
+                                    both_agreeing=both_agreeing)
+        self.proceed_to_exchanges(both_agreeing=both_agreeing)
+
+        # Each agent consumes at the end of each round.
+        self.consume()
+
+        self.make_a_backup_for_t()
+
+    def draw_pairs(self):
+
+        remaining = self.counts.ravel().copy()
+
+        # If the number of agents is odd, one of them stays alone
+        if self.n_agent % 2:
+            alone = self.rng.choice(self.n_categories, p=remaining / remaining.sum())
+            remaining[alone] -= 1
+
+        # A random matching is a random half of agents ('a' side) paired at random with the other half ('b' side)
+        a_side = self.rng.multivariate_hypergeometric(remaining, self.n_agent // 2)
+        b_side = remaining - a_side
+
+        pairs = np.zeros((self.n_categories, self.n_categories), dtype=int)
+
+        for a in np.flatnonzero(a_side):
+            pairs[a] = self.rng.multivariate_hypergeometric(b_side, a_side[a])
+            b_side -= pairs[a]
+
+        return pairs
+
+    def make_stats_about_pairs(self, pairs, a_agreeing, b_agreeing, both_agreeing):
+
+        a_type, b_type = self.type_of_category[:, None], self.type_of_category[None, :]
+        a_H, b_H = self.good_of_category[:, None], self.good_of_category[None, :]
+        a_P, b_P = self.production_of_type[a_type], self.production_of_type[b_type]
+
+        a_H, b_H = np.broadcast_arrays(a_H, b_H)
+
+        # Consider particular case of offering third object
+        a_facing_M = (b_H != a_type) & (a_H == a_P)
+        b_facing_M = (a_H != b_type) & (b_H == b_P)
+
+        # Consider as key the good that is proposed as a medium of exchange
+        self.proposition_of_medium[:] = \
+            np.bincount(b_H[a_facing_M], weights=pairs[a_facing_M], minlength=self.n_goods) + \
+            np.bincount(a_H[b_facing_M], weights=pairs[b_facing_M], minlength=self.n_goods)
+        self.good_accepted_as_medium[:] = \
+            np.bincount(b_H[a_facing_M], weights=a_agreeing[a_facing_M], minlength=self.n_goods) + \
+            np.bincount(a_H[b_facing_M], weights=b_agreeing[b_facing_M], minlength=self.n_goods)
+
+        exchanging = a_H != b_H
+        self.exchanges[:] = np.bincount(
+            self.exchange_index[a_H[exchanging], b_H[exchanging]], weights=both_agreeing[exchanging],
+            minlength=len(self.exchange_types))
+
+        self.n_exchange = int(both_agreeing[exchanging].sum())
+
+    def proceed_to_exchanges(self, both_agreeing):
+
+        # Agents of category a leave with the good of category b, and conversely
+        leaving = both_agreeing.sum(axis=1) + both_agreeing.sum(axis=0)
+
+        a, b = np.divmod(np.arange(self.n_categories ** 2), self.n_categories)
+        a_arriving = self.type_of_category[a] * self.n_goods + self.good_of_category[b]
+        b_arriving = self.type_of_category[b] * self.n_goods + self.good_of_category[a]
+
+        arriving = \
+            np.bincount(a_arriving, weights=both_agreeing.ravel(), minlength=self.n_categories) + \
+            np.bincount(b_arriving, weights=both_agreeing.ravel(), minlength=self.n_categories)
+
+        self.counts += (arriving.astype(int) - leaving).reshape(self.n_goods, self.n_goods)
+
+    def consume(self):
+
+        types = np.arange(self.n_goods)
+
+        # Agents having their consumption good in hand consume it and produce a new unit of their production good
+        consuming = self.counts[types, types].copy()
+        self.counts[types, types] = 0
+        self.counts[types, self.production_of_type] += consuming
+
+        self.n_consumption = consuming.sum()
+
+    def compute_consumption(self):
+
+        return self.n_consumption / self.n_agent
+
+
+def main():
+
+    parameters = {
+        "t_max": 500,
+        "u": 1,
+        "beta": 0.9,
+        "repartition_of_roles": np.array([10 ** 8, 10 ** 8, 10 ** 8]),
+        "storing_costs": np.array([0.01, 0.04, 0.09]),
+        "agent_model": KwAgent,
+    }
+
+    e = CountsEconomy(**parameters)
+
+    backup = e.run()
+
+    represent_results(backup=backup, parameters=parameters)
+
+
+if __name__ == "__main__":
+
+    main()
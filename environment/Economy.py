@@ -1,14 +1,36 @@
-import itertools as it
 import numpy as np
 from tqdm import tqdm
 
+from backup.checkpoint import get_object_path, import_object, load_checkpoint, save_checkpoint
+from backup.recorder import BackUpRecorder, StreamingBackUpRecorder
+from cmodule.sampler import Sampler
+from environment.StoppingRule import StoppingRule
+from environment.get_exchange_types import get_exchange_index, get_exchange_types
 from environment.get_roles import get_roles
 
 
+def has_batch_api(agent_model):
+
+    # The batch API is not inherited: a model redefining the behavior of its parent
+    # would otherwise silently run with the decision rules of its parent.
+    return "decide_batch" in vars(agent_model)
+
+
 class EconomyWithoutBackUp(object):
 
+    # Methods timed for each phase of a round, and methods of the agent model, when a profiler is given
+    profiled_phases = {
+        "round": ["time_step"],
+        "pairing": ["pair_agents"],
+        "decisions": ["seek_agreements"],
+        "exchange": ["proceed_to_exchanges"],
+        "consumption": ["consume"]
+    }
+    profiled_agent_methods = ["are_you_satisfied", "consume", "learn", "decide_batch", "consume_batch", "learn_batch"]
+
     def __init__(self, repartition_of_roles, t_max, agent_model, storing_costs,
-                 u=None, beta=None, agent_parameters=None):
+                 u=None, beta=None, agent_parameters=None, seed=None, stopping_rule=None,
+                 checkpoint_file=None, checkpoint_every=100, profiler=None):
 
         self.t_max = t_max
         self.agent_parameters = agent_parameters
@@ -24,6 +46,44 @@ class EconomyWithoutBackUp(object):
 
         self.agents = None
 
+        # If a stopping rule is given, the run stops as soon as it is stable ('n_rounds' being the rounds used)
+        self.stopping_rule = stopping_rule
+        self.n_rounds = 0
+
+        # If a file is given, the state of the run is saved in it every 'checkpoint_every' rounds
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = checkpoint_every
+
+        # Random numbers come from the global numpy state, unless a seed is given for this economy.
+        # Agents draw their decisions from the same (block-buffered) source.
+        self.rng = np.random.default_rng(seed) if seed is not None else np.random
+        self.sampler = Sampler(generator=self.rng)
+
+        # If the agent model provides a batch API, agents are not objects but rows of arrays
+        # (there is no single model in an economy mixing several of them)
+        self.batch = self.agent_model is not None and has_batch_api(self.agent_model)
+
+        # Production good, consumption good (= type of agent) and good in hand for every agent
+        self.P = None
+        self.C = None
+        self.H = None
+        self.consumption_by_agent = None
+
+        # State of the whole population, as given by the agent model
+        self.population = None
+
+        # Number of agents having this or that in hand according to their type, kept up to date
+        # at each exchange and consumption
+        #  - rows: type of agent
+        # - columns: type of good
+        self.counts = np.zeros((self.n_goods, self.n_goods), dtype=int)
+
+        # If a profiler is given, phases of the rounds and methods of the agents are timed
+        self.profiler = profiler
+
+        if self.profiler is not None:
+            self.profiler.instrument(self, methods=self.profiled_phases, category="phase")
+
     def create_agents(self):
 
         agents = []
@@ -41,37 +101,137 @@ class EconomyWithoutBackUp(object):
                     u=self.u,
                     beta=self.beta,
                     agent_parameters=self.agent_parameters,
-                    idx=agent_idx)
+                    idx=agent_idx,
+                    sampler=self.sampler)
 
                 agents.append(a)
                 agent_idx += 1
 
         return agents
 
+    def create_population(self):
+
+        self.P = np.repeat(self.roles[:, 0], self.repartition_of_roles)
+        self.C = np.repeat(self.roles[:, 1], self.repartition_of_roles)
+        self.H = self.P.copy()
+        self.consumption_by_agent = np.zeros(self.n_agent, dtype=bool)
+
+        # Arrays are shared with the population state, so that the economy can proceed to exchanges
+        # and consumption while the agent model keeps track of its own learning variables.
+        population = self.agent_model.create_population(
+            P=self.P, C=self.C, H=self.H,
+            consumption=self.consumption_by_agent,
+            storing_costs=self.storing_costs,
+            u=self.u,
+            beta=self.beta,
+            agent_parameters=self.agent_parameters,
+            sampler=self.sampler)
+
+        return population
+
     def run(self):
 
-        self.agents = self.create_agents()
+        # A run resumed from a checkpoint goes on from its last round
+        if self.n_rounds == 0:
+            self.populate()
 
-        for t in tqdm(range(self.t_max)):
+        for t in tqdm(range(self.n_rounds, self.t_max)):
             self.time_step()
+            self.n_rounds = t + 1
+
+            converged = self.has_converged()
+
+            if self.checkpoint_file is not None and self.n_rounds % self.checkpoint_every == 0:
+                save_checkpoint(self.checkpoint_file, self.get_state())
+
+            if converged:
+                break
+
+    def has_converged(self):
+
+        if self.stopping_rule is None:
+            return False
+
+        return self.stopping_rule.update(self.get_stability_statistics())
+
+    def get_stability_statistics(self):
+
+        # Proportions of agents having this or that in hand according to their type
+        return (self.counts / self.repartition_of_roles[:, None]).ravel()
+
+    def populate(self):
+
+        if self.batch:
+            self.population = self.create_population()
+
+        else:
+            self.agents = self.create_agents()
+
+            # Goods of agents as objects are mirrored in arrays (updated after the exchanges and the consumption),
+            # so that what concerns all the encounters of a round can be computed at once
+            self.P = np.array([a.P for a in self.agents])
+            self.C = np.array([a.C for a in self.agents])
+            self.H = np.array([a.H for a in self.agents])
+
+        if self.profiler is not None:
+            self.instrument_agents()
+
+        self.count_goods()
+
+    def instrument_agents(self):
+
+        if self.batch:
+            self.agent_model = self.instrument_agent_model(self.agent_model)
+
+        else:
+            for a in self.agents:
+                self.instrument_agent(a)
+
+    def instrument_agent(self, agent):
+
+        methods = dict([("agent.{}".format(name), [name]) for name in self.profiled_agent_methods])
+        self.profiler.instrument(agent, methods=methods, category="agent")
+
+    def instrument_agent_model(self, model):
+
+        # The model is replaced by a subclass of its own, so that other economies are not concerned
+        profiled_model = type(model.__name__, (model, ), {"__module__": model.__module__,
+                                                          "__qualname__": model.__qualname__})
+
+        for name in self.profiled_agent_methods:
+            if hasattr(model, name):
+                setattr(profiled_model, name, staticmethod(
+                    self.profiler.wrap(getattr(model, name), name="agent.{}".format(name), category="agent")))
+
+        return profiled_model
 
     def time_step(self):
 
         # ---------- MANAGE EXCHANGES ----- #
-        # Take a random order among the indexes of the agents.
-        agent_pairs = np.random.choice(self.n_agent, size=(self.n_agent // 2, 2), replace=False)
+        agent_pairs = self.pair_agents()
 
-        for i, j in agent_pairs:
-            self.make_encounter(i, j)
+        # Agents meet only once by round: every encounter can be resolved from the goods in hand at the beginning
+        self.make_encounters(agent_pairs[:, 0], agent_pairs[:, 1])
 
         # Each agent consumes at the end of each round and adapt his behavior (or not).
-        for agent in self.agents:
-            agent.consume()
+        self.consume()
+
+    def pair_agents(self):
+
+        # Take a random order among the indexes of the agents.
+        return self.rng.choice(self.n_agent, size=(self.n_agent // 2, 2), replace=False)
 
-    def make_encounter(self, i, j):
+    def count_goods(self):
 
-        i_agreeing, j_agreeing = self.seek_agreement(i=i, j=j, proportions=None)  # Will not work for KWAgents
-        self.proceed_to_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        # Full count, only needed at the beginning: counts are then updated event by event
+        self.counts[:] = 0
+        np.add.at(self.counts, (self.C, self.H), 1)
+
+    def move_goods(self, agents, new_goods):
+
+        np.add.at(self.counts, (self.C[agents], self.H[agents]), -1)
+        self.H[agents] = new_goods
+        np.add.at(self.counts, (self.C[agents], self.H[agents]), 1)
 
     def seek_agreement(self, i, j, proportions):
 
@@ -102,19 +262,195 @@ class EconomyWithoutBackUp(object):
             self.agents[i].proceed_to_exchange(None)
             self.agents[j].proceed_to_exchange(None)
 
+    # ------------------------ EVERY ENCOUNTER OF THE ROUND AT ONCE ------------------------ #
+
+    def make_encounters(self, i, j):
+
+        i_agreeing, j_agreeing = self.seek_agreements(i=i, j=j, proportions=None)
+        self.proceed_to_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+
+    def seek_agreements(self, i, j, proportions):
+
+        if not self.batch:
+
+            agreements = np.array(
+                [self.seek_agreement(i=a, j=b, proportions=proportions) for a, b in zip(i, j)], dtype=bool).reshape(-1, 2)
+
+            return agreements[:, 0], agreements[:, 1]
+
+        i_agreeing = self.agent_model.decide_batch(
+            self.population, agents=i, partner_goods=self.H[j], partner_types=self.C[j], proportions=proportions)
+        j_agreeing = self.agent_model.decide_batch(
+            self.population, agents=j, partner_goods=self.H[i], partner_types=self.C[i], proportions=proportions)
+
+        return i_agreeing, j_agreeing
+
+    def proceed_to_exchanges(self, i, j, i_agreeing, j_agreeing):
+
+        if not self.batch:
+
+            for a, b, a_agreeing, b_agreeing in zip(i, j, i_agreeing, j_agreeing):
+                self.proceed_to_exchange(i=a, j=b, i_agreeing=a_agreeing, j_agreeing=b_agreeing)
+
+        agreeing = i_agreeing & j_agreeing
+
+        if self.batch:
+            self.agent_model.proceed_to_exchange_batch(
+                self.population, agents=np.concatenate((i, j)), exchanging=np.concatenate((agreeing, agreeing)))
+
+        i, j = i[agreeing], j[agreeing]
+
+        self.move_goods(agents=np.concatenate((i, j)), new_goods=np.concatenate((self.H[j], self.H[i])))
+
+    def consume(self):
+
+        if self.batch:
+
+            # The model tells which agents consume (or get rid of their good)
+            agents, new_goods = self.agent_model.consume_batch(self.population)
+            self.move_goods(agents=agents, new_goods=new_goods)
+
+            # The model adapts the behavior (or not)
+            self.agent_model.learn_batch(self.population)
+
+        else:
+
+            for agent in self.agents:
+                agent.consume()
+
+            # Some agents can get rid of their good without consuming it
+            H = np.fromiter((a.H for a in self.agents), dtype=int, count=self.n_agent)
+            changing = np.flatnonzero(H != self.H)
+            self.move_goods(agents=changing, new_goods=H[changing])
+
+    # ------------------------ CHECKPOINT ------------------------ #
+
+    def get_parameters(self):
+
+        return {
+            "repartition_of_roles": self.repartition_of_roles,
+            "t_max": self.t_max,
+            "agent_model": get_object_path(self.agent_model) if self.agent_model is not None else None,
+            "storing_costs": np.asarray(self.storing_costs),
+            "u": self.u,
+            "beta": self.beta,
+            "agent_parameters": self.agent_parameters,
+            "checkpoint_file": self.checkpoint_file,
+            "checkpoint_every": self.checkpoint_every
+        }
+
+    def get_state(self):
+
+        # Learned state of the agents, random state, round and (for economies with backup) partial backup.
+        # Objects are not pickled: every agent gives its state as numbers and arrays, stacked by variable.
+        state = {
+            "economy_class": get_object_path(type(self)),
+            "parameters": self.get_parameters(),
+            "n_rounds": self.n_rounds,
+            "counts": self.counts,
+            "rng": self.rng.bit_generator.state if self.rng is not np.random else None,
+            "numpy_random": dict(zip(["name", "key", "pos", "has_gauss", "cached_gaussian"], np.random.get_state())),
+            "sampler": self.sampler.get_state(),
+            "stopping_rule": self.stopping_rule.get_state() if self.stopping_rule is not None else None
+        }
+
+        state.update(self.get_state_of_agents())
+
+        return state
+
+    def set_state(self, state):
+
+        self.n_rounds = state["n_rounds"]
+
+        self.set_state_of_agents(state)
+
+        self.counts[:] = state["counts"]
+
+        if state["rng"] is not None:
+            self.rng.bit_generator.state = state["rng"]
+
+        numpy_random = state["numpy_random"]
+        np.random.set_state((numpy_random["name"], numpy_random["key"], numpy_random["pos"],
+                             numpy_random["has_gauss"], numpy_random["cached_gaussian"]))
+
+        self.sampler.set_state(state["sampler"])
+
+        if self.stopping_rule is not None:
+            self.stopping_rule.set_state(state["stopping_rule"])
+
+    def get_state_of_agents(self):
+
+        if self.batch:
+            return {"population": self.get_population_state(self.population)}
+
+        return {"agents": self.get_agents_state(self.agents)}
+
+    def set_state_of_agents(self, state):
+
+        if self.batch:
+            self.set_population_state(self.population, state["population"])
+
+        else:
+            self.set_agents_state(self.agents, state["agents"])
+            self.H[:] = [a.H for a in self.agents]
+
+    @staticmethod
+    def get_population_state(population):
+
+        # P, C, H and consumption are included
+        return dict([(k, v) for k, v in population.items() if isinstance(v, np.ndarray)])
+
+    @staticmethod
+    def set_population_state(population, state):
+
+        # Arrays of the population are shared with the economy, so they are filled in place
+        for k, v in state.items():
+            population[k][...] = v
+
+    @staticmethod
+    def get_agents_state(agents):
+
+        states = [a.get_state() for a in agents]
+        return dict([(k, np.array([s[k] for s in states])) for k in states[0].keys()])
+
+    @staticmethod
+    def set_agents_state(agents, state):
+
+        for i, a in enumerate(agents):
+            a.set_state(dict([(k, v[i]) for k, v in state.items()]))
+
+    @staticmethod
+    def import_parameters(parameters):
+
+        # Classes are saved by their path
+        parameters["agent_model"] = import_object(parameters["agent_model"])
+
+        return parameters
+
 
 class Economy(EconomyWithoutBackUp):
     """ Economy class with full backup"""
 
-    def __init__(self, **parameters):
+    profiled_phases = dict(
+        EconomyWithoutBackUp.profiled_phases,
+        backup=["reinitialize_backup_containers", "compute_proportions", "make_stats_about_encounters",
+                "make_a_backup_for_t"])
+
+    def __init__(self, back_up_folder=None, buffer_size=1000, **parameters):
 
         super().__init__(**parameters)
 
+        # If a folder is given, backup is streamed on disk instead of being kept in memory
+        self.back_up_folder = back_up_folder
+        self.buffer_size = buffer_size
+
         # ----- For backup at t ----- #
 
-        self.exchanges = dict()
-        for i in it.combinations(range(self.n_goods), r=2):
-            self.exchanges[i] = 0
+        # Exchanges by type (pair of goods), as the upper triangle of a (n_goods x n_goods) matrix
+        self.exchange_types = get_exchange_types(self.n_goods)
+        self.exchange_index = get_exchange_index(self.n_goods)
+
+        self.exchanges = np.zeros(len(self.exchange_types))
         self.n_exchange = 0
         self.consumption = 0
         self.good_accepted_as_medium = np.zeros(self.n_goods)
@@ -127,13 +463,42 @@ class Economy(EconomyWithoutBackUp):
         self.proportions = np.zeros((self.n_goods, self.n_goods))
 
         # ---- For final backup ----- #
-        self.back_up = {
-            "exchanges": [],
-            "n_exchanges": [],
-            "consumption": [],
-            "good_accepted_as_medium": [],
-            "proportions": []
-        }
+        self.recorder = self.create_recorder()
+
+    def get_parameters(self):
+
+        parameters = super().get_parameters()
+        parameters["back_up_folder"] = self.back_up_folder
+        parameters["buffer_size"] = self.buffer_size
+
+        return parameters
+
+    def get_state(self):
+
+        state = super().get_state()
+        state["recorder"] = self.recorder.get_state()
+
+        return state
+
+    def set_state(self, state):
+
+        super().set_state(state)
+        self.recorder.set_state(state["recorder"])
+
+    def create_recorder(self):
+
+        if self.back_up_folder is not None:
+            return StreamingBackUpRecorder(
+                t_max=self.t_max, n_goods=self.n_goods, folder=self.back_up_folder, buffer_size=self.buffer_size)
+
+        return BackUpRecorder(t_max=self.t_max, n_goods=self.n_goods)
+
+    @property
+    def back_up(self):
+
+        # Same keys as before: 'exchanges' can still be read as a list of dictionaries,
+        # other entries are arrays with one row by round
+        return self.recorder.get_back_up()
 
     def run(self):
 
@@ -154,54 +519,47 @@ class Economy(EconomyWithoutBackUp):
 
         self.make_a_backup_for_t()
 
-    def make_encounter(self, i, j):
+    def make_encounters(self, i, j):
 
         """
          Overrided method allowing for backup
         :return: None
         """
 
-        i_agreeing, j_agreeing = self.seek_agreement(i=i, j=j, proportions=self.proportions)
-        self.make_stats_about_medium_of_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-        self.proceed_to_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-        self.make_stats_about_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        i_agreeing, j_agreeing = self.seek_agreements(i=i, j=j, proportions=self.proportions)
+        self.make_stats_about_encounters(
+            i_H=self.H[i], j_H=self.H[j], i_P=self.P[i], j_P=self.P[j], i_C=self.C[i], j_C=self.C[j],
+            i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        self.proceed_to_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
 
-    def make_stats_about_medium_of_exchange(self, i, j, i_agreeing, j_agreeing):
+    def make_stats_about_encounters(self, i_H, j_H, i_P, j_P, i_C, j_C, i_agreeing, j_agreeing):
 
-        i_H, j_H = self.agents[i].H, self.agents[j].H
-        i_P, j_P = self.agents[i].P, self.agents[j].P
-        i_C, j_C = self.agents[i].C, self.agents[j].C
+        # Statistics about all the encounters of the round at once, H being the goods in hand before exchanging
 
         # Consider particular case of offering third object
-        i_facing_M = j_H != i_C and i_H == i_P
-        j_facing_M = i_H != j_C and j_H == j_P
+        i_facing_M = (j_H != i_C) & (i_H == i_P)
+        j_facing_M = (i_H != j_C) & (j_H == j_P)
 
-        if i_facing_M:
-            self.proposition_of_medium[j_H] += 1  # Consider as key the good that is proposed as a medium of ex
-            if i_agreeing:
-                self.good_accepted_as_medium[j_H] += 1
+        # Consider as key the good that is proposed as a medium of exchange
+        self.proposition_of_medium[:] = \
+            np.bincount(j_H[i_facing_M], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M], minlength=self.n_goods)
+        self.good_accepted_as_medium[:] = \
+            np.bincount(j_H[i_facing_M & i_agreeing], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M & j_agreeing], minlength=self.n_goods)
 
-        if j_facing_M:
-            self.proposition_of_medium[i_H] += 1
-            if j_agreeing:
-                self.good_accepted_as_medium[i_H] += 1
+        exchanging = i_agreeing & j_agreeing & (i_H != j_H)
 
-    def make_stats_about_exchanges(self, i, j, i_agreeing, j_agreeing):
-
-        i_H, j_H = self.agents[i].H, self.agents[j].H
-
-        if i_agreeing and j_agreeing:
+        # Count the exchanges by type (pair of goods)
+        self.exchanges[:] = np.bincount(
+            self.exchange_index[i_H[exchanging], j_H[exchanging]], minlength=len(self.exchange_types))
 
-            exchange_type = tuple(sorted([i_H, j_H]))
-            if i_H != j_H:
-                self.exchanges[exchange_type] += 1
-                self.n_exchange += 1
+        self.n_exchange = int(exchanging.sum())
 
     def reinitialize_backup_containers(self):
 
         # Containers for future backup
-        for k in self.exchanges.keys():
-            self.exchanges[k] = 0
+        self.exchanges[:] = 0
         self.n_exchange = 0
         self.consumption = 0
         self.good_accepted_as_medium[:] = 0
@@ -215,45 +573,82 @@ class Economy(EconomyWithoutBackUp):
         #  - rows: type of agent
         # - columns: type of good
 
-        for i in self.agents:
-            self.proportions[i.C, i.H] += 1  # Type of agent is his consumption good
+        # Counts are kept up to date by the economy, only normalization is needed
+        self.proportions[:] = self.counts / self.repartition_of_roles[:, None]
 
-        for i in range(self.n_goods):
-            self.proportions[i] = self.proportions[i] / self.repartition_of_roles[i]
+    def get_stability_statistics(self):
+
+        return np.concatenate((self.good_accepted_as_medium, self.proportions.ravel()))
 
     def make_a_backup_for_t(self):
 
         # Keep a trace from utilities
-        self.consumption = sum([a.consumption for a in self.agents]) / self.n_agent
+        self.consumption = self.compute_consumption()
 
         # ----- FOR FUTURE BACKUP ----- #
 
-        for key in self.exchanges.keys():
-            # Avoid division by zero
-            if self.n_exchange > 0:
-                self.exchanges[key] /= self.n_exchange
-            else:
-                self.exchanges[key] = 0
-
-        for i in range(self.n_goods):
-            # Avoid division by zero
-            if self.proposition_of_medium[i] > 0:
-                self.good_accepted_as_medium[i] = self.good_accepted_as_medium[i] / self.proposition_of_medium[i]
+        # Avoid division by zero
+        if self.n_exchange > 0:
+            self.exchanges /= self.n_exchange
 
-            else:
-                self.good_accepted_as_medium[i] = 0
+        # (a good can only be accepted as a medium if it has been proposed)
+        np.divide(self.good_accepted_as_medium, self.proposition_of_medium,
+                  out=self.good_accepted_as_medium, where=self.proposition_of_medium > 0)
 
         assert 0 <= self.good_accepted_as_medium.all() <= 1
 
         # For back up
-        self.back_up["exchanges"].append(self.exchanges.copy())
-        self.back_up["consumption"].append(self.consumption)
-        self.back_up["n_exchanges"].append(self.n_exchange)
-        self.back_up["good_accepted_as_medium"].append(self.good_accepted_as_medium.copy())
-        self.back_up["proportions"].append(self.proportions.copy())
+        self.recorder.record(
+            exchanges=self.exchanges,
+            n_exchanges=self.n_exchange,
+            consumption=self.consumption,
+            good_accepted_as_medium=self.good_accepted_as_medium,
+            proportions=self.proportions
+        )
+
+    def compute_consumption(self):
+
+        if self.batch:
+            return self.consumption_by_agent.sum() / self.n_agent
+
+        return sum([a.consumption for a in self.agents]) / self.n_agent
 
 
 def launch(**kwargs):
     
     e = Economy(**kwargs)
     return e.run()
+
+
+def load_economy(checkpoint_file):
+
+    """
+     Economy in the state saved in a checkpoint, ready to go on with 'run'
+    :param checkpoint_file: file written by an economy having a 'checkpoint_file'
+    :return: economy
+    """
+
+    state = load_checkpoint(checkpoint_file)
+
+    economy_class = import_object(state["economy_class"])
+    parameters = economy_class.import_parameters(state["parameters"])
+
+    # Random state is restored afterwards, but a seeded economy needs a generator of its own
+    parameters["seed"] = 0 if state["rng"] is not None else None
+
+    if state["stopping_rule"] is not None:
+        parameters["stopping_rule"] = StoppingRule(
+            window=state["stopping_rule"]["window"], tolerance=state["stopping_rule"]["tolerance"],
+            min_rounds=state["stopping_rule"]["min_rounds"])
+
+    e = economy_class(**parameters)
+    e.populate()
+    e.set_state(state)
+
+    return e
+
+
+def resume(checkpoint_file):
+
+    e = load_economy(checkpoint_file)
+    return e.run()
@@ -0,0 +1,139 @@
+from multiprocessing import Pool, cpu_count
+from statistics import NormalDist
+
+import numpy as np
+
+from agent.KwAgent import KwAgent
+from backup.recorder import BackUpRecorder, SharedMemoryRecorder
+from environment.Economy import Economy
+from environment.get_exchange_types import get_exchange_types
+from graph.graph import represent_results
+
+'''
+Ensemble of replicates of the same economy, differing only by their seed.
+Replicates are run in a pool of processes, each of them recording its statistics directly
+ in blocks of shared memory, and results are summarized round by round (mean and confidence band).
+'''
+
+
+def run_replicate(args):
+
+    economy_class, parameters, seed, replicate, block_names = args
+
+    economy = economy_class(seed=seed, **parameters)
+
+    # Statistics are written in the row of this replicate instead of being sent back
+    economy.recorder = SharedMemoryRecorder(
+        t_max=economy.t_max, n_goods=economy.n_goods, block_names=block_names, replicate=replicate)
+
+    economy.run()
+
+    t = economy.recorder.t
+    economy.recorder.close()
+
+    return t
+
+
+class Ensemble(object):
+
+    """ Replicates of an economy (one seed each), run in parallel and summarized round by round"""
+
+    def __init__(self, n_replicates=10, seed=None, n_processes=None, confidence=0.95,
+                 economy_class=Economy, **parameters):
+
+        self.n_replicates = n_replicates
+        self.n_processes = n_processes if n_processes is not None else min(cpu_count(), n_replicates)
+        self.confidence = confidence
+        self.economy_class = economy_class
+        self.parameters = parameters
+
+        self.t_max = parameters["t_max"]
+        self.n_goods = len(parameters["storing_costs"])
+
+        # Independent streams of random numbers for the replicates, all derived from 'seed'
+        self.seeds = np.random.SeedSequence(seed).spawn(n_replicates)
+
+        # Statistics of every replicate (replicates x rounds x ...)
+        self.replicates = None
+
+    def run(self):
+
+        blocks = SharedMemoryRecorder.create_blocks(
+            t_max=self.t_max, n_goods=self.n_goods, n_replicates=self.n_replicates)
+
+        try:
+            block_names = dict([(key, block.name) for key, block in blocks.items()])
+
+            tasks = [(self.economy_class, self.parameters, self.seeds[r], r, block_names)
+                     for r in range(self.n_replicates)]
+
+            with Pool(processes=self.n_processes) as pool:
+                n_rounds = pool.map(run_replicate, tasks)
+
+            replicates = SharedMemoryRecorder.get_replicates(
+                blocks=blocks, t_max=self.t_max, n_goods=self.n_goods, n_replicates=self.n_replicates)
+
+            # Only rounds recorded by every replicate are kept
+            t = min(n_rounds)
+            self.replicates = dict([(key, value[:, :t].copy()) for key, value in replicates.items()])
+            del replicates
+
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+        return self.summarize()
+
+    def summarize(self):
+
+        # Normal approximation for the confidence interval of the mean over replicates
+        z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+
+        columns = {"mean": dict(), "lower": dict(), "upper": dict()}
+
+        for key, value in self.replicates.items():
+
+            mean = value.mean(axis=0)
+            half_width = z * value.std(axis=0, ddof=1) / np.sqrt(self.n_replicates) if self.n_replicates > 1 else 0
+
+            columns["mean"][key] = mean
+            columns["lower"][key] = mean - half_width
+            columns["upper"][key] = mean + half_width
+
+        # Same format as the backup of a single run, so that it can be represented in the same way
+        exchange_types = get_exchange_types(self.n_goods)
+
+        return dict([(name, BackUpRecorder.format_back_up(columns=columns[name], exchange_types=exchange_types))
+                     for name in columns.keys()])
+
+
+def launch_ensemble(**kwargs):
+
+    e = Ensemble(**kwargs)
+    return e.run()
+
+
+def main():
+
+    parameters = {
+        "t_max": 500,
+        "u": 1,
+        "beta": 0.9,
+        "repartition_of_roles": np.array([500, 500, 500]),
+        "storing_costs": np.array([0.01, 0.04, 0.09]),
+        "agent_model": KwAgent,
+    }
+
+    summary = launch_ensemble(n_replicates=20, seed=0, **parameters)
+
+    for name in ["mean", "lower", "upper"]:
+        print("Good accepted as medium over the last 100 rounds ({}): {}".format(
+            name, np.mean(summary[name]["good_accepted_as_medium"][-100:], axis=0)))
+
+    represent_results(backup=summary["mean"], parameters=parameters)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,277 @@
+import numpy as np
+
+from agent.ForwardRL import ForwardRLAgent
+from agent.KwAgent import KwAgent
+from backup.checkpoint import get_object_path, import_object
+from environment.Economy import Economy, has_batch_api
+from graph.graph import represent_results
+
+'''
+Economy in which sub-populations of agents follow different models (e.g. fitted 'ForwardRLAgent's among 'KwAgent's).
+Agents of a sub-population are contiguous rows of the arrays of the economy: a model providing the batch API
+ works on views of these arrays and decides (and learns) for its whole sub-population at once,
+ other models fall back on agents as objects for their sub-population only.
+'''
+
+
+class HeterogeneousEconomy(Economy):
+
+    """ Economy class with full backup, each sub-population of agents having its own model"""
+
+    def __init__(self, sub_populations, **parameters):
+
+        # Each sub-population is given by its 'agent_model', its 'repartition_of_roles'
+        # and (if needed by the model) its 'agent_parameters'.
+        # For a model by type, give a sub-population by type (e.g. 'repartition_of_roles' [n, 0, 0] for type 0).
+        self.sub_populations = sub_populations
+
+        super().__init__(
+            repartition_of_roles=np.sum([s["repartition_of_roles"] for s in sub_populations], axis=0),
+            agent_model=None,
+            **parameters)
+
+        # For each sub-population: its model, the range of its agents and its population (or its agents)
+        self.groups = None
+
+    def populate(self):
+
+        self.P = np.concatenate([np.repeat(self.roles[:, 0], s["repartition_of_roles"]) for s in self.sub_populations])
+        self.C = np.concatenate([np.repeat(self.roles[:, 1], s["repartition_of_roles"]) for s in self.sub_populations])
+        self.H = self.P.copy()
+        self.consumption_by_agent = np.zeros(self.n_agent, dtype=bool)
+
+        self.groups = []
+
+        start = 0
+
+        for s in self.sub_populations:
+
+            stop = start + sum(s["repartition_of_roles"])
+            self.groups.append(self.create_group(
+                agent_model=s["agent_model"], agent_parameters=s.get("agent_parameters"), start=start, stop=stop))
+            start = stop
+
+        if self.profiler is not None:
+            self.instrument_agents()
+
+        self.count_goods()
+
+    def create_group(self, agent_model, agent_parameters, start, stop):
+
+        group = {
+            "agent_model": agent_model,
+            "start": start,
+            "stop": stop,
+            "batch": has_batch_api(agent_model),
+            "population": None,
+            "agents": None
+        }
+
+        if group["batch"]:
+
+            # Slices are views: the model and the economy share the same state
+            group["population"] = agent_model.create_population(
+                P=self.P[start:stop], C=self.C[start:stop], H=self.H[start:stop],
+                consumption=self.consumption_by_agent[start:stop],
+                storing_costs=self.storing_costs,
+                u=self.u,
+                beta=self.beta,
+                agent_parameters=agent_parameters,
+                sampler=self.sampler)
+
+        else:
+            group["agents"] = [
+                agent_model(
+                    prod=int(self.P[idx]), cons=int(self.C[idx]),
+                    storing_costs=self.storing_costs,
+                    u=self.u,
+                    beta=self.beta,
+                    agent_parameters=agent_parameters,
+                    idx=idx,
+                    sampler=self.sampler)
+                for idx in range(start, stop)]
+
+        return group
+
+    def instrument_agents(self):
+
+        for group in self.groups:
+
+            if group["batch"]:
+                group["agent_model"] = self.instrument_agent_model(group["agent_model"])
+
+            else:
+                for a in group["agents"]:
+                    self.instrument_agent(a)
+
+    @staticmethod
+    def select_group(group, agents, partners):
+
+        # Encounters in which the agent belongs to the group
+        in_group = (agents >= group["start"]) & (agents < group["stop"])
+        return in_group, agents[in_group], partners[in_group]
+
+    def seek_agreements(self, i, j, proportions):
+
+        i_agreeing = np.zeros(len(i), dtype=bool)
+        j_agreeing = np.zeros(len(j), dtype=bool)
+
+        for agents, partners, agreeing in [(i, j, i_agreeing), (j, i, j_agreeing)]:
+
+            for group in self.groups:
+
+                in_group, a, b = self.select_group(group, agents=agents, partners=partners)
+
+                if group["batch"]:
+                    agreeing[in_group] = group["agent_model"].decide_batch(
+                        group["population"], agents=a - group["start"], partner_goods=self.H[b],
+                        partner_types=self.C[b], proportions=proportions)
+
+                else:
+                    agreeing[in_group] = [
+                        group["agents"][k - group["start"]].are_you_satisfied(
+                            partner_good=self.H[l], partner_type=self.C[l], proportions=proportions)
+                        for k, l in zip(a, b)]
+
+        return i_agreeing, j_agreeing
+
+    def proceed_to_exchanges(self, i, j, i_agreeing, j_agreeing):
+
+        agreeing = i_agreeing & j_agreeing
+
+        # Agents as objects keep their good in hand by themselves
+        for agents, partners in [(i, j), (j, i)]:
+
+            for group in self.groups:
+
+                in_group, a, b = self.select_group(group, agents=agents, partners=partners)
+
+                if group["batch"]:
+                    group["agent_model"].proceed_to_exchange_batch(
+                        group["population"], agents=a - group["start"], exchanging=agreeing[in_group])
+
+                else:
+                    for k, l, exchanging in zip(a, b, agreeing[in_group]):
+                        group["agents"][k - group["start"]].proceed_to_exchange(self.H[l] if exchanging else None)
+
+        i, j = i[agreeing], j[agreeing]
+
+        self.move_goods(agents=np.concatenate((i, j)), new_goods=np.concatenate((self.H[j], self.H[i])))
+
+    def consume(self):
+
+        for group in self.groups:
+
+            start, stop = group["start"], group["stop"]
+
+            if group["batch"]:
+
+                # The model tells which agents consume (or get rid of their good)
+                agents, new_goods = group["agent_model"].consume_batch(group["population"])
+                self.move_goods(agents=start + agents, new_goods=new_goods)
+
+                # The model adapts the behavior (or not)
+                group["agent_model"].learn_batch(group["population"])
+
+            else:
+
+                for agent in group["agents"]:
+                    agent.consume()
+
+                self.consumption_by_agent[start:stop] = [a.consumption for a in group["agents"]]
+
+                # Some agents can get rid of their good without consuming it
+                H = np.fromiter((a.H for a in group["agents"]), dtype=int, count=stop - start)
+                changing = np.flatnonzero(H != self.H[start:stop])
+                self.move_goods(agents=start + changing, new_goods=H[changing])
+
+    def compute_consumption(self):
+
+        return self.consumption_by_agent.sum() / self.n_agent
+
+    # ------------------------ CHECKPOINT ------------------------ #
+
+    def get_parameters(self):
+
+        parameters = super().get_parameters()
+
+        # Sub-populations instead of a single model (keys are their indexes, arrays can not be saved in lists)
+        for key in ["repartition_of_roles", "agent_model", "agent_parameters"]:
+            del parameters[key]
+
+        parameters["sub_populations"] = dict([
+            (str(k), {
+                "agent_model": get_object_path(s["agent_model"]),
+                "repartition_of_roles": np.asarray(s["repartition_of_roles"]),
+                "agent_parameters": s.get("agent_parameters")
+            }) for k, s in enumerate(self.sub_populations)])
+
+        return parameters
+
+    @staticmethod
+    def import_parameters(parameters):
+
+        sub_populations = parameters["sub_populations"]
+        parameters["sub_populations"] = [
+            dict(sub_populations[str(k)], agent_model=import_object(sub_populations[str(k)]["agent_model"]))
+            for k in range(len(sub_populations))]
+
+        return parameters
+
+    def get_state_of_agents(self):
+
+        # Population (or states of the agents as objects) of each sub-population
+        return {"groups": dict([
+            (str(k), {"population": self.get_population_state(group["population"])} if group["batch"]
+             else {"agents": self.get_agents_state(group["agents"])})
+            for k, group in enumerate(self.groups)])}
+
+    def set_state_of_agents(self, state):
+
+        for k, group in enumerate(self.groups):
+
+            group_state = state["groups"][str(k)]
+
+            if group["batch"]:
+                self.set_population_state(group["population"], group_state["population"])
+
+            else:
+                self.set_agents_state(group["agents"], group_state["agents"])
+                self.H[group["start"]:group["stop"]] = [a.H for a in group["agents"]]
+
+
+def main():
+
+    parameters = {
+        "t_max": 500,
+        "u": 1,
+        "beta": 0.9,
+        "storing_costs": np.array([0.1, 0.24, 0.32]),
+        "sub_populations": [
+            {
+                "agent_model": KwAgent,
+                "repartition_of_roles": np.array([250, 250, 250])
+            },
+            {
+                "agent_model": ForwardRLAgent,
+                "agent_parameters": {"alpha": 0.2, "temp": 0.01, "gamma": 0.2, "q_values": np.ones((12, 2))},
+                "repartition_of_roles": np.array([250, 250, 250])
+            }
+        ]
+    }
+
+    e = HeterogeneousEconomy(**parameters)
+
+    backup = e.run()
+
+    parameters["repartition_of_roles"] = e.repartition_of_roles
+    parameters["agent_parameters"] = [s.get("agent_parameters") for s in parameters["sub_populations"]]
+    parameters["agent_model"] = type("", (object, ), {
+        "name": " + ".join([s["agent_model"].name for s in parameters["sub_populations"]])})()
+
+    represent_results(backup=backup, parameters=parameters)
+
+
+if __name__ == "__main__":
+
+    main()
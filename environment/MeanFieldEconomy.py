@@ -0,0 +1,200 @@
+import numpy as np
+
+from agent.KwAgent import KwAgent
+from environment.CountsEconomy import is_memoryless
+from environment.Economy import Economy
+from environment.compute_equilibrium import compute_equilibrium
+from graph.graph import represent_results
+
+'''
+Deterministic (mean-field) version of the economy: instead of drawing encounters, the expected proportions
+ of agents having this or that good in hand are integrated over time, in the limit of an infinite population.
+Agents of a same (type, good in hand) category are represented by a single agent, so only memoryless models
+ ('StupidAgent', 'KwAgent') are accepted: for models that learn (e.g. 'DuffyAgent'), the values of the agents
+ of a same type spread out, and a representative agent does not behave like the population.
+'''
+
+
+class MeanFieldEconomy(Economy):
+
+    """ Economy class with full backup, evolving the expected proportions instead of agents"""
+
+    def __init__(self, **parameters):
+
+        super().__init__(**parameters)
+
+        assert is_memoryless(self.agent_model), \
+            "Mean field economy can not handle '{}' agents.".format(self.agent_model.name)
+
+        # Categories of agents: category k is made of agents of type k // n_goods
+        # having the good k % n_goods in hand
+        self.n_categories = self.n_goods ** 2
+        self.type_of_category = np.repeat(np.arange(self.n_goods), self.n_goods)
+        self.good_of_category = np.tile(np.arange(self.n_goods), self.n_goods)
+
+        # Type of agent is his consumption good
+        self.production_of_type = np.zeros(self.n_goods, dtype=int)
+        self.production_of_type[self.roles[:, 1]] = self.roles[:, 0]
+
+        self.share_of_type = self.repartition_of_roles / self.n_agent
+
+        # Representative agent of each category
+        self.representatives = None
+
+        # Expected proportions of agents having this or that in hand according to their type
+        #  - rows: type of agent
+        # - columns: type of good
+        self.distribution = np.zeros((self.n_goods, self.n_goods))
+
+        self.expected_consumption = 0
+
+    def create_population(self):
+
+        self.distribution[:] = 0
+        self.distribution[self.roles[:, 1], self.roles[:, 0]] = 1
+
+        P = self.production_of_type[self.type_of_category]
+
+        return self.agent_model.create_population(
+            P=P, C=self.type_of_category.copy(), H=self.good_of_category.copy(),
+            consumption=np.zeros(self.n_categories, dtype=bool),
+            storing_costs=self.storing_costs,
+            u=self.u,
+            beta=self.beta,
+            agent_parameters=self.agent_parameters,
+            sampler=self.sampler)
+
+    def run(self):
+
+        self.representatives = self.create_population()
+
+        for t in range(self.t_max):
+            self.time_step()
+            self.n_rounds = t + 1
+
+            if self.has_converged():
+                break
+
+        return self.back_up
+
+    def time_step(self):
+
+        """
+         Overrided method: expected flows between categories instead of encounters
+        :return: None
+        """
+
+        self.reinitialize_backup_containers()
+        self.compute_proportions()
+
+        # Probability for an agent to meet a partner of each category
+        partners = (self.share_of_type[:, None] * self.distribution).ravel()
+
+        # p_accept[a, b]: probability for an agent of category a to accept the good of an agent of category b
+        a, b = np.divmod(np.arange(self.n_categories ** 2), self.n_categories)
+        p_accept = self.agent_model.acceptance_probability_batch(
+            self.representatives, agents=a,
+            partner_goods=self.good_of_category[b], partner_types=self.type_of_category[b],
+            proportions=self.proportions).reshape(self.n_categories, self.n_categories)
+
+        p_exchange = p_accept * p_accept.T
+
+        self.make_stats_about_flows(partners=partners, p_accept=p_accept, p_exchange=p_exchange)
+
+        self.proceed_to_exchanges(partners=partners, p_exchange=p_exchange)
+
+        # Each agent consumes at the end of each round.
+        self.consume()
+
+        self.make_a_backup_for_t()
+
+    def make_stats_about_flows(self, partners, p_accept, p_exchange):
+
+        # Probability for an encounter to be between an agent of category a and an agent of category b
+        encounters = partners[:, None] * partners[None, :]
+
+        a_type = self.type_of_category[:, None]
+        a_H, b_H = np.broadcast_arrays(self.good_of_category[:, None], self.good_of_category[None, :])
+        a_P = self.production_of_type[a_type]
+
+        # Consider particular case of offering third object (each agent of the pair is 'a' in turn)
+        a_facing_M = (b_H != a_type) & (a_H == a_P)
+
+        # Consider as key the good that is proposed as a medium of exchange
+        self.proposition_of_medium[:] = \
+            np.bincount(b_H[a_facing_M], weights=encounters[a_facing_M], minlength=self.n_goods)
+        self.good_accepted_as_medium[:] = \
+            np.bincount(b_H[a_facing_M], weights=(encounters * p_accept)[a_facing_M], minlength=self.n_goods)
+
+        # Expected number of exchanges for the number of pairs of the economy
+        exchanging = a_H != b_H
+        expected_exchanges = (self.n_agent // 2) * encounters * p_exchange
+        self.exchanges[:] = np.bincount(
+            self.exchange_index[a_H[exchanging], b_H[exchanging]], weights=expected_exchanges[exchanging],
+            minlength=len(self.exchange_types))
+
+        self.n_exchange = self.exchanges.sum()
+
+    def proceed_to_exchanges(self, partners, p_exchange):
+
+        shares = self.distribution.ravel()
+
+        # Agents of category a leave with the good of category b
+        leaving = shares[:, None] * partners[None, :] * p_exchange
+
+        a, b = np.divmod(np.arange(self.n_categories ** 2), self.n_categories)
+        arriving = self.type_of_category[a] * self.n_goods + self.good_of_category[b]
+
+        new_shares = shares - leaving.sum(axis=1) + \
+            np.bincount(arriving, weights=leaving.ravel(), minlength=self.n_categories)
+
+        self.distribution[:] = new_shares.reshape(self.n_goods, self.n_goods)
+
+    def consume(self):
+
+        types = np.arange(self.n_goods)
+
+        # Agents having their consumption good in hand consume it and produce a new unit of their production good
+        consuming = self.distribution[types, types].copy()
+        self.distribution[types, types] = 0
+        self.distribution[types, self.production_of_type] += consuming
+
+        self.expected_consumption = (self.share_of_type * consuming).sum()
+
+    def compute_proportions(self):
+
+        self.proportions[:] = self.distribution
+
+    def compute_consumption(self):
+
+        return self.expected_consumption
+
+
+def main():
+
+    storing_costs = np.array([0.01, 0.04, 0.09])
+    u = 1
+    beta = 0.9
+
+    parameters = {
+        "t_max": 500,
+        "u": u,
+        "beta": beta,
+        "repartition_of_roles": np.array([500, 500, 500]),
+        "storing_costs": storing_costs,
+        "agent_model": KwAgent,
+    }
+
+    expected_equilibrium = compute_equilibrium(storing_costs=storing_costs, beta=beta, u=u)
+    print("Expected equilibrium is: {}".format(expected_equilibrium))
+
+    e = MeanFieldEconomy(**parameters)
+
+    backup = e.run()
+
+    represent_results(backup=backup, parameters=parameters)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,290 @@
+import itertools as it
+import numpy as np
+from tqdm import tqdm
+
+from agent.KwAgent import KwAgent
+from backup.recorder import BackUpRecorder
+from cmodule.sampler import Sampler
+from environment.Economy import has_batch_api
+from environment.get_exchange_types import get_exchange_index, get_exchange_types
+from environment.get_roles import get_roles
+from graph.graph import represent_results
+
+'''
+Several independent economies (same roles, each one with its own storing costs and seed) run in lockstep:
+ agents of every economy are rows of (n_economies, n_agent) arrays, and each step of a round
+ (decisions, exchanges, consumption, learning, statistics) is a single vectorized call for all the economies.
+Only models providing the batch API are accepted.
+'''
+
+
+class EconomiesSampler(object):
+
+    """
+    Source of random numbers for a population gathering several economies (agents ordered by economy):
+    each economy draws its share from its own sampler, so that it evolves as if it was run alone.
+    """
+
+    def __init__(self, samplers):
+
+        self.samplers = samplers
+
+    def random(self, n):
+
+        # Draws are asked for as many agents of every economy, ordered by economy
+        # (as the encounters of a round, or the whole population)
+        assert n % len(self.samplers) == 0, \
+            "{} draws can not be shared between {} economies.".format(n, len(self.samplers))
+
+        return np.concatenate([sampler.random(n // len(self.samplers)) for sampler in self.samplers])
+
+
+class MultiEconomy(object):
+
+    """ Economies stepped in lockstep, with full backup for each of them"""
+
+    def __init__(self, repartition_of_roles, t_max, agent_model, storing_costs,
+                 u=None, beta=None, agent_parameters=None, seeds=None, seed=None):
+
+        self.t_max = t_max
+        self.agent_parameters = agent_parameters
+        self.u = u
+        self.beta = beta
+        self.agent_model = agent_model
+
+        assert has_batch_api(self.agent_model), \
+            "Multi-economy can not handle '{}' agents.".format(self.agent_model.name)
+
+        # One row of storing costs by economy
+        self.storing_costs = np.atleast_2d(np.asarray(storing_costs, dtype=float))
+        self.n_economies, self.n_goods = self.storing_costs.shape
+
+        self.roles = get_roles(self.n_goods)
+        self.repartition_of_roles = np.asarray(repartition_of_roles)
+        self.n_agent = sum(self.repartition_of_roles)
+
+        # Seeds by economy, derived from 'seed' if not given
+        if seeds is None:
+            seeds = np.random.SeedSequence(seed).spawn(self.n_economies)
+
+        assert len(seeds) == self.n_economies, "One seed is needed by economy."
+
+        self.samplers = [Sampler(generator=np.random.default_rng(s)) for s in seeds]
+
+        # Production good, consumption good (= type of agent) and good in hand for every agent of every economy
+        self.P = np.zeros((self.n_economies, self.n_agent), dtype=int)
+        self.C = np.zeros((self.n_economies, self.n_agent), dtype=int)
+        self.H = np.zeros((self.n_economies, self.n_agent), dtype=int)
+        self.consumption_by_agent = np.zeros((self.n_economies, self.n_agent), dtype=bool)
+
+        # Index of the first agent of every economy in the flattened arrays
+        self.offsets = np.arange(self.n_economies) * self.n_agent
+        self.economy_of_agent = np.repeat(np.arange(self.n_economies), self.n_agent)
+
+        # State of the whole population (every economy), as given by the agent model
+        self.population = None
+
+        # Proportions of agents having this or that in hand according to their type, for every economy
+        self.proportions = np.zeros((self.n_economies, self.n_goods, self.n_goods))
+
+        self.exchange_types = get_exchange_types(self.n_goods)
+        self.exchange_index = get_exchange_index(self.n_goods)
+
+        # ----- For backup at t (one row by economy) ----- #
+        self.exchanges = np.zeros((self.n_economies, len(self.exchange_types)))
+        self.n_exchange = np.zeros(self.n_economies)
+        self.good_accepted_as_medium = np.zeros((self.n_economies, self.n_goods))
+
+        # ---- For final backup (economies x rounds x ...) ----- #
+        shapes = BackUpRecorder.get_shapes(self.n_goods)
+        self.columns = dict([(key, np.zeros((self.n_economies, self.t_max) + shapes[key]))
+                             for key in BackUpRecorder.keys])
+
+        # Number of rounds recorded so far
+        self.t = 0
+
+    def create_population(self):
+
+        self.P[:] = np.repeat(self.roles[:, 0], self.repartition_of_roles)
+        self.C[:] = np.repeat(self.roles[:, 1], self.repartition_of_roles)
+        self.H[:] = self.P
+
+        # Flattened arrays are views: the model and the economies share the same state
+        return self.agent_model.create_population(
+            P=self.P.reshape(-1), C=self.C.reshape(-1), H=self.H.reshape(-1),
+            consumption=self.consumption_by_agent.reshape(-1),
+            storing_costs=self.storing_costs,
+            u=self.u,
+            beta=self.beta,
+            agent_parameters=self.agent_parameters,
+            sampler=EconomiesSampler(self.samplers),
+            economy=self.economy_of_agent)
+
+    @property
+    def back_ups(self):
+
+        return [self.get_back_up(economy) for economy in range(self.n_economies)]
+
+    def get_back_up(self, economy):
+
+        # Same format as the backup of a single economy
+        return BackUpRecorder.format_back_up(
+            columns=dict([(key, value[economy, :self.t]) for key, value in self.columns.items()]),
+            exchange_types=self.exchange_types)
+
+    def run(self):
+
+        self.population = self.create_population()
+
+        for t in tqdm(range(self.t_max)):
+            self.time_step()
+
+        return self.back_ups
+
+    def time_step(self):
+
+        self.compute_proportions()
+
+        # ---------- MANAGE EXCHANGES ----- #
+        # Random pairs for every economy, with the indexes of agents in the flattened arrays
+        agent_pairs = np.stack([
+            sampler.generator.choice(self.n_agent, size=(self.n_agent // 2, 2), replace=False)
+            for sampler in self.samplers]) + self.offsets[:, None, None]
+
+        i, j = agent_pairs[..., 0].ravel(), agent_pairs[..., 1].ravel()
+
+        i_agreeing, j_agreeing = self.seek_agreements(i=i, j=j)
+        self.make_stats_about_encounters(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        self.proceed_to_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+
+        # Each agent consumes at the end of each round and adapt his behavior (or not).
+        self.consume()
+
+        self.make_a_backup_for_t()
+
+    def seek_agreements(self, i, j):
+
+        H, C = self.H.reshape(-1), self.C.reshape(-1)
+
+        i_agreeing = self.agent_model.decide_batch(
+            self.population, agents=i, partner_goods=H[j], partner_types=C[j], proportions=self.proportions)
+        j_agreeing = self.agent_model.decide_batch(
+            self.population, agents=j, partner_goods=H[i], partner_types=C[i], proportions=self.proportions)
+
+        return i_agreeing, j_agreeing
+
+    def proceed_to_exchanges(self, i, j, i_agreeing, j_agreeing):
+
+        H = self.H.reshape(-1)
+
+        agreeing = i_agreeing & j_agreeing
+
+        self.agent_model.proceed_to_exchange_batch(
+            self.population, agents=np.concatenate((i, j)), exchanging=np.concatenate((agreeing, agreeing)))
+
+        i, j = i[agreeing], j[agreeing]
+
+        H[i], H[j] = H[j], H[i]
+
+    def consume(self):
+
+        # The model tells which agents consume (or get rid of their good)
+        agents, new_goods = self.agent_model.consume_batch(self.population)
+        self.H.reshape(-1)[agents] = new_goods
+
+        # The model adapts the behavior (or not)
+        self.agent_model.learn_batch(self.population)
+
+    def compute_proportions(self):
+
+        # Number of agents of every economy having this or that in hand according to their type
+        categories = (self.economy_of_agent * self.n_goods + self.C.reshape(-1)) * self.n_goods + self.H.reshape(-1)
+        counts = np.bincount(categories, minlength=self.n_economies * self.n_goods ** 2)
+
+        self.proportions[:] = \
+            counts.reshape(self.n_economies, self.n_goods, self.n_goods) / self.repartition_of_roles[None, :, None]
+
+    def count_by_economy(self, economies, goods, n_values):
+
+        # Counts of 'goods' (integers in [0, n_values)) for every economy
+        return np.bincount(
+            economies * n_values + goods, minlength=self.n_economies * n_values).reshape(self.n_economies, n_values)
+
+    def make_stats_about_encounters(self, i, j, i_agreeing, j_agreeing):
+
+        H, P, C = self.H.reshape(-1), self.P.reshape(-1), self.C.reshape(-1)
+        i_H, j_H, i_P, j_P, i_C, j_C = H[i], H[j], P[i], P[j], C[i], C[j]
+
+        economies = self.economy_of_agent[i]
+
+        # Consider particular case of offering third object
+        i_facing_M = (j_H != i_C) & (i_H == i_P)
+        j_facing_M = (i_H != j_C) & (j_H == j_P)
+
+        # Consider as key the good that is proposed as a medium of exchange
+        proposition_of_medium = \
+            self.count_by_economy(economies[i_facing_M], j_H[i_facing_M], self.n_goods) + \
+            self.count_by_economy(economies[j_facing_M], i_H[j_facing_M], self.n_goods)
+
+        i_accepting, j_accepting = i_facing_M & i_agreeing, j_facing_M & j_agreeing
+        good_accepted_as_medium = \
+            self.count_by_economy(economies[i_accepting], j_H[i_accepting], self.n_goods) + \
+            self.count_by_economy(economies[j_accepting], i_H[j_accepting], self.n_goods)
+
+        # Avoid division by zero
+        self.good_accepted_as_medium = np.divide(
+            good_accepted_as_medium, proposition_of_medium,
+            out=np.zeros((self.n_economies, self.n_goods)), where=proposition_of_medium > 0)
+
+        exchanging = i_agreeing & j_agreeing & (i_H != j_H)
+        i_H, j_H = i_H[exchanging], j_H[exchanging]
+
+        # Count the exchanges by type (pair of goods) for every economy
+        counts = self.count_by_economy(
+            economies[exchanging], self.exchange_index[i_H, j_H], len(self.exchange_types))
+
+        self.n_exchange = counts.sum(axis=1)
+
+        self.exchanges = np.divide(
+            counts, self.n_exchange[:, None], out=np.zeros(counts.shape), where=self.n_exchange[:, None] > 0)
+
+    def make_a_backup_for_t(self):
+
+        self.columns["exchanges"][:, self.t] = self.exchanges
+        self.columns["n_exchanges"][:, self.t] = self.n_exchange
+        self.columns["consumption"][:, self.t] = self.consumption_by_agent.mean(axis=1)
+        self.columns["good_accepted_as_medium"][:, self.t] = self.good_accepted_as_medium
+        self.columns["proportions"][:, self.t] = self.proportions
+
+        self.t += 1
+
+
+def main():
+
+    # A grid of storing costs for 'Economy A', all economies advancing together
+    grid = np.array([
+        (c0, c1, c2) for c0, c1, c2 in it.combinations(np.arange(1, 20) / 100, r=3)])
+
+    parameters = {
+        "t_max": 500,
+        "u": 1,
+        "beta": 0.9,
+        "repartition_of_roles": np.array([50, 50, 50]),
+        "storing_costs": grid,
+        "agent_model": KwAgent,
+    }
+
+    e = MultiEconomy(seed=0, **parameters)
+
+    back_ups = e.run()
+
+    for storing_costs, back_up in list(zip(grid, back_ups))[:10]:
+        print("Storing costs: {}, good accepted as medium: {}".format(
+            storing_costs, np.mean(back_up["good_accepted_as_medium"][-100:], axis=0)))
+
+    represent_results(backup=back_ups[0], parameters=dict(parameters, storing_costs=grid[0]))
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,103 @@
+import json
+from collections import defaultdict
+from functools import wraps
+from os import path
+from time import perf_counter_ns
+
+
+class Profiler(object):
+
+    """
+    Wall time and number of calls by phase of a round (pairing, decisions, exchange, consumption, backup)
+    and by method of the agent model.
+    Methods are wrapped on the economy (and on its agents) only when a profiler is given,
+    so that nothing is paid otherwise.
+    """
+
+    def __init__(self, trace=True, trace_agents=False):
+
+        # Nanoseconds and number of calls by name
+        self.total_time = defaultdict(int)
+        self.n_calls = defaultdict(int)
+
+        # Events (name, category, start, duration) for the trace.
+        # Calls of agents' methods are not traced by default (one by agent and by round).
+        self.trace = trace
+        self.trace_agents = trace_agents
+        self.events = []
+
+        self.origin = perf_counter_ns()
+
+    def wrap(self, method, name, category):
+
+        total_time, n_calls, events = self.total_time, self.n_calls, self.events
+        traced = self.trace and (category != "agent" or self.trace_agents)
+
+        @wraps(method)
+        def wrapped(*args, **kwargs):
+
+            start = perf_counter_ns()
+
+            try:
+                return method(*args, **kwargs)
+
+            finally:
+                duration = perf_counter_ns() - start
+                total_time[name] += duration
+                n_calls[name] += 1
+
+                if traced:
+                    events.append((name, category, start, duration))
+
+        return wrapped
+
+    def instrument(self, obj, methods, category):
+
+        """
+         Replace methods of an object (of this object only) by their timed version
+        :param obj: object (economy, agent or agent model)
+        :param methods: dictionary giving the methods to wrap for each name to record
+        :param category: 'phase' or 'agent'
+        :return: None
+        """
+
+        for name, method_names in methods.items():
+            for method_name in method_names:
+                if hasattr(obj, method_name):
+                    setattr(obj, method_name, self.wrap(getattr(obj, method_name), name=name, category=category))
+
+    def get_summary(self):
+
+        # Rows (name, calls, total time in s, mean time by call in µs, share of the time of the rounds),
+        # from the most to the least expensive
+        round_time = self.total_time.get("round", 0)
+
+        summary = []
+
+        for name, total_time in sorted(self.total_time.items(), key=lambda x: x[1], reverse=True):
+            summary.append((
+                name,
+                self.n_calls[name],
+                total_time / 10**9,
+                total_time / self.n_calls[name] / 10**3,
+                total_time / round_time if round_time > 0 else float("nan")))
+
+        return summary
+
+    def print_summary(self):
+
+        print("{:<30} {:>12} {:>12} {:>14} {:>8}".format("name", "calls", "total (s)", "mean (µs)", "share"))
+
+        for name, n_calls, total_time, mean_time, share in self.get_summary():
+            print("{:<30} {:>12} {:>12.3f} {:>14.2f} {:>8.1%}".format(name, n_calls, total_time, mean_time, share))
+
+    def save_trace(self, file_name):
+
+        # Chrome trace format ('chrome://tracing' or Perfetto), times in microseconds
+        trace_events = [
+            {"name": name, "cat": category, "ph": "X", "pid": 0, "tid": 0,
+             "ts": (start - self.origin) / 10**3, "dur": duration / 10**3}
+            for name, category, start, duration in self.events]
+
+        with open(path.expanduser(file_name), "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class StoppingRule(object):
+
+    """
+    Stopping rule for a run: statistics of the last 2 * 'window' rounds are kept,
+    and the run is considered as stable once the mean of every statistic over the last window
+    differs by less than 'tolerance' from its mean over the previous window.
+    """
+
+    def __init__(self, window=100, tolerance=0.02, min_rounds=None):
+
+        self.window = window
+        self.tolerance = tolerance
+
+        # No decision before 'min_rounds' rounds (and in any case before two full windows)
+        self.min_rounds = max(min_rounds if min_rounds is not None else 0, 2 * window)
+
+        # Statistics of the last rounds (circular buffer)
+        self.memory = None
+        self.n_rounds = 0
+
+    def update(self, statistics):
+
+        """
+         Record the statistics of a new round
+        :param statistics: values (1-D array) that have to be stable
+        :return: True if the run can be stopped
+        """
+
+        if self.memory is None:
+            self.memory = np.zeros((2 * self.window, len(statistics)))
+
+        self.memory[self.n_rounds % (2 * self.window)] = statistics
+        self.n_rounds += 1
+
+        if self.n_rounds < self.min_rounds:
+            return False
+
+        # Rounds of the last window, then of the previous one
+        last = (self.n_rounds - 1 - np.arange(self.window)) % (2 * self.window)
+        previous = (last - self.window) % (2 * self.window)
+
+        difference = np.abs(self.memory[last].mean(axis=0) - self.memory[previous].mean(axis=0))
+
+        return bool(np.all(difference < self.tolerance))
+
+    def get_state(self):
+
+        return {"window": self.window, "tolerance": self.tolerance, "min_rounds": self.min_rounds,
+                "memory": self.memory, "n_rounds": self.n_rounds}
+
+    def set_state(self, state):
+
+        self.memory = state["memory"]
+        self.n_rounds = state["n_rounds"]
@@ -0,0 +1,46 @@
+import numpy as np
+
+from agent.KwAgent import KwAgent
+from environment.Economy import Economy
+from graph.graph import represent_results
+
+'''
+Economy in which agents are not objects anymore: every agent is a row in the arrays P, C and H,
+ and all the encounters of a round are resolved at once.
+Contrary to 'Economy' that falls back on agents as objects, it only accepts models providing the batch API
+ ('create_population', 'decide_batch' and 'learn_batch').
+'''
+
+
+class VectorizedEconomy(Economy):
+
+    """ Economy class with full backup, agents being stored as arrays"""
+
+    def __init__(self, **parameters):
+
+        super().__init__(**parameters)
+
+        assert self.batch, "Vectorized economy can not handle '{}' agents.".format(self.agent_model.name)
+
+
+def main():
+
+    parameters = {
+        "t_max": 500,
+        "u": 1,
+        "beta": 0.9,
+        "repartition_of_roles": np.array([50000, 50000, 50000]),
+        "storing_costs": np.array([0.01, 0.04, 0.09]),
+        "agent_model": KwAgent,
+    }
+
+    e = VectorizedEconomy(**parameters)
+
+    backup = e.run()
+
+    represent_results(backup=backup, parameters=parameters)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,19 @@
+import itertools as it
+import numpy as np
+
+
+def get_exchange_types(n_goods):
+
+    # Types of exchange (pairs of goods g1 < g2), in the order of the upper triangle of a (n_goods x n_goods) matrix
+    return list(it.combinations(range(n_goods), r=2))
+
+
+def get_exchange_index(n_goods):
+
+    # Index of the type of exchange for any pair of goods (symmetric, -1 for a pair of identical goods)
+    index = np.full((n_goods, n_goods), -1, dtype=int)
+
+    g1, g2 = np.triu_indices(n_goods, k=1)
+    index[g1, g2] = index[g2, g1] = np.arange(len(g1))
+
+    return index
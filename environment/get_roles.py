@@ -2,9 +2,8 @@ import numpy as np
 
 
 def get_roles(n_goods):
-    roles = np.zeros((n_goods, 2), dtype=int)
 
-    for i in range(n_goods):
-        roles[i] = (i + 1) % n_goods, i
+    # Agent of type i produces good i + 1 and consumes good i
+    types = np.arange(n_goods)
 
-    return roles
\ No newline at end of file
+    return np.stack(((types + 1) % n_goods, types), axis=1)
@@ -2,6 +2,7 @@ import numpy as np
 from hyperopt import fmin, tpe, hp, partial, STATUS_FAIL, STATUS_OK
 
 from environment.Economy import EconomyWithoutBackUp
+from environment.StoppingRule import StoppingRule
 from environment.compute_equilibrium import compute_equilibrium
 from agent.FrequentistAgent import FrequentistAgent
 
@@ -26,11 +27,15 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
                 or compute_equilibrium(self.storing_costs, self.beta, self.u) != "speculative":
             return {'loss': None, 'status': STATUS_FAIL}
 
-        self.agents = self.create_agents()
+        self.populate()
 
         for t in range(self.t_max):
             self.t = t
             self.time_step()
+            self.n_rounds = t + 1
+
+            if self.has_converged():
+                break
 
         return {"loss": self.function_to_minimize(), "status": STATUS_OK}
 
@@ -51,41 +56,41 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
 
         print("{:.2f}, {:.2f}, {:.2f}: {:.2f}".format(
             self.storing_costs[0], self.storing_costs[1], self.storing_costs[2],
-            np.mean(self.good_accepted_as_medium_average[-200:, 2])))
+            np.mean(self.good_accepted_as_medium_average[:self.n_rounds][-200:, 2])))
 
-        return (1 - np.mean(self.good_accepted_as_medium_average[-200:, 2])) / \
+        return (1 - np.mean(self.good_accepted_as_medium_average[:self.n_rounds][-200:, 2])) / \
                (self.storing_costs[2] - self.storing_costs[1])
 
-    def make_encounter(self, i, j):
+    def make_encounters(self, i, j):
 
         """
          Overrided method allowing for backup
         :return: None
         """
 
-        i_agreeing, j_agreeing = self.seek_agreement(i=i, j=j, proportions=None)
-        self.make_stats_about_medium_of_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-        self.proceed_to_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-
-    def make_stats_about_medium_of_exchange(self, i, j, i_agreeing, j_agreeing):
+        i_agreeing, j_agreeing = self.seek_agreements(i=i, j=j, proportions=None)
+        self.make_stats_about_medium_of_exchange(
+            i_H=self.H[i], j_H=self.H[j], i_P=self.P[i], j_P=self.P[j], i_C=self.C[i], j_C=self.C[j],
+            i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        self.proceed_to_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
 
-        i_H, j_H = self.agents[i].H, self.agents[j].H
-        i_P, j_P = self.agents[i].P, self.agents[j].P
-        i_C, j_C = self.agents[i].C, self.agents[j].C
+    def make_stats_about_medium_of_exchange(self, i_H, j_H, i_P, j_P, i_C, j_C, i_agreeing, j_agreeing):
 
         # Consider particular case of offering third object
-        i_facing_M = j_H != i_C and i_H == i_P
-        j_facing_M = i_H != j_C and j_H == j_P
+        i_facing_M = (j_H != i_C) & (i_H == i_P)
+        j_facing_M = (i_H != j_C) & (j_H == j_P)
 
-        if i_facing_M:
-            self.proposition_of_medium_at_t[j_H] += 1  # Consider as key the good that is proposed as a medium of ex
-            if i_agreeing:
-                self.good_accepted_as_medium_at_t[j_H] += 1
+        # Consider as key the good that is proposed as a medium of exchange
+        self.proposition_of_medium_at_t[:] = \
+            np.bincount(j_H[i_facing_M], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M], minlength=self.n_goods)
+        self.good_accepted_as_medium_at_t[:] = \
+            np.bincount(j_H[i_facing_M & i_agreeing], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M & j_agreeing], minlength=self.n_goods)
 
-        if j_facing_M:
-            self.proposition_of_medium_at_t[i_H] += 1
-            if j_agreeing:
-                self.good_accepted_as_medium_at_t[i_H] += 1
+    def get_stability_statistics(self):
+
+        return np.concatenate((self.good_accepted_as_medium_at_t, super().get_stability_statistics()))
 
     def reinitialize_backup_containers(self):
 
@@ -110,7 +115,10 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
         self.good_accepted_as_medium_average[self.t][:] = self.good_accepted_as_medium_at_t
 
 
-def fun_3_goods(args):
+def fun_3_goods(args, stopping_rule_parameters=None):
+
+    # Runs go to 't_max' unless parameters of a stopping rule are given (e.g. {"window": 100, "tolerance": 0.02,
+    # "min_rounds": 300}): the feedback then averages the last rounds before stability
 
     t_max = 500
 
@@ -132,7 +140,9 @@ def fun_3_goods(args):
         "storing_costs": storing_costs,
         "u": u,
         "beta": beta,
-        "agent_model": FrequentistAgent
+        "agent_model": FrequentistAgent,
+        "stopping_rule":
+            StoppingRule(**stopping_rule_parameters) if stopping_rule_parameters is not None else None
     }
 
     e = EconomyForOptimizing(**parameters)
@@ -140,7 +150,7 @@ def fun_3_goods(args):
     return e.run()
 
 
-def optimize_3_goods():
+def optimize_3_goods(stopping_rule_parameters=None):
 
     random_evaluations = 20
     max_eval = 100
@@ -156,7 +166,7 @@ def optimize_3_goods():
         n_startup_jobs=random_evaluations)
 
     best = fmin(
-        fn=fun_3_goods,
+        fn=lambda args: fun_3_goods(args, stopping_rule_parameters=stopping_rule_parameters),
         space=space,
         algo=alg,
         max_evals=max_eval
@@ -6,6 +6,7 @@ from datetime import datetime
 from tqdm import tqdm
 
 from environment.Economy import EconomyWithoutBackUp
+from environment.StoppingRule import StoppingRule
 from environment.compute_equilibrium import compute_equilibrium
 from agent.FrequentistAgent import FrequentistAgent
 
@@ -29,11 +30,15 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
 
     def run(self):
 
-        self.agents = self.create_agents()
+        self.populate()
 
         for t in range(self.t_max):
             self.t = t
             self.time_step()
+            self.n_rounds = t + 1
+
+            if self.has_converged():
+                break
 
         return self.give_feed_back()
 
@@ -53,44 +58,44 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
     def give_feed_back(self):
 
         to_return = np.array([
-            np.mean(self.good_accepted_as_medium_average[-200:, 0]),
-            np.mean(self.good_accepted_as_medium_average[-200:, 1]),
-            np.mean(self.good_accepted_as_medium_average[-200:, 2]),
+            np.mean(self.good_accepted_as_medium_average[:self.n_rounds][-200:, 0]),
+            np.mean(self.good_accepted_as_medium_average[:self.n_rounds][-200:, 1]),
+            np.mean(self.good_accepted_as_medium_average[:self.n_rounds][-200:, 2]),
             int(self.storing_costs[2] * 100) - int(self.storing_costs[1] * 100)
         ])
         #  print("st", self.storing_costs, "ret", to_return)
         return to_return
 
-    def make_encounter(self, i, j):
+    def make_encounters(self, i, j):
 
         """
          Overrided method allowing for backup
         :return: None
         """
 
-        i_agreeing, j_agreeing = self.seek_agreement(i=i, j=j, proportions=None)
-        self.make_stats_about_medium_of_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-        self.proceed_to_exchange(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
-
-    def make_stats_about_medium_of_exchange(self, i, j, i_agreeing, j_agreeing):
+        i_agreeing, j_agreeing = self.seek_agreements(i=i, j=j, proportions=None)
+        self.make_stats_about_medium_of_exchange(
+            i_H=self.H[i], j_H=self.H[j], i_P=self.P[i], j_P=self.P[j], i_C=self.C[i], j_C=self.C[j],
+            i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+        self.proceed_to_exchanges(i=i, j=j, i_agreeing=i_agreeing, j_agreeing=j_agreeing)
 
-        i_H, j_H = self.agents[i].H, self.agents[j].H
-        i_P, j_P = self.agents[i].P, self.agents[j].P
-        i_C, j_C = self.agents[i].C, self.agents[j].C
+    def make_stats_about_medium_of_exchange(self, i_H, j_H, i_P, j_P, i_C, j_C, i_agreeing, j_agreeing):
 
         # Consider particular case of offering third object
-        i_facing_M = j_H not in [i_P, i_C] and i_H == i_P
-        j_facing_M = i_H not in [j_P, j_C] and j_H == j_P
+        i_facing_M = (j_H != i_P) & (j_H != i_C) & (i_H == i_P)
+        j_facing_M = (i_H != j_P) & (i_H != j_C) & (j_H == j_P)
 
-        if i_facing_M:
-            self.proposition_of_medium_at_t[j_H] += 1  # Consider as key the good that is proposed as a medium of ex
-            if i_agreeing:
-                self.good_accepted_as_medium_at_t[j_H] += 1
+        # Consider as key the good that is proposed as a medium of exchange
+        self.proposition_of_medium_at_t[:] = \
+            np.bincount(j_H[i_facing_M], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M], minlength=self.n_goods)
+        self.good_accepted_as_medium_at_t[:] = \
+            np.bincount(j_H[i_facing_M & i_agreeing], minlength=self.n_goods) + \
+            np.bincount(i_H[j_facing_M & j_agreeing], minlength=self.n_goods)
 
-        if j_facing_M:
-            self.proposition_of_medium_at_t[i_H] += 1
-            if j_agreeing:
-                self.good_accepted_as_medium_at_t[i_H] += 1
+    def get_stability_statistics(self):
+
+        return np.concatenate((self.good_accepted_as_medium_at_t, super().get_stability_statistics()))
 
     def reinitialize_backup_containers(self):
 
@@ -117,13 +122,14 @@ class EconomyForOptimizing(EconomyWithoutBackUp):
 
 class Computer(Process):
 
-    def __init__(self, int_name, input_queue, output_queue, shutdown):
+    def __init__(self, int_name, input_queue, output_queue, shutdown, stopping_rule_parameters=None):
 
         super().__init__()
         self.int_name = int_name
         self.input_queue = input_queue
         self.output_queue = output_queue
         self.shutdown = shutdown
+        self.stopping_rule_parameters = stopping_rule_parameters
 
     def run(self):
 
@@ -132,13 +138,16 @@ class Computer(Process):
             raw_storing_costs = self.input_queue.get()
             storing_costs = np.asarray(raw_storing_costs) / 100
             if compute_equilibrium(storing_costs, 0.9, 1) == "speculative":
-                res = self.fun_3_goods(storing_costs)
+                res = self.fun_3_goods(storing_costs, stopping_rule_parameters=self.stopping_rule_parameters)
             else:
                 res = "non-speculative"
             self.output_queue.put((self.int_name, raw_storing_costs, res))
 
     @staticmethod
-    def fun_3_goods(storing_costs):
+    def fun_3_goods(storing_costs, stopping_rule_parameters=None):
+
+        # Runs go to 't_max' unless parameters of a stopping rule are given (e.g. {"window": 100, "tolerance": 0.02,
+        # "min_rounds": 300}): the feedback then averages the last rounds before stability
 
         t_max = 500
         u = 1
@@ -161,7 +170,9 @@ class Computer(Process):
             "storing_costs": storing_costs,
             "u": u,
             "beta": beta,
-            "agent_model": FrequentistAgent
+            "agent_model": FrequentistAgent,
+            "stopping_rule":
+                StoppingRule(**stopping_rule_parameters) if stopping_rule_parameters is not None else None
         }
 
         e = EconomyForOptimizing(**parameters)
@@ -183,7 +194,9 @@ class Optimizer(object):
 
     n_processes = cpu_count() * 4
 
-    def __init__(self):
+    def __init__(self, stopping_rule_parameters=None):
+
+        self.stopping_rule_parameters = stopping_rule_parameters
 
         self.shutdown = Event()
         self.queue = Queue()
@@ -215,7 +228,8 @@ class Optimizer(object):
         for i in range(self.n_processes):
 
             queue = Queue()
-            process = Computer(input_queue=queue, output_queue=self.queue, int_name=i, shutdown=self.shutdown)
+            process = Computer(input_queue=queue, output_queue=self.queue, int_name=i, shutdown=self.shutdown,
+                               stopping_rule_parameters=self.stopping_rule_parameters)
 
             processes.append(process)
             queues.append(queue)
@@ -312,9 +326,9 @@ class Optimizer(object):
         print("Done!")
 
 
-def optimize_3_goods():
+def optimize_3_goods(stopping_rule_parameters=None):
 
-    op = Optimizer()
+    op = Optimizer(stopping_rule_parameters=stopping_rule_parameters)
 
     try:
         op.run()
@@ -49,8 +49,15 @@ class PerformanceComputer(object):
             "Duffy": DuffyAgent, "KW": KwAgent
         }
 
+        # What does not depend on the parameters of the Frequentist model (computed once by subject)
+        self.frequentist_cache = None
+
     def run(self, *args):
 
+        # Trials are not replayed one by one for the Frequentist model
+        if self.model == "Frequentist":
+            return self.compute_frequentist_sum_errors_squares(*args)
+
         model = self.func[self.model](*args)
         squares_sum = self.compute_sum_errors_squares(model)
         return squares_sum
@@ -81,6 +88,115 @@ class PerformanceComputer(object):
         result = sum(squares_list)
         return result
 
+    def get_frequentist_cache(self):
+
+        """
+         Cumulative sums of what a Frequentist agent memorizes along the trials of the subject,
+         so that his probabilities for any memory span are obtained by differences
+        :return: dictionary
+        """
+
+        if self.frequentist_cache is not None:
+            return self.frequentist_cache
+
+        n_goods = len(self.raw_storing_costs)
+        P, C = self.prod, self.cons
+
+        in_hand = np.asarray(self.data["subject_good"])
+        partner_good = np.asarray(self.data["partner_good"])
+        response = np.asarray(self.data["subject_choice"])
+
+        # Probabilities of responding when the partner good is not a medium of exchange
+        p_values = np.zeros((2, self.t_max))
+        p_values[1, partner_good == C] = 1
+        p_values[0, (partner_good != C) & ((partner_good == P) | (partner_good == in_hand))] = 1
+
+        medium = np.flatnonzero((partner_good != C) & (partner_good != P) & (partner_good != in_hand))
+
+        # encounters[t]: number of partners having good C before trial t
+        encounters = np.concatenate(([0], np.cumsum(partner_good == C)))
+
+        # Acceptances are memorized by pair (in hand, partner good) in the order of 'get_acceptance_dic'
+        pairs = list(it.permutations(range(n_goods), r=2))
+        pair_index = np.full((n_goods, n_goods), -1)
+        pair_index[tuple(np.array(pairs).T)] = np.arange(len(pairs))
+
+        learning = (response == 1) & (in_hand != partner_good)
+        pair = pair_index[in_hand, partner_good]
+
+        # 'do_the_encounter' learns before the exchange: the good in hand is then still the departure good
+        successful = np.zeros(self.t_max, dtype=int)
+
+        # Successes summed along the acceptances of each pair, pairs following each other in a flat array
+        successes = []
+        offsets = []
+        for k in range(len(pairs)):
+            offsets.append(sum(len(i) for i in successes))
+            successes.append(np.concatenate(([0], np.cumsum(successful[learning & (pair == k)]))))
+
+        # n_events[t, k]: number of acceptances memorized for pair k before trial t
+        n_events = np.zeros((self.t_max + 1, len(pairs)), dtype=int)
+        n_events[1:] = np.cumsum(learning[:, None] & (pair[:, None] == np.arange(len(pairs))), axis=0)
+
+        # Pairs giving the probabilities of a direct exchange (if refuses) and of an indirect one (if accepts)
+        exchange_pairs = np.array([pair_index[P, C].repeat(len(medium)), pair_index[partner_good[medium], C]])
+        n_events = n_events[medium, exchange_pairs]
+
+        self.frequentist_cache = {
+            "response": response,
+            "p_values": p_values,
+            "medium": medium,
+            "P": np.full(len(medium), P),
+            "partner_good": partner_good[medium],
+            "storing_costs": np.broadcast_to(
+                np.asarray(self.raw_storing_costs) / self.raw_u, (len(medium), n_goods)),
+            "encounters": encounters,
+            "successes": np.concatenate(successes),
+            "n_events": n_events,
+            "ends": np.array(offsets)[exchange_pairs] + n_events
+        }
+
+        return self.frequentist_cache
+
+    def compute_frequentist_sum_errors_squares(self, *args):
+
+        """
+         Same as 'compute_sum_errors_squares' with the model given by 'get_frequentist_model',
+         for every trial at once
+        :return: sum of errors squares
+        """
+
+        encounter_memory_span, acceptance_memory_span, temp = args[0][:3]
+        n_exchanges = len(args[0][3:]) // 2
+        encounter_probabilities = np.asarray(args[0][3:n_exchanges + 3])
+
+        cache = self.get_frequentist_cache()
+        t = cache["medium"]
+
+        # Probability for the partner to be of type C ('set_initial_probabilities' before any encounter)
+        length = np.minimum(t, int(encounter_memory_span))
+        p_encounter = np.where(
+            length > 0, (cache["encounters"][t] - cache["encounters"][t - length]) / np.maximum(length, 1),
+            encounter_probabilities[self.cons])
+
+        # Probabilities of a direct exchange (if refuses) and of an indirect exchange (if accepts)
+        length = np.minimum(cache["n_events"], int(acceptance_memory_span))
+        p_acceptance = np.where(
+            length > 0,
+            (cache["successes"][cache["ends"]] - cache["successes"][cache["ends"] - length]) / np.maximum(length, 1),
+            1.)
+        p_direct, p_indirect = p_acceptance * p_encounter
+
+        p_values = cache["p_values"].copy()
+        p_values[:, t] = FrequentistAgent.get_medium_p_values(
+            storing_costs=cache["storing_costs"], P=cache["P"], medium=cache["partner_good"],
+            p_direct=p_direct, p_indirect=p_indirect, temp=temp)
+
+        likelihood = p_values[cache["response"], np.arange(self.t_max)]
+
+        # Summed in the order of the trials
+        return sum(((1 - likelihood) ** 2).tolist())
+
     def evaluate(self, *args):
 
         squares_sum = self.run(args)
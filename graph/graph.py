@@ -4,13 +4,26 @@ from os import path
 
 
 class GraphicDesigner(object):
-    def __init__(self, backup, parameters):
+
+    # Beyond that (more than 5 goods), exchanges are not plotted as lines anymore
+    max_exchange_lines = 10
+
+    def __init__(self, backup, parameters, max_points=None):
+
+        # Backups made by the recorder are already arrays (possibly memory-mapped),
+        # 'asarray' is only needed for older (list) backups
+        n_rounds = len(backup["consumption"])
+
+        # Only keep one round every 'step' rounds, so that memory-mapped backups are not entirely read
+        self.step = int(np.ceil(n_rounds / max_points)) if max_points is not None and n_rounds > max_points else 1
+        self.x = np.arange(0, n_rounds, self.step)
 
         self.exchanges_list = backup["exchanges"]
-        self.mean_utility_list = backup["consumption"]
-        self.n_exchanges_list = backup["n_exchanges"]
-        self.good_accepted_as_medium = backup["good_accepted_as_medium"]
-        self.proportions = backup["proportions"]
+        self.mean_utility_list = np.asarray(backup["consumption"])[::self.step]
+        self.n_exchanges_list = np.asarray(backup["n_exchanges"])[::self.step]
+
+        self.good_accepted_as_medium = np.asarray(backup["good_accepted_as_medium"])[::self.step]
+        self.proportions = np.asarray(backup["proportions"])[::self.step]
 
         self.parameters = parameters
 
@@ -32,6 +45,19 @@ class GraphicDesigner(object):
 
         return fig_name
 
+    def get_exchanges(self):
+
+        # Backup made by the recorder: exchanges are already stored as an array (rounds x types of exchange)
+        if hasattr(self.exchanges_list, "array"):
+            return self.exchanges_list.exchange_types, self.exchanges_list.array[::self.step].T
+
+        # Older backup: list of dictionaries
+        type_of_exchanges = sorted([i for i in self.exchanges_list[0].keys()])
+        y = np.array([[exchanges[key] for key in type_of_exchanges]
+                      for exchanges in self.exchanges_list[::self.step]]).T
+
+        return type_of_exchanges, y
+
     def plot_main_fig(self):
 
         # What is common to all subplots
@@ -41,26 +67,27 @@ class GraphicDesigner(object):
         n_lines = 2
         n_columns = 3
 
-        x = np.arange(self.parameters["t_max"])
+        x = self.x
 
         # First subplot
         ax = plt.subplot(n_lines, n_columns, 1)
         ax.set_title("Proportion of each type of exchange according to time \n")
 
-        type_of_exchanges = sorted([i for i in self.exchanges_list[0].keys()])
-        y = []
-        for i in range(len(type_of_exchanges)):
-            y.append([])
-        for t in range(self.parameters["t_max"]):
-            for exchange_idx in range(len(type_of_exchanges)):
-                y[exchange_idx].append(self.exchanges_list[t][type_of_exchanges[exchange_idx]])
+        type_of_exchanges, y = self.get_exchanges()
 
-        ax.set_ylim([-0.02, 1.02])
+        if len(type_of_exchanges) <= self.max_exchange_lines:
 
-        for exchange_idx in range(len(type_of_exchanges)):
-            ax.plot(x, y[exchange_idx], label="Exchange {}".format(type_of_exchanges[exchange_idx]), linewidth=2)
+            ax.set_ylim([-0.02, 1.02])
 
-        ax.legend()
+            for exchange_idx in range(len(type_of_exchanges)):
+                ax.plot(x, y[exchange_idx], label="Exchange {}".format(type_of_exchanges[exchange_idx]), linewidth=2)
+
+            ax.legend()
+
+        else:
+            # Too many types of exchange for a line each: types (in the order of the upper triangle) against time
+            ax.imshow(y, aspect="auto", origin="lower", vmin=0, vmax=1, extent=[x[0], x[-1], 0, len(type_of_exchanges)])
+            ax.set_ylabel("Type of exchange")
 
         # Second subplot
 
@@ -80,7 +107,7 @@ class GraphicDesigner(object):
         ax.set_ylim([-0.02, 1.02])
 
         for i in range(self.n_goods):
-            ax.plot(x, [j[i] for j in self.good_accepted_as_medium],
+            ax.plot(x, self.good_accepted_as_medium[:, i],
                     label="Good {}".format(i), linewidth=2)
 
         ax.legend()
@@ -145,7 +172,7 @@ class GraphicDesigner(object):
         n_lines = self.n_goods
         n_columns = 1
 
-        x = np.arange(len(self.proportions))
+        x = self.x
 
         for agent_type in range(self.n_goods):
 
@@ -153,18 +180,10 @@ class GraphicDesigner(object):
             ax = plt.subplot(n_lines, n_columns, agent_type + 1)
             ax.set_title("Proportion of agents of type {} having good i in hand\n".format(agent_type))
 
-            y = []
-            for i in range(self.n_goods):
-                y.append([])
-
-            for proportions_at_t in self.proportions:
-                for good in range(self.n_goods):
-                    y[good].append(proportions_at_t[agent_type, good])
-
             ax.set_ylim([-0.02, 1.02])
 
             for good in range(self.n_goods):
-                ax.plot(x, y[good], label="Good {}".format(good), linewidth=2)
+                ax.plot(x, self.proportions[:, agent_type, good], label="Good {}".format(good), linewidth=2)
 
             ax.legend()
 
@@ -173,7 +192,7 @@ class GraphicDesigner(object):
         plt.savefig(filename=self.proportions_figure_name)
 
 
-def represent_results(backup, parameters):
-    g = GraphicDesigner(backup=backup, parameters=parameters)
+def represent_results(backup, parameters, max_points=None):
+    g = GraphicDesigner(backup=backup, parameters=parameters, max_points=max_points)
     g.plot_main_fig()
     g.plot_proportions()
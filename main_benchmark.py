@@ -0,0 +1,3 @@
+from benchmark.benchmark import main
+
+main()
\ No newline at end of file
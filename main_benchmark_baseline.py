@@ -0,0 +1,3 @@
+from benchmark.benchmark import save_baseline
+
+save_baseline()
@@ -4,6 +4,7 @@ import numpy as np
 
 extensions = [
     Extension('cmodule.useful_functions', ['cmodule/useful_functions.pyx'], include_dirs=[np.get_include()]),
+    Extension('cmodule.sampler', ['cmodule/sampler.pyx'], include_dirs=[np.get_include()]),
 ]
 setup(
     ext_modules=cythonize(extensions), install_requires=['numpy', 'Cython', 'tqdm']
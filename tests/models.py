@@ -0,0 +1,74 @@
+import numpy as np
+
+from agent.DuffyAgent import DuffyAgent
+from agent.ForwardRL import ForwardRLAgent
+from agent.FrequentistAgent import FrequentistAgent
+from agent.KwAgent import KwAgent
+from agent.MarimonAgent import MarimonAgent
+from agent.RL2Steps import RL2StepsAgent
+from agent.StrategicRL import StrategicRLAgent
+from agent.stupid_agent import StupidAgent
+from benchmark.benchmark import MODELS
+
+'''
+Agent models for the tests, with the parameters of the benchmark ('MODELS'):
+ subclasses of the models without the batch API, so that economies run them agent by agent
+ (defined here, as checkpoints import models by their path).
+'''
+
+
+class ObjectStupidAgent(StupidAgent):
+    pass
+
+
+class ObjectKwAgent(KwAgent):
+    pass
+
+
+class ObjectDuffyAgent(DuffyAgent):
+    pass
+
+
+class ObjectFrequentistAgent(FrequentistAgent):
+    pass
+
+
+class ObjectStrategicRLAgent(StrategicRLAgent):
+    pass
+
+
+class ObjectForwardRLAgent(ForwardRLAgent):
+    pass
+
+
+class ObjectRL2StepsAgent(RL2StepsAgent):
+    pass
+
+
+class ObjectMarimonAgent(MarimonAgent):
+    pass
+
+
+OBJECT_MODELS = {
+    "Stupid": ObjectStupidAgent,
+    "Kw": ObjectKwAgent,
+    "Duffy": ObjectDuffyAgent,
+    "Frequentist": ObjectFrequentistAgent,
+    "StrategicRL": ObjectStrategicRLAgent,
+    "ForwardRL": ObjectForwardRLAgent,
+    "RL2Steps": ObjectRL2StepsAgent,
+    "Marimon": ObjectMarimonAgent
+}
+
+
+def get_parameters(model, batch=True, **kwargs):
+
+    parameters = dict(MODELS[model])
+    parameters["storing_costs"] = np.asarray(parameters["storing_costs"])
+
+    if not batch:
+        parameters["agent_model"] = OBJECT_MODELS[model]
+
+    parameters.update(kwargs)
+
+    return parameters
@@ -0,0 +1,27 @@
+import numpy as np
+
+# Rounds left out before averaging, for the economy to reach its steady state
+T_MIN = 50
+
+
+def get_steady_state(back_up, t_min=T_MIN):
+
+    # Average over rounds of the statistics that the engines have in common
+    return {
+        key: np.mean(np.asarray(back_up[key], dtype=float)[t_min:], axis=0)
+        for key in ["proportions", "consumption", "good_accepted_as_medium"]
+    }
+
+
+def assert_same_steady_state(steady_state, expected, tolerance):
+
+    for key in expected:
+        np.testing.assert_allclose(steady_state[key], expected[key], atol=tolerance, err_msg=key)
+
+
+def get_mean_steady_state(economy_class, seeds, **parameters):
+
+    # Steady state averaged over seeded runs, for engines whose runs differ draw by draw
+    steady_states = [get_steady_state(economy_class(seed=seed, **parameters).run()) for seed in seeds]
+
+    return {key: np.mean([steady_state[key] for steady_state in steady_states], axis=0) for key in steady_states[0]}
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from backup.checkpoint import load_checkpoint, save_checkpoint
+from environment.Economy import Economy, has_batch_api, resume
+from environment.HeterogeneousEconomy import HeterogeneousEconomy
+from tests.models import MODELS, get_parameters
+
+KEYS = ["exchanges", "n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]
+
+# Memories shorter than the run, so that they are full (and wrap around) when the run is interrupted
+SHORT_MEMORY = {"Frequentist": {"acceptance_memory_span": 20, "encounter_memory_span": 20}}
+
+
+def assert_same_runs(back_up, expected):
+
+    for key in KEYS:
+        np.testing.assert_array_equal(np.asarray(back_up[key]), np.asarray(expected[key]), err_msg=key)
+
+
+def run_interrupted(economy_class, checkpoint_file, t_max, t_stop, **parameters):
+
+    # The run stops after the last checkpoint, and is resumed from it until 't_max'
+    economy_class(t_max=t_stop, checkpoint_file=checkpoint_file, checkpoint_every=t_stop // 2, **parameters).run()
+
+    state = load_checkpoint(checkpoint_file)
+    state["parameters"]["t_max"] = t_max
+    save_checkpoint(checkpoint_file, state)
+
+    return resume(checkpoint_file)
+
+
+@pytest.mark.parametrize("batch", [True, False], ids=["batch", "object"])
+@pytest.mark.parametrize("model", list(MODELS))
+def test_resume_matches_uninterrupted_run(model, batch, tmp_path):
+
+    parameters = get_parameters(model, batch=batch, repartition_of_roles=np.array([10, 10, 10]), seed=5)
+    assert has_batch_api(parameters["agent_model"]) == batch
+
+    if model in SHORT_MEMORY:
+        parameters["agent_parameters"] = dict(parameters["agent_parameters"], **SHORT_MEMORY[model])
+
+    expected = Economy(t_max=80, **parameters).run()
+    back_up = run_interrupted(Economy, str(tmp_path / "checkpoint.npz"), t_max=80, t_stop=50, **parameters)
+
+    assert_same_runs(back_up, expected)
+
+
+def test_resume_heterogeneous_economy(tmp_path):
+
+    kw, duffy, forward_rl = (get_parameters(model, batch=batch) for model, batch in
+                             [("Kw", True), ("Duffy", False), ("ForwardRL", True)])
+
+    parameters = {
+        "u": 1,
+        "beta": 0.9,
+        "storing_costs": forward_rl["storing_costs"],
+        "seed": 5,
+        "sub_populations": [
+            {"agent_model": kw["agent_model"], "repartition_of_roles": np.array([10, 10, 10])},
+            {"agent_model": duffy["agent_model"], "repartition_of_roles": np.array([10, 10, 10])},
+            {"agent_model": forward_rl["agent_model"], "agent_parameters": forward_rl["agent_parameters"],
+             "repartition_of_roles": np.array([10, 10, 10])}
+        ]
+    }
+
+    expected = HeterogeneousEconomy(t_max=80, **parameters).run()
+    back_up = run_interrupted(
+        HeterogeneousEconomy, str(tmp_path / "checkpoint.npz"), t_max=80, t_stop=50, **parameters)
+
+    assert_same_runs(back_up, expected)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from environment.CountsEconomy import CountsEconomy, is_memoryless
+from environment.Economy import Economy
+from tests.models import MODELS, get_parameters
+from tests.steady_state import assert_same_steady_state, get_steady_state
+
+MEMORYLESS_MODELS = [model for model in MODELS if is_memoryless(MODELS[model]["agent_model"])]
+
+
+@pytest.mark.parametrize("model", MEMORYLESS_MODELS)
+def test_counts_economy_matches_economy(model):
+
+    parameters = get_parameters(model, repartition_of_roles=np.array([300, 300, 300]), t_max=200, seed=0)
+
+    expected = get_steady_state(Economy(**parameters).run())
+    steady_state = get_steady_state(CountsEconomy(**parameters).run())
+
+    assert_same_steady_state(steady_state, expected, tolerance=0.02)
+
+
+def test_counts_economy_refuses_models_with_memory():
+
+    with pytest.raises(AssertionError):
+        CountsEconomy(**get_parameters("Frequentist", repartition_of_roles=np.array([10, 10, 10]), t_max=10))
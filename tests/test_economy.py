@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from environment.Economy import Economy
+from environment.VectorizedEconomy import VectorizedEconomy
+from tests.models import OBJECT_MODELS, get_parameters
+from tests.steady_state import assert_same_steady_state, get_mean_steady_state
+
+SEEDS = range(10)
+
+
+@pytest.mark.parametrize("model", list(OBJECT_MODELS))
+def test_batch_matches_agents_as_objects(model):
+
+    steady_states = [
+        get_mean_steady_state(
+            Economy, SEEDS, **get_parameters(model, batch=batch, repartition_of_roles=np.array([100, 100, 100]),
+                                             t_max=200))
+        for batch in (True, False)
+    ]
+
+    assert_same_steady_state(*steady_states, tolerance=0.05)
+
+
+@pytest.mark.parametrize("model", ["Stupid", "Kw"])
+def test_vectorized_economy_matches_economy(model):
+
+    parameters = {"repartition_of_roles": np.array([100, 100, 100]), "t_max": 200}
+
+    expected = get_mean_steady_state(Economy, SEEDS, **get_parameters(model, batch=False, **parameters))
+    steady_state = get_mean_steady_state(VectorizedEconomy, SEEDS, **get_parameters(model, **parameters))
+
+    assert_same_steady_state(steady_state, expected, tolerance=0.05)
+
+
+def test_vectorized_economy_refuses_agents_as_objects():
+
+    with pytest.raises(AssertionError):
+        VectorizedEconomy(**get_parameters("Kw", batch=False, repartition_of_roles=np.array([10, 10, 10]), t_max=10))
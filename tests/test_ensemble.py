@@ -0,0 +1,34 @@
+import numpy as np
+
+from backup.recorder import ExchangesView
+from environment.Economy import Economy
+from environment.Ensemble import Ensemble
+from tests.models import get_parameters
+
+
+def as_array(value):
+
+    # Exchanges are read through their columns, as the other statistics
+    return value.array if isinstance(value, ExchangesView) else np.asarray(value)
+
+
+def test_replicates_match_separate_economies():
+
+    parameters = get_parameters("Frequentist", repartition_of_roles=np.array([20, 20, 20]), t_max=30)
+
+    ensemble = Ensemble(n_replicates=3, seed=0, n_processes=2, **parameters)
+    summary = ensemble.run()
+
+    expected = [Economy(seed=seed, **parameters).run() for seed in ensemble.seeds]
+
+    for key in ["exchanges", "n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]:
+
+        # Each replicate wrote its own row of the shared memory
+        for replicate, back_up in zip(ensemble.replicates[key], expected):
+            np.testing.assert_array_equal(replicate, as_array(back_up[key]), err_msg=key)
+
+        mean = np.mean([as_array(back_up[key]) for back_up in expected], axis=0)
+        np.testing.assert_allclose(as_array(summary["mean"][key]), mean, err_msg=key)
+
+        assert np.all(as_array(summary["lower"][key]) <= mean + 1e-12)
+        assert np.all(as_array(summary["upper"][key]) >= mean - 1e-12)
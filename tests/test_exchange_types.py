@@ -0,0 +1,78 @@
+import itertools as it
+
+import numpy as np
+import pytest
+
+from agent.stupid_agent import StupidAgent
+from environment.Economy import Economy
+from environment.get_exchange_types import get_exchange_index, get_exchange_types
+from environment.get_roles import get_roles
+
+N_GOODS = [3, 4, 6]
+
+
+@pytest.mark.parametrize("n_goods", N_GOODS)
+def test_exchange_index_matches_sorted_pairs(n_goods):
+
+    exchange_types = get_exchange_types(n_goods)
+    index = get_exchange_index(n_goods)
+
+    # Former keys of the exchanges, in the same order
+    assert exchange_types == list(it.combinations(range(n_goods), r=2))
+
+    for g1, g2 in it.product(range(n_goods), repeat=2):
+
+        if g1 == g2:
+            assert index[g1, g2] == -1
+        else:
+            assert exchange_types[index[g1, g2]] == tuple(sorted([g1, g2]))
+
+
+def count_encounters(n_goods, i_H, j_H, i_P, j_P, i_C, j_C, i_agreeing, j_agreeing):
+
+    # Reference: statistics computed encounter by encounter, exchanges being keyed by sorted pairs of goods
+    exchanges = dict([(pair, 0) for pair in it.combinations(range(n_goods), r=2)])
+    proposition_of_medium = np.zeros(n_goods)
+    good_accepted_as_medium = np.zeros(n_goods)
+
+    for k in range(len(i_H)):
+
+        if j_H[k] != i_C[k] and i_H[k] == i_P[k]:
+            proposition_of_medium[j_H[k]] += 1
+            good_accepted_as_medium[j_H[k]] += i_agreeing[k]
+
+        if i_H[k] != j_C[k] and j_H[k] == j_P[k]:
+            proposition_of_medium[i_H[k]] += 1
+            good_accepted_as_medium[i_H[k]] += j_agreeing[k]
+
+        if i_agreeing[k] and j_agreeing[k] and i_H[k] != j_H[k]:
+            exchanges[tuple(sorted([i_H[k], j_H[k]]))] += 1
+
+    return exchanges, proposition_of_medium, good_accepted_as_medium
+
+
+@pytest.mark.parametrize("n_goods", N_GOODS)
+def test_encounter_statistics_match_encounter_by_encounter(n_goods):
+
+    economy = Economy(repartition_of_roles=np.full(n_goods, 10), t_max=1, agent_model=StupidAgent,
+                      storing_costs=np.linspace(0.01, 0.1, n_goods), seed=0)
+
+    rng = np.random.default_rng(n_goods)
+    n_encounters = 500
+
+    roles = get_roles(n_goods)
+    i_P, i_C = roles[rng.integers(n_goods, size=n_encounters)].T
+    j_P, j_C = roles[rng.integers(n_goods, size=n_encounters)].T
+    i_H, j_H = rng.integers(n_goods, size=(2, n_encounters))
+    i_agreeing, j_agreeing = rng.random((2, n_encounters)) < 0.5
+
+    economy.make_stats_about_encounters(i_H=i_H, j_H=j_H, i_P=i_P, j_P=j_P, i_C=i_C, j_C=j_C,
+                                        i_agreeing=i_agreeing, j_agreeing=j_agreeing)
+
+    exchanges, proposition_of_medium, good_accepted_as_medium = count_encounters(
+        n_goods, i_H, j_H, i_P, j_P, i_C, j_C, i_agreeing, j_agreeing)
+
+    assert dict(zip(economy.exchange_types, economy.exchanges.tolist())) == exchanges
+    assert economy.n_exchange == sum(exchanges.values())
+    np.testing.assert_array_equal(economy.proposition_of_medium, proposition_of_medium)
+    np.testing.assert_array_equal(economy.good_accepted_as_medium, good_accepted_as_medium)
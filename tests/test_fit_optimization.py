@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from benchmark.benchmark import create_subject
+
+# Fitting needs 'hyperopt' that the simulations do not need
+pytest.importorskip("hyperopt")
+
+from fit_optimization.data_optmization_hyperopt_least_squares import PerformanceComputer  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_frequentist_sum_errors_squares_matches_replay(seed):
+
+    rng = np.random.default_rng(seed)
+
+    subject = create_subject(t_max=int(rng.integers(5, 80)), seed=seed)
+    subject["storing_costs"] = [[1, 4, 9], [5, 10, 25], [2, 3, 50]][seed % 3]
+    subject["u"] = [1, 10, 100][seed % 3]
+    t_max = len(subject["subject_good"])
+
+    pc = PerformanceComputer(individual_data=subject, model="Frequentist")
+
+    for _ in range(10):
+
+        # Memory spans, temperature, then encounter and acceptance probabilities
+        args = [float(rng.integers(1, t_max + 1)), float(rng.integers(1, t_max + 1)), rng.uniform(0.01, 1)] + \
+            list(rng.random(12))
+
+        expected = pc.compute_sum_errors_squares(pc.get_frequentist_model(args))
+
+        assert pc.run(args) == pytest.approx(expected, rel=1e-12, abs=1e-12)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from agent.ForwardRL import ForwardRLAgent
+from environment.get_roles import get_roles
+from tests.models import get_parameters
+
+
+def test_situations_follow_the_order_of_strategies():
+
+    parameters = get_parameters("ForwardRL")
+    q_values = np.arange(24).reshape((12, 2))
+
+    for P, C in get_roles(3):
+
+        agent = ForwardRLAgent(prod=P, cons=C, storing_costs=parameters["storing_costs"],
+                               agent_parameters=dict(parameters["agent_parameters"], q_values=q_values))
+
+        # Strategies are generated in the order of the rows of the initial Q-values
+        for (in_hand, partner_type, partner_good), values in agent.strategies.items():
+
+            if in_hand == -1:
+                continue
+
+            situation = ForwardRLAgent.get_situation(
+                in_hand=in_hand, P=P, partner_type=partner_type, partner_good=partner_good)
+
+            np.testing.assert_array_equal(q_values[situation], values)
+
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from agent.FrequentistAgent import RingBuffer
+
+
+class ListMemory(object):
+
+    # Reference: the whole series is kept, the frequency is computed on its last values
+    def __init__(self, span):
+
+        self.span = span
+        self.values = []
+
+    def append(self, value):
+
+        self.values.append(value)
+
+    def frequency(self, value):
+
+        memory = self.values[-self.span:]
+        return memory.count(value) / len(memory)
+
+
+@pytest.mark.parametrize("span", [1, 2, 7, 50])
+def test_ring_buffer_frequencies_match_list(span):
+
+    n_values = 3
+    rng = np.random.default_rng(span)
+
+    ring_buffer = RingBuffer(span, n_values)
+    reference = ListMemory(span)
+
+    for value in rng.integers(n_values, size=200):
+
+        ring_buffer.append(int(value))
+        reference.append(int(value))
+
+        for v in range(n_values):
+            assert ring_buffer.frequency(v) == pytest.approx(reference.frequency(v))
+
+
+@pytest.mark.parametrize("n_appends", [0, 3, 10, 25])
+def test_ring_buffer_set_state(n_appends):
+
+    span, n_values = 10, 3
+    rng = np.random.default_rng(n_appends)
+
+    ring_buffer = RingBuffer(span, n_values)
+    for value in rng.integers(n_values, size=n_appends):
+        ring_buffer.append(int(value))
+
+    restored = RingBuffer(span, n_values)
+    restored.set_state(ring_buffer.values, ring_buffer.position, ring_buffer.length)
+
+    assert restored.counts == ring_buffer.counts
+
+    for value in rng.integers(n_values, size=30):
+        ring_buffer.append(int(value))
+        restored.append(int(value))
+        assert restored.counts == ring_buffer.counts
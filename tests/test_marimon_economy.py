@@ -0,0 +1,18 @@
+import numpy as np
+
+from agent.MarimonAgentSharedClassifierSystem import MarimonEconomy
+
+PARAMETERS = {
+    "t_max": 100,
+    "u": 100, "b11": 0.025, "b12": 0.025, "b21": 0.25, "b22": 0.25, "initial_strength": 0,
+    "repartition_of_roles": np.array([20, 20, 20]),
+    "storing_costs": np.array([0.1, 1., 20.])
+}
+
+
+def test_seeded_runs_are_reproducible():
+
+    back_ups = [MarimonEconomy(seed=3, **PARAMETERS).run() for _ in range(2)]
+
+    for key in ["consumption", "n_exchanges", "proportions"]:
+        np.testing.assert_array_equal(np.asarray(back_ups[0][key]), np.asarray(back_ups[1][key]), err_msg=key)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from environment.CountsEconomy import is_memoryless
+from environment.Economy import Economy
+from environment.MeanFieldEconomy import MeanFieldEconomy
+from tests.models import MODELS, get_parameters
+from tests.steady_state import assert_same_steady_state, get_steady_state
+
+# Models that learn are refused (a representative agent does not behave like a population of learners)
+MEMORYLESS_MODELS = [model for model in MODELS if is_memoryless(MODELS[model]["agent_model"])]
+
+
+@pytest.mark.parametrize("model", MEMORYLESS_MODELS)
+def test_mean_field_economy_matches_economy(model):
+
+    parameters = get_parameters(model, repartition_of_roles=np.array([300, 300, 300]), t_max=200, seed=0)
+
+    expected = get_steady_state(Economy(**parameters).run())
+    steady_state = get_steady_state(MeanFieldEconomy(**parameters).run())
+
+    assert_same_steady_state(steady_state, expected, tolerance=0.02)
+
+
+def test_mean_field_economy_is_deterministic():
+
+    parameters = get_parameters("Kw", repartition_of_roles=np.array([300, 300, 300]), t_max=50)
+
+    back_ups = [MeanFieldEconomy(seed=seed, **parameters).run() for seed in range(2)]
+
+    np.testing.assert_array_equal(back_ups[0]["proportions"], back_ups[1]["proportions"])
+
+
+def test_mean_field_economy_refuses_models_with_memory():
+
+    with pytest.raises(AssertionError):
+        MeanFieldEconomy(**get_parameters("Duffy", repartition_of_roles=np.array([10, 10, 10]), t_max=10))
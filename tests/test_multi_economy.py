@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from cmodule.sampler import Sampler
+from environment.Economy import Economy
+from environment.MultiEconomy import EconomiesSampler, MultiEconomy
+from tests.models import get_parameters
+
+
+@pytest.mark.parametrize("model", ["Kw", "Frequentist", "ForwardRL"])
+def test_multi_economy_matches_separate_economies(model):
+
+    seeds = [1, 2, 3]
+    parameters = get_parameters(model, repartition_of_roles=np.array([20, 20, 20]), t_max=40)
+
+    # Storing costs of every economy, around the ones of the model
+    storing_costs = parameters.pop("storing_costs")
+    storing_costs = [storing_costs * scale for scale in (1, 0.5, 2)]
+
+    back_ups = MultiEconomy(seeds=seeds, storing_costs=storing_costs, **parameters).run()
+
+    assert len(back_ups) == len(seeds)
+
+    for seed, sc, back_up in zip(seeds, storing_costs, back_ups):
+
+        expected = Economy(seed=seed, storing_costs=sc, **parameters).run()
+
+        for key in ["exchanges", "n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]:
+            np.testing.assert_array_equal(np.asarray(back_up[key]), np.asarray(expected[key]), err_msg=key)
+
+
+def test_economies_sampler_refuses_uneven_draws():
+
+    sampler = EconomiesSampler([Sampler(generator=np.random.default_rng(s)) for s in range(2)])
+
+    assert sampler.random(4).shape == (4, )
+
+    with pytest.raises(AssertionError):
+        sampler.random(3)
@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pytest
+
+from environment.Economy import Economy
+from environment.Profiler import Profiler
+from tests.models import get_parameters
+
+T_MAX = 20
+
+
+@pytest.mark.parametrize("batch", [True, False], ids=["batch", "object"])
+def test_profiler_records_every_phase(batch, tmp_path):
+
+    parameters = get_parameters("Duffy", batch=batch, repartition_of_roles=np.array([10, 10, 10]), t_max=T_MAX, seed=0)
+
+    profiler = Profiler(trace=True)
+    back_up = Economy(profiler=profiler, **parameters).run()
+
+    # Each method of a phase is called once by round
+    for name, methods in Economy.profiled_phases.items():
+        assert profiler.n_calls[name] == T_MAX * len(methods), name
+        assert profiler.total_time[name] > 0, name
+
+    agent_methods = ["decide_batch", "consume_batch", "learn_batch"] if batch else ["are_you_satisfied", "consume"]
+    for name in agent_methods:
+        assert profiler.n_calls["agent.{}".format(name)] > 0, name
+
+    summary = profiler.get_summary()
+    assert set(row[0] for row in summary) == set(profiler.n_calls)
+
+    trace_file = tmp_path / "trace.json"
+    profiler.save_trace(str(trace_file))
+
+    with open(trace_file) as f:
+        trace = json.load(f)
+
+    events = trace["traceEvents"]
+
+    # Complete events ('X') of the phases only, as agents are not traced by default
+    assert all(set(event) == {"name", "cat", "ph", "pid", "tid", "ts", "dur"} for event in events)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 and event["ts"] >= 0 for event in events)
+    assert all(event["cat"] == "phase" for event in events)
+    assert sum(event["name"] == "round" for event in events) == T_MAX
+
+    # Profiling does not change the run
+    expected = Economy(**parameters).run()
+    np.testing.assert_array_equal(back_up["proportions"], expected["proportions"])
@@ -0,0 +1,99 @@
+import itertools as it
+
+import numpy as np
+import pytest
+
+from backup.recorder import BackUpRecorder, load_back_up
+from environment.Economy import Economy
+from environment.get_exchange_types import get_exchange_index
+from tests.models import get_parameters
+
+
+class ListRecorder(BackUpRecorder):
+
+    """
+    Recorder keeping besides the former back_up: lists with one entry by round,
+    exchanges being dictionaries whose keys are the sorted pairs of goods
+    """
+
+    def __init__(self, t_max, n_goods):
+
+        super().__init__(t_max=t_max, n_goods=n_goods)
+
+        self.exchange_index = get_exchange_index(n_goods)
+        self.list_back_up = dict([(key, []) for key in self.keys])
+
+    def record(self, **statistics):
+
+        super().record(**statistics)
+
+        exchanges = dict([(pair, float(statistics["exchanges"][self.exchange_index[pair]]))
+                          for pair in it.combinations(range(self.n_goods), r=2)])
+
+        self.list_back_up["exchanges"].append(exchanges)
+        self.list_back_up["n_exchanges"].append(statistics["n_exchanges"])
+        self.list_back_up["consumption"].append(statistics["consumption"])
+        self.list_back_up["good_accepted_as_medium"].append(statistics["good_accepted_as_medium"].copy())
+        self.list_back_up["proportions"].append(statistics["proportions"].copy())
+
+
+class ListRecorderEconomy(Economy):
+
+    def create_recorder(self):
+
+        return ListRecorder(t_max=self.t_max, n_goods=self.n_goods)
+
+
+@pytest.mark.parametrize("batch", [True, False], ids=["batch", "object"])
+def test_back_up_reads_as_lists(batch):
+
+    economy = ListRecorderEconomy(**get_parameters(
+        "Stupid", batch=batch, repartition_of_roles=np.array([20, 20, 20]), t_max=30, seed=0))
+    back_up = economy.run()
+    expected = economy.recorder.list_back_up
+
+    assert len(back_up["exchanges"]) == len(expected["exchanges"]) == 30
+
+    # Exchanges by index, by slice and by iteration, as a list of dictionaries
+    for t in range(30):
+        assert back_up["exchanges"][t] == expected["exchanges"][t]
+
+    assert back_up["exchanges"][5:10] == expected["exchanges"][5:10]
+    assert back_up["exchanges"][-1] == expected["exchanges"][-1]
+    assert list(back_up["exchanges"]) == expected["exchanges"]
+
+    for key in ["n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]:
+        assert len(back_up[key]) == 30
+        np.testing.assert_array_equal(back_up[key], np.array(expected[key]), err_msg=key)
+
+
+def test_back_up_stops_at_the_last_round():
+
+    recorder = BackUpRecorder(t_max=10, n_goods=3)
+
+    for t in range(4):
+        recorder.record(exchanges=np.full(3, t), n_exchanges=t, consumption=t / 10,
+                        good_accepted_as_medium=np.zeros(3), proportions=np.eye(3))
+
+    back_up = recorder.get_back_up()
+
+    assert len(back_up["exchanges"]) == len(back_up["consumption"]) == 4
+    assert back_up["exchanges"][3] == {(0, 1): 3, (0, 2): 3, (1, 2): 3}
+
+
+@pytest.mark.parametrize("buffer_size", [7, 30, 1000])
+def test_streaming_back_up_matches_memory(buffer_size, tmp_path):
+
+    parameters = get_parameters("Kw", repartition_of_roles=np.array([20, 20, 20]), t_max=30, seed=0)
+    folder = str(tmp_path / "back_up")
+
+    expected = Economy(**parameters).run()
+    back_up = Economy(back_up_folder=folder, buffer_size=buffer_size, **parameters).run()
+
+    # Backup returned by the run, and read back from the files (as by another process)
+    for streamed in (back_up, load_back_up(folder)):
+
+        assert list(streamed["exchanges"]) == list(expected["exchanges"])
+
+        for key in ["n_exchanges", "consumption", "good_accepted_as_medium", "proportions"]:
+            np.testing.assert_array_equal(streamed[key], expected[key], err_msg=key)
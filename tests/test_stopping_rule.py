@@ -0,0 +1,42 @@
+import numpy as np
+
+from environment.Economy import Economy
+from environment.StoppingRule import StoppingRule
+from tests.models import get_parameters
+
+
+def test_stationary_series_stops_after_two_windows():
+
+    stopping_rule = StoppingRule(window=10, tolerance=0.02)
+    rng = np.random.default_rng(0)
+
+    decisions = [stopping_rule.update(0.5 + 0.001 * rng.standard_normal(3)) for _ in range(30)]
+
+    assert decisions.index(True) == 2 * 10 - 1
+
+
+def test_trending_series_does_not_stop():
+
+    stopping_rule = StoppingRule(window=10, tolerance=0.02)
+
+    # Means of two consecutive windows differ by 10 * 0.01
+    assert not any(stopping_rule.update(np.full(3, 0.01 * t)) for t in range(200))
+
+
+def test_no_decision_before_min_rounds():
+
+    stopping_rule = StoppingRule(window=10, tolerance=0.02, min_rounds=50)
+
+    decisions = [stopping_rule.update(np.zeros(3)) for _ in range(60)]
+
+    assert decisions.index(True) == 50 - 1
+
+
+def test_economy_stops_once_stable():
+
+    parameters = get_parameters("Kw", repartition_of_roles=np.array([100, 100, 100]), t_max=1000, seed=0)
+
+    back_up = Economy(stopping_rule=StoppingRule(window=20, tolerance=0.05), **parameters).run()
+
+    assert 2 * 20 <= len(back_up["consumption"]) < 1000
+    assert len(back_up["exchanges"]) == len(back_up["proportions"]) == len(back_up["consumption"])